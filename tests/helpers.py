@@ -0,0 +1,118 @@
+"""
+Synthetic direct-access files and diagram configurations shared by the tests
+"""
+import os
+from typing import Tuple
+
+import numpy as np
+
+from tugui.tu_interface import MacReader, MicReader, PliReader, StaReader, TuInp, \
+    load_mac_reader, load_mic_reader, load_sta_reader
+
+
+# Record lengths of the synthetic .mic, .mac and .sta files
+MIC_RECORD_LENGTH = 12
+MAC_RECORD_LENGTH = 20
+STA_RECORD_LENGTH = 8
+# Number of slices, of micro-steps and of macro-steps of the synthetic simulation
+N_SLICES = 3
+N_MIC_TIMES = 40
+N_MAC_TIMES = 5
+# Number of axial sections of the synthetic .sta file
+STA_AXIAL_STEPS = 2
+# Time instants (hours, seconds, milliseconds) of the datasets of the synthetic .sta file
+STA_DATASET_TIMES = [(10, 0, 0.), (10, 0, 0.), (20, 5, 0.5), (10, 0, 0.), (30, 0, 0.), (20, 5, 0.5)]
+
+# Content of a synthetic quantity dictionary, for 3 slices
+QUANTITIES = """213 1 mic 3 M3 1
+213 2 mic 3+M3 M3 1
+260 1 mic 3+2*M3 1 1
+113 1 mac 4 4 2
+113 2 mac 5 4 2
+301 1 mic 3+M3 M3 1
+301 2 mac 12 1 1
+93 1 sta 4 1 1
+
+X1 - mac 13 4 1
+X3 - mic 3 M3 1
+"""
+
+
+def build_records(n_records: int, record_length: int, n_slices: int = 1) -> np.ndarray:
+    """
+    Function that builds a 2D array of records whose first three values are the
+    time instant (hours, seconds, milliseconds), repeated for each of the given
+    number of slices, while the remaining ones encode the record and column
+    indices, i.e. 'record * 1000 + column'.
+    """
+    records = np.empty((n_records, record_length), dtype=np.float32)
+    for i in range(n_records):
+        t = i // n_slices
+        records[i, 0:3] = (100 + t // 4, (t % 4) * 900, float(t % 3) / 2)
+        records[i, 3:] = i * 1000 + np.arange(3, record_length)
+    return records
+
+
+def build_sta_datasets(dtype: type = np.float32) -> np.ndarray:
+    """
+    Function that builds a 3D array of statistical datasets, each made of one
+    record per axial section and of the time instant as first three values of
+    the records. The remaining ones encode the dataset, section and column
+    indices, i.e. 'dataset * 100 + section * 10 + column'.
+    """
+    datasets = np.empty(
+        (len(STA_DATASET_TIMES), STA_AXIAL_STEPS + 1, STA_RECORD_LENGTH), dtype=dtype)
+    for d, t in enumerate(STA_DATASET_TIMES):
+        for a in range(STA_AXIAL_STEPS + 1):
+            datasets[d, a, 0:3] = t
+            datasets[d, a, 3:] = d * 100 + a * 10 + np.arange(3, STA_RECORD_LENGTH)
+    return datasets
+
+
+def write_simulation(folder: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Function that writes the synthetic 'run.mic', 'run.mac' and 'run.sta' files
+    into the given folder, returning their content.
+    """
+    mic_data = build_records(N_MIC_TIMES, MIC_RECORD_LENGTH)
+    mac_data = build_records(N_MAC_TIMES * N_SLICES, MAC_RECORD_LENGTH, N_SLICES)
+    sta_data = build_sta_datasets()
+    mic_data.tofile(os.path.join(folder, "run.mic"))
+    mac_data.tofile(os.path.join(folder, "run.mac"))
+    sta_data.tofile(os.path.join(folder, "run.sta"))
+    return (mic_data, mac_data, sta_data)
+
+
+def simulation_pli(folder: str) -> PliReader:
+    """
+    Function that builds the 'PliReader' instance describing the synthetic
+    files written into the given folder, as the one read from a .pli file.
+    """
+    return PliReader(
+        pli_path=os.path.join(folder, "run.pli"), pli_folder=folder,
+        opt_dict={'M3': str(N_SLICES), 'IBYTE': '4', 'ISTATI': '1'},
+        mic_path="run.mic", mac_path="run.mac", sta_path="run.sta",
+        mic_recordLength=str(MIC_RECORD_LENGTH), mac_recordLength=str(MAC_RECORD_LENGTH),
+        sta_recordLength=str(STA_RECORD_LENGTH), sta_micStep=str(N_MIC_TIMES),
+        sta_macStep=str(N_MAC_TIMES * N_SLICES),
+        sta_dataset=str(len(STA_DATASET_TIMES) * (STA_AXIAL_STEPS + 1)),
+        axial_steps=N_SLICES)
+
+
+def load_readers(plireader: PliReader) -> Tuple[MicReader, MacReader, StaReader]:
+    """
+    Function that provides the readers of the .mic, .mac and .sta files of the
+    given simulation, with their time instants extracted, as the GUI does.
+    """
+    return (load_mic_reader(plireader), load_mac_reader(plireader), load_sta_reader(plireader))
+
+
+def tuplot_inp(number: str, idga: str, kn: str, nlsuch: str, time: str) -> TuInp:
+    """
+    Function that builds the 'TuInp' instance of a TuPlot diagram, the same
+    way as the GUI does.
+    """
+    return TuInp.configure_tuplot_inp_fields({
+        "PLI": "run.pli", "IDNF": number, "IDGA": idga, "NKN": str(len(kn.split())),
+        "IANT1": "N", "IANT2": "F", "IANT3": "N", "KN": kn, "NLSUCH": nlsuch,
+        "TIME": time, "NMAS": "0", "IKON": "E"})
@@ -0,0 +1,169 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from tugui.da_reduction import MinMaxPyramid, aggregate_macro_steps, aggregate_windows, \
+    hourly_edges
+from tugui.tu_interface import MicReader, TimeAlignment, TimeIndex
+from tests.helpers import MIC_RECORD_LENGTH, build_records
+
+
+class TestMinMaxPyramid(unittest.TestCase):
+    """
+    Tests of the min/max decimation pyramid of the micro-step values.
+    """
+
+    def setUp(self):
+        """
+        Build a noisy series with a few isolated peaks.
+        """
+        rng = np.random.default_rng(0)
+        self.seconds = np.arange(10000, dtype=np.float64)
+        self.values = rng.normal(size=self.seconds.size).astype(np.float32)
+        self.values[[17, 4321, 9998]] = (50., -60., 70.)
+        self.pyramid = MinMaxPyramid(self.seconds, self.values)
+
+    def test_01_envelope(self):
+        """
+        Check the envelope keeps the requested number of points and the peaks
+        of the original values, in time order.
+        """
+        (t, v) = self.pyramid.envelope(0., 1e9, 100)
+        self.assertLessEqual(t.size, 100)
+        self.assertTrue(np.all(np.diff(t) > 0))
+        for peak in (17, 4321, 9998):
+            self.assertIn(float(peak), t)
+        self.assertEqual(v.max(), 70.)
+        self.assertEqual(v.min(), -60.)
+        # A sub-interval keeps the extremes of its original values
+        (t, v) = self.pyramid.envelope(1003., 5011.5, 64)
+        self.assertLessEqual(t.size, 64)
+        self.assertTrue(t[0] >= 1003. and t[-1] <= 5011.)
+        self.assertEqual(v.min(), self.values[1003:5012].min())
+        self.assertEqual(v.max(), self.values[1003:5012].max())
+        # Short intervals give the original values
+        (t, v) = self.pyramid.envelope(10., 19., 100)
+        np.testing.assert_array_equal(v, self.values[10:20])
+        # Less than four points merge the interval into a single sample
+        for n_points in (2, 3):
+            (t, v) = self.pyramid.envelope(1003., 5011.5, n_points)
+            self.assertEqual(t.size, 2)
+            self.assertEqual((v.min(), v.max()),
+                             (self.values[1003:5012].min(), self.values[1003:5012].max()))
+        (t, v) = self.pyramid.envelope(0., 1e9, 2)
+        np.testing.assert_array_equal(t, [4321., 9998.])
+
+    def test_01_envelope_edges(self):
+        """
+        Check the partial samples at the interval edges are resolved from the
+        finer levels, reading at most factor - 1 samples from each of them.
+        """
+        (t, v) = self.pyramid.envelope(5., 9990., 20)
+        for (start, stop) in ((5, 1024), (9216, 9991)):
+            edge = self.values[start:stop]
+            self.assertIn(float(start + np.argmin(edge)), t)
+            self.assertIn(float(start + np.argmax(edge)), t)
+
+        class CountingList(list):
+            def __init__(self, level, counts):
+                super().__init__(level)
+                self.counts = counts
+
+            def __getitem__(self, key):
+                value = super().__getitem__(key)
+                self.counts.append((key, len(value)))
+                return value
+
+        counts = list()
+        for name in ('min_values', 'max_values', 'min_indices', 'max_indices'):
+            levels = getattr(self.pyramid, name)
+            setattr(self.pyramid, name, [CountingList(level, counts) for level in levels])
+        self.pyramid._range_extremes(5, 1024, 5)
+        self.assertGreater(len(counts), 0)
+        self.assertTrue(all(size <= self.pyramid.factor - 1 for (_, size) in counts))
+
+    def test_02_save_and_reader(self):
+        """
+        Check a saved pyramid is loaded unchanged and a pyramid can be built
+        from a .mic file column.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "pyramid.npz")
+            self.pyramid.save(path)
+            loaded = MinMaxPyramid.load(path)
+            for (a, b) in zip(loaded.envelope(0., 1e9, 50), self.pyramid.envelope(0., 1e9, 50)):
+                np.testing.assert_array_equal(a, b)
+
+            mic_path = os.path.join(tmpdir, "run.mic")
+            records = build_records(40, MIC_RECORD_LENGTH)
+            records.tofile(mic_path)
+            pyramid = MinMaxPyramid.init_MinMaxPyramid_from_reader(
+                MicReader(mic_path), 5, MIC_RECORD_LENGTH, factor=2)
+            np.testing.assert_array_equal(pyramid.min_values[0], records[:, 5])
+            self.assertEqual(pyramid.n_levels, 7)
+
+
+class TestWindowAggregates(unittest.TestCase):
+    """
+    Tests of the aggregation of the micro-step values over time windows.
+    """
+
+    def test_01_aggregate_windows(self):
+        """
+        Check the blockwise aggregation gives the same values as the one of
+        the whole columns, including empty windows and times outside them.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mic_path = os.path.join(tmpdir, "run.mic")
+            records = build_records(40, MIC_RECORD_LENGTH)
+            records.tofile(mic_path)
+            micreader = MicReader(mic_path)
+            seconds = records[:, 0].astype(float) * 3600 + records[:, 1] + records[:, 2] / 1000
+            edges = [seconds[2], seconds[6] + 1, seconds[7] - 1, seconds[30]]
+            aggregates = aggregate_windows(micreader, [3, 6], MIC_RECORD_LENGTH, edges, block_size=3)
+            self.assertEqual(list(aggregates.count), [5, 0, 24])
+            for (w, (a, b)) in ((0, (2, 7)), (2, (7, 31))):
+                np.testing.assert_array_equal(aggregates.minimum[:, w], records[a, [3, 6]])
+                np.testing.assert_array_equal(aggregates.maximum[:, w], records[b - 1, [3, 6]])
+                np.testing.assert_allclose(aggregates.mean[:, w], records[a:b, [3, 6]].mean(axis=0))
+            self.assertTrue(np.isnan(aggregates.mean[:, 1]).all())
+
+            csv_path = os.path.join(tmpdir, "windows.csv")
+            aggregates.save_csv(csv_path, ["A", "B"])
+            with open(csv_path) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(lines), 4)
+            self.assertTrue(lines[0].endswith("B min,B max,B mean"))
+
+            edges = hourly_edges(seconds, 1.)
+            count = aggregate_windows(micreader, [3], MIC_RECORD_LENGTH, edges).count
+            self.assertEqual(list(count), [np.count_nonzero(seconds <= edges[1])] +
+                             [np.count_nonzero((seconds > a) & (seconds <= b))
+                              for (a, b) in zip(edges[1:-1], edges[2:])])
+            self.assertEqual(count.sum(), 40)
+
+    def test_02_aggregate_macro_steps(self):
+        """
+        Check the aggregation over the macro-steps holds the micro-steps of each
+        macro-step interval, plus the ones following the last macro-step.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mic_path = os.path.join(tmpdir, "run.mic")
+            records = build_records(40, MIC_RECORD_LENGTH)
+            records.tofile(mic_path)
+            micreader = MicReader(mic_path)
+            micreader.extract_time_hsms(MIC_RECORD_LENGTH)
+            macro = records[[5, 17, 22]]
+            alignment = TimeAlignment(TimeIndex(macro[:, 0], macro[:, 1], macro[:, 2]),
+                                      TimeIndex.init_TimeIndex_from_reader(micreader))
+            aggregates = aggregate_macro_steps(micreader, alignment, [3, 6], MIC_RECORD_LENGTH,
+                                               block_size=7)
+            self.assertEqual(list(aggregates.count), [6, 12, 5, 17])
+            self.assertEqual(aggregates.edges.size, 5)
+            ranges = [alignment.micro_range(k) for k in range(3)] + [(23, 40)]
+            for (w, (a, b)) in enumerate(ranges):
+                np.testing.assert_array_equal(aggregates.minimum[:, w], records[a, [3, 6]])
+                np.testing.assert_array_equal(aggregates.maximum[:, w], records[b - 1, [3, 6]])
+                np.testing.assert_allclose(aggregates.mean[:, w], records[a:b, [3, 6]].mean(axis=0))
@@ -0,0 +1,132 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from tugui.engine_check import EngineCheck
+from tugui.native_engine import NativeEngine
+from tugui.quantities import QuantityDictionary
+from tugui.tu_interface import InpHandler, TimeIndex
+from tests.helpers import MAC_RECORD_LENGTH, MIC_RECORD_LENGTH, N_SLICES, QUANTITIES, \
+    load_readers, simulation_pli, tuplot_inp, write_simulation
+
+
+# Stand-in of the TuPlot executable, writing the time histories of the diagram 213
+# read from the synthetic .mic file, with the given bias added to the values
+STAND_IN = """import platform
+import sys
+import numpy as np
+
+BIAS = {bias}
+lines = [line.strip() for line in open(sys.argv[1])]
+kns = [int(kn) for kn in lines[5].split()]
+slice_number = int(lines[6].split()[0])
+(start, end) = [float(h) * 3600 + float(s) + float(ms) / 1000
+                for (h, s, ms) in (lines[7].split(), lines[8].split())]
+records = np.fromfile("run.mic", dtype=np.float32).reshape(-1, {record_length})
+seconds = records[:, 0].astype(float) * 3600 + records[:, 1] + records[:, 2].astype(float) / 1000
+rows = records[(seconds >= start) & (seconds <= end)]
+name = "TuPlot" if platform.system() == "Windows" else "TuPlot01"
+with open(name + ".dat", "w") as f:
+    for (second, row) in zip(seconds[(seconds >= start) & (seconds <= end)], rows):
+        values = [float(row[3 + (kn - 1) * 3 + slice_number - 1]) + BIAS for kn in kns]
+        f.write(" ".join(repr(float(v)) for v in [second / 3600] + values) + "\\n")
+with open(name + ".plt", "w") as f:
+    f.write('"Time (h)" x-axis-title\\n')
+    f.write('"Temperatures" y-axis-title\\n')
+    f.write('"213 Temperatures" ;graph title\\n')
+    f.write('"' + name + '.dat" ;data file\\n')
+    for kn in kns:
+        f.write('"Kn ' + str(kn) + '" ;legend for curve\\n')
+"""
+
+
+class TestEngineCheck(unittest.TestCase):
+    """
+    Tests of the cross-check of the native engine against a stand-in of the
+    plotting executable, run on a synthetic .mic file.
+    """
+
+    def setUp(self):
+        """
+        Write the synthetic files, the quantity dictionary and the stand-in
+        executables into a temporary folder and build the engine.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        folder = self.tmpdir.name
+        self.output_dir = os.path.join(folder, "output")
+        os.mkdir(self.output_dir)
+        write_simulation(folder)
+        with open(os.path.join(folder, "Quantities"), 'w') as f:
+            f.write(QUANTITIES)
+        self.executables = dict()
+        for (name, bias) in [("exact", 0.0), ("biased", 1.0)]:
+            script = os.path.join(folder, name + ".py")
+            with open(script, 'w') as f:
+                f.write(STAND_IN.format(bias=bias, record_length=MIC_RECORD_LENGTH))
+            self.executables[name] = f'"{sys.executable}" "{script}"'
+
+        (micreader, macreader, _) = load_readers(simulation_pli(folder))
+        self.micro_time = TimeIndex.init_TimeIndex_from_reader(micreader)
+        self.engine = NativeEngine(
+            QuantityDictionary.init_QuantityDictionary(os.path.join(folder, "Quantities"),
+                                                       {'M3': N_SLICES}),
+            micreader, MIC_RECORD_LENGTH, macreader, MAC_RECORD_LENGTH)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmpdir.cleanup()
+
+    def engine_check(self, executable: str) -> EngineCheck:
+        """
+        Build the cross-check running the given stand-in executable.
+        """
+        return EngineCheck(self.engine, self.executables[executable], "",
+                           self.tmpdir.name, self.output_dir, repeat=2)
+
+    def test_01_matching_curves(self):
+        """
+        Check the native curves match the ones of the executable and the
+        time of both backends is recorded into the report.
+        """
+        time = "\n".join([self.micro_time[3], self.micro_time[25]])
+        engine_check = self.engine_check("exact")
+        results = engine_check.run([tuplot_inp("213", "1", "1 2", "2", time),
+                                    tuplot_inp("213", "3", "2", "1 3", time)])
+        self.assertEqual(os.getcwd(), self.cwd)
+        # The stand-in does not handle the slices, hence the second diagram differs
+        self.assertTrue(results[0].matched, results[0].message)
+        self.assertLess(results[0].max_rel_error, 1e-6)
+        self.assertGreater(results[0].executable_seconds, 0.0)
+        self.assertGreater(results[0].native_seconds, 0.0)
+        self.assertFalse(results[1].matched)
+
+        report_path = os.path.join(self.tmpdir.name, "report.json")
+        engine_check.save_report(results, report_path)
+        with open(report_path) as f:
+            report = json.load(f)
+        self.assertEqual((report['checked'], report['matched']), (2, 1))
+        self.assertEqual(report['results'][0]['diagram'], "TuPlot 213 1")
+
+    def test_02_differences(self):
+        """
+        Check the differences beyond the tolerances and the diagrams not
+        supported by the native engine are reported, reading the diagrams from
+        an .inp file.
+        """
+        time = "\n".join([self.micro_time[0], self.micro_time[10]])
+        inp_path = os.path.join(self.tmpdir.name, "Check.inp")
+        InpHandler(inp_path).save_inp_file([tuplot_inp("213", "1", "1", "1", time),
+                                            tuplot_inp("213", "1", "3", "1", time)])
+        results = self.engine_check("biased").run_inp_file(inp_path)
+        self.assertFalse(results[0].matched)
+        self.assertAlmostEqual(results[0].max_abs_error, 1.0, places=3)
+        self.assertFalse(results[1].matched)
+        self.assertIsNone(results[1].native_seconds)
+        self.assertIn("not supported", results[1].message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,219 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from tugui.native_engine import NativeEngine
+from tugui.plot_builder import PlotManager
+from tugui.quantities import QuantityDictionary
+from tugui.tu_interface import TimeIndex, TuInp
+from tests.helpers import MAC_RECORD_LENGTH, MIC_RECORD_LENGTH, N_SLICES, QUANTITIES, \
+    STA_AXIAL_STEPS, STA_RECORD_LENGTH, load_readers, simulation_pli, tuplot_inp, \
+    write_simulation
+
+
+class TestNativeEngine(unittest.TestCase):
+    """
+    Tests of the engine producing the diagram curves in-process from the
+    direct-access files, run on synthetic .mic and .mac files.
+    """
+
+    def setUp(self):
+        """
+        Write the synthetic files and the quantity dictionary into a temporary
+        folder and build the engine.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.n_slices = N_SLICES
+        (self.mic_data, self.mac_data, self.sta_data) = write_simulation(self.tmpdir.name)
+        quantities_path = os.path.join(self.tmpdir.name, "Quantities")
+        with open(quantities_path, 'w') as f:
+            f.write(QUANTITIES)
+
+        (self.micreader, self.macreader, self.stareader) = load_readers(
+            simulation_pli(self.tmpdir.name))
+        self.micro_time = TimeIndex.init_TimeIndex_from_reader(self.micreader)
+
+        self.engine = NativeEngine(
+            QuantityDictionary.init_QuantityDictionary(quantities_path, {'M3': self.n_slices}),
+            self.micreader, MIC_RECORD_LENGTH, self.macreader, MAC_RECORD_LENGTH,
+            {113: "Temperature", 213: "Temperatures", 260: "Energy"}, {(213, 1): "inner"},
+            self.stareader, STA_RECORD_LENGTH, STA_AXIAL_STEPS,
+            {93: "093 Fractional Fission Gas Release (/)"})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_01_time_history(self):
+        """
+        Check the time histories of different Kn-s and slices are read from the
+        .mic columns within the start and end times.
+        """
+        time = "\n".join([self.micro_time[5], self.micro_time[20]])
+        hours = self.micro_time.seconds[5:21] / 3600.0
+
+        tuinp = tuplot_inp("213", "1", "1 2", "2", time)
+        self.assertTrue(self.engine.supports(tuinp))
+        curves = self.engine.produce(tuinp)
+        self.assertEqual(list(curves.curves), ["inner", "Kn 2"])
+        self.assertEqual(curves.diagram_name, "213 Temperatures")
+        np.testing.assert_allclose(curves.curves["inner"][:, 0], hours)
+        np.testing.assert_array_equal(curves.curves["inner"][:, 1], self.mic_data[5:21, 4])
+        np.testing.assert_array_equal(curves.curves["Kn 2"][:, 1], self.mic_data[5:21, 7])
+
+        curves = self.engine.produce(tuplot_inp("213", "3", "2", "1 3", time))
+        np.testing.assert_array_equal(curves.curves["Slice 1"][:, 1], self.mic_data[5:21, 6])
+        np.testing.assert_array_equal(curves.curves["Slice 3"][:, 1], self.mic_data[5:21, 8])
+
+        curves = self.engine.produce(tuplot_inp("260", "1", "1", "1", time))
+        np.testing.assert_array_equal(curves.curves["Kn 1"][:, 1], self.mic_data[5:21, 9])
+
+    def test_02_unsupported_diagrams(self):
+        """
+        Check the diagrams whose quantities are not in the dictionary are left
+        to the plotting executables.
+        """
+        time = "\n".join([self.micro_time[0], self.micro_time[1]])
+        self.assertFalse(self.engine.supports(tuplot_inp("213", "1", "3", "1", time)))
+        self.assertFalse(self.engine.supports(tuplot_inp("213", "1", "1", "4", time)))
+        self.assertFalse(self.engine.supports(tuplot_inp("201", "1", "1", "1", time)))
+
+    def test_03_radial_profiles(self):
+        """
+        Check the radial profiles of different Kn-s, times and slices are read
+        from the .mac records, against the radial coordinates.
+        """
+        mac = self.mac_data.reshape(5, self.n_slices, MAC_RECORD_LENGTH)
+        macro_time = TimeIndex.init_TimeIndex_from_reader(self.macreader)
+
+        curves = self.engine.produce(tuplot_inp("113", "1", "1 2", "2", macro_time[3]))
+        self.assertEqual(list(curves.curves), ["Kn 1", "Kn 2"])
+        self.assertEqual(curves.x_axis_name, "Radius")
+        np.testing.assert_array_equal(curves.curves["Kn 1"][:, 0], mac[3, 1, 13:17])
+        np.testing.assert_array_equal(curves.curves["Kn 1"][:, 1], mac[3, 1, [4, 6, 8, 10]])
+        np.testing.assert_array_equal(curves.curves["Kn 2"][:, 1], mac[3, 1, [5, 7, 9, 11]])
+
+        times = [macro_time[0], macro_time[2], macro_time[4]]
+        curves = self.engine.produce(tuplot_inp("113", "2", "2", "3", "\n".join(times)))
+        self.assertEqual(list(curves.curves), ["Time " + t for t in times])
+        for (i, t) in zip([0, 2, 4], times):
+            np.testing.assert_array_equal(curves.curves["Time " + t][:, 0], mac[i, 2, 13:17])
+            np.testing.assert_array_equal(curves.curves["Time " + t][:, 1], mac[i, 2, [5, 7, 9, 11]])
+
+        curves = self.engine.produce(tuplot_inp("113", "3", "1", "1 3", macro_time[1]))
+        np.testing.assert_array_equal(curves.curves["Slice 1"][:, 1], mac[1, 0, [4, 6, 8, 10]])
+        np.testing.assert_array_equal(curves.curves["Slice 3"][:, 1], mac[1, 2, [4, 6, 8, 10]])
+
+        with self.assertRaises(Exception):
+            self.engine.produce(tuplot_inp("113", "1", "1", "1", "1 2 0.0"))
+
+    def test_04_axial_profiles(self):
+        """
+        Check the axial profiles of different Kn-s and times are read from the
+        .mic and .mac records, against the axial coordinates.
+        """
+        mac = self.mac_data.reshape(5, self.n_slices, MAC_RECORD_LENGTH)
+        macro_time = TimeIndex.init_TimeIndex_from_reader(self.macreader)
+
+        curves = self.engine.produce(tuplot_inp("301", "1", "1 2", "1", macro_time[2]))
+        self.assertEqual(curves.x_axis_name, "Axial coordinate")
+        np.testing.assert_array_equal(curves.curves["Kn 1"][:, 0], self.mic_data[2, 3:6])
+        np.testing.assert_array_equal(curves.curves["Kn 1"][:, 1], self.mic_data[2, 6:9])
+        np.testing.assert_array_equal(curves.curves["Kn 2"][:, 0], self.mic_data[2, 3:6])
+        np.testing.assert_array_equal(curves.curves["Kn 2"][:, 1], mac[2, :, 12])
+
+        times = [self.micro_time[30], self.micro_time[7], self.micro_time[12]]
+        curves = self.engine.produce(tuplot_inp("301", "2", "1", "1", "\n".join(times)))
+        for (i, t) in zip([30, 7, 12], times):
+            np.testing.assert_array_equal(curves.curves["Time " + t][:, 0], self.mic_data[i, 3:6])
+            np.testing.assert_array_equal(curves.curves["Time " + t][:, 1], self.mic_data[i, 6:9])
+
+        times = [macro_time[4], macro_time[0]]
+        curves = self.engine.produce(tuplot_inp("301", "2", "2", "1", "\n".join(times)))
+        np.testing.assert_array_equal(curves.curves["Time " + times[0]][:, 1], mac[4, :, 12])
+        np.testing.assert_array_equal(curves.curves["Time " + times[1]][:, 1], mac[0, :, 12])
+
+        # The micro-steps are mapped to the macro-step closing their interval, or to the
+        # last one if they follow all of them
+        times = [self.micro_time[3], self.micro_time[4], self.micro_time[30]]
+        curves = self.engine.produce(tuplot_inp("301", "2", "2", "1", "\n".join(times)))
+        for (i, j, t) in zip([3, 4, 30], [3, 4, 4], times):
+            np.testing.assert_array_equal(curves.curves["Time " + t][:, 0], self.mic_data[i, 3:6])
+            np.testing.assert_array_equal(curves.curves["Time " + t][:, 1], mac[j, :, 12])
+
+    def test_05_histograms(self):
+        """
+        Check the statistical distributions are built over the datasets of the
+        requested times, for all the requested sections at once.
+        """
+        sta_times = TimeIndex.init_TimeIndex_from_reader(self.stareader)
+        time = sta_times[0]
+        tuinp = TuInp.configure_tustat_inp_fields({
+            "PLI": "run.pli", "DIAGNR": "93", "NAXIAL": "2", "TIME": time,
+            "INTERV": "2", "DISTR": "f", "CONTIN": "E"})
+        self.assertTrue(self.engine.supports(tuinp))
+        curves = self.engine.produce(tuinp)
+        self.assertEqual(curves.x_axis_name, "Fractional Fission Gas Release (/)")
+        self.assertEqual(curves.y_axis_name, "Fractional frequency")
+        # Values 14, 114 and 314 of the datasets 0, 1 and 3, over 2 intervals
+        np.testing.assert_allclose(curves.curves["Slice 2"], [[89, 2 / 3], [239, 1 / 3]])
+
+        curves = self.engine.histograms(93, [1, 2, 3], [sta_times[0], sta_times[1]], 2, 'd')
+        self.assertEqual(len(curves.curves), 6)
+        np.testing.assert_allclose(
+            curves.curves["Time " + time + ", Slice 2"][:, 1], [2 / 3 / 150, 1 / 3 / 150])
+        # Values 204 and 504 of the datasets 2 and 5
+        np.testing.assert_allclose(
+            curves.curves["Time " + sta_times[1] + ", Slice 1"], [[279, 1 / 300], [429, 1 / 300]])
+
+        tuinp.diagram_config = tuinp.diagram_config.replace("93\n", "94\n")
+        self.assertFalse(self.engine.supports(tuinp))
+
+    def test_06_plot_manager(self):
+        """
+        Check the curves produced in-process feed the plot manager the same way
+        as the ones read from the .dat and .plt files.
+        """
+        time = "\n".join([self.micro_time[0], self.micro_time[3]])
+        curves = self.engine.produce(tuplot_inp("213", "1", "1", "1", time))
+        plot_manager = PlotManager.init_PlotManager_from_curves(curves)
+        self.assertEqual(plot_manager.legend, ["inner"])
+        self.assertEqual(plot_manager.x_axis_name, "Time (h)")
+        self.assertEqual(len(plot_manager.curves2plot["inner"]), 4)
+        self.assertEqual(plot_manager.curves2plot["inner"][2][1], float(self.mic_data[2, 3]))
+
+    def test_07_output_files(self):
+        """
+        Check the curves produced in-process are written into .dat and .plt
+        files that are read back by the plot manager as the executables ones.
+        """
+        macro_time = TimeIndex.init_TimeIndex_from_reader(self.macreader)
+        curves = self.engine.produce(tuplot_inp("113", "1", "1 2", "2", macro_time[3]))
+        dat_path = os.path.join(self.tmpdir.name, "TuPlot.dat")
+        plt_path = os.path.join(self.tmpdir.name, "TuPlot.plt")
+        curves.write_output_files(dat_path, plt_path)
+
+        plot_manager = PlotManager(dat_path, plt_path)
+        self.assertEqual(plot_manager.diagram_name, curves.diagram_name)
+        self.assertEqual(plot_manager.x_axis_name, "Radius")
+        self.assertEqual(list(plot_manager.curves2plot), ["Kn 1", "Kn 2"])
+        for (legend, values) in curves.curves.items():
+            np.testing.assert_array_equal(plot_manager.curves2plot[legend], values)
+
+        # The names are rendered the same way whether the curves are read back from the
+        # output files or given straight to the plot manager
+        curves.x_axis_name = "r_{fuel}"
+        curves.curves = {"T^{2}": curves.curves["Kn 1"], "\\a": curves.curves["Kn 2"]}
+        curves.write_output_files(dat_path, plt_path)
+        from_files = PlotManager(dat_path, plt_path)
+        from_curves = PlotManager.init_PlotManager_from_curves(curves)
+        self.assertNotEqual(from_curves.legend, list(curves.curves))
+        for attribute in ("x_axis_name", "y_axis_name", "diagram_name"):
+            self.assertEqual(getattr(from_curves, attribute), getattr(from_files, attribute))
+        self.assertEqual(from_curves.legend, list(from_files.curves2plot))
+        self.assertEqual(list(from_curves.curves2plot), list(from_files.curves2plot))
+
+
+if __name__ == '__main__':
+    unittest.main()
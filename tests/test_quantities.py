@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from tugui.quantities import QuantityDictionary, evaluate_expression
+from tugui.tu_interface import PliReader
+
+
+# Content of a synthetic quantity dictionary
+QUANTITIES = """# Synthetic entries
+213 1 mic 3 M3 1
+213 2 mic 3+M3 M3 1
+113 1 mac 3 2*M3//5 2
+
+X3 - mic 3+4*M3 M3 1
+"""
+
+
+class TestQuantityDictionary(unittest.TestCase):
+    """
+    Tests of the dictionary mapping the plot quantities to the record columns
+    of the direct-access files.
+    """
+
+    def setUp(self):
+        """
+        Write the synthetic quantity dictionary into a temporary folder.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "Quantities")
+        with open(self.path, 'w') as f:
+            f.write(QUANTITIES)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_01_resolve(self):
+        """
+        Check the quantities are resolved to record columns for the M3 option
+        of the simulation.
+        """
+        plireader = PliReader(opt_dict={'M3': '5', 'ISTATI': '0', 'NAME': 'x'})
+        quantities = QuantityDictionary.init_QuantityDictionary_from_pli(self.path, plireader)
+        self.assertIn((213, 2), quantities)
+        self.assertEqual(quantities.kns(213), [1, 2])
+        location = quantities.resolve(213, 2)
+        self.assertEqual((location.file, location.columns), ('mic', [8, 9, 10, 11, 12]))
+        self.assertEqual(quantities.resolve(213, 2, slice_number=2).columns, [9])
+        self.assertEqual(quantities.resolve("113", "1", slice_number=2).columns, [3, 5])
+        self.assertEqual(quantities.coordinate('X3').columns, [23, 24, 25, 26, 27])
+        with self.assertRaises(Exception):
+            quantities.resolve(213, 3)
+        with self.assertRaises(Exception):
+            quantities.resolve(213, 1, slice_number=6)
+        with self.assertRaises(Exception):
+            quantities.coordinate('X1')
+
+    def test_02_invalid(self):
+        """
+        Check invalid expressions and entries are rejected.
+        """
+        self.assertEqual(evaluate_expression("(M3+1)*2-3", {'M3': 4}), 7)
+        for expression in ("M2", "2**3", "__import__('os')", "1/2", "1.5"):
+            with self.assertRaises(Exception):
+                evaluate_expression(expression, {'M3': 4})
+        with open(self.path, 'a') as f:
+            f.write("214 1 dat 3 1 1\n")
+        with self.assertRaises(Exception):
+            QuantityDictionary.init_QuantityDictionary(self.path, {'M3': 5})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
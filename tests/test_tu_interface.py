@@ -0,0 +1,566 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tugui.tu_interface import ColumnarSidecar, DaArchive, DaCache, MacReader, MicReader, \
+    RestartChain, SharedArrayDescriptor, StaReader, TimeAlignment, TimeIndex, \
+    load_mac_reader, load_mic_reader, write_da_archive
+from tests.helpers import MAC_RECORD_LENGTH, MIC_RECORD_LENGTH, N_SLICES, STA_AXIAL_STEPS, \
+    STA_RECORD_LENGTH, build_records, simulation_pli, write_simulation
+
+
+def sum_shared_array(descriptor: SharedArrayDescriptor) -> float:
+    """
+    Function run by a worker process that sums the values of a shared array.
+    """
+    (array, shm) = descriptor.attach()
+    try:
+        return float(array.sum())
+    finally:
+        del array
+        shm.close()
+
+
+
+class TestDaReaders(unittest.TestCase):
+    """
+    Tests of the classes interpreting the direct-access files produced by a
+    TU simulation, run on synthetic .mic and .mac files.
+    """
+
+    def setUp(self):
+        """
+        Write the synthetic .mic and .mac files into a temporary folder.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.n_slices = N_SLICES
+        (self.mic_data, self.mac_data, self.sta_data) = write_simulation(self.tmpdir.name)
+        self.mic_path = os.path.join(self.tmpdir.name, "run.mic")
+        self.mac_path = os.path.join(self.tmpdir.name, "run.mac")
+        self.sta_path = os.path.join(self.tmpdir.name, "run.sta")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_01_memory_mapped_records(self):
+        """
+        Check the memory-mapped view of the records is the same as the one
+        given by reading the whole file.
+        """
+        mapped = MicReader(self.mic_path, memory_map=True).read_tu_data(MIC_RECORD_LENGTH)
+        read = MicReader(self.mic_path).read_tu_data(MIC_RECORD_LENGTH)
+        self.assertIsInstance(mapped, np.memmap)
+        np.testing.assert_array_equal(mapped, read)
+        np.testing.assert_array_equal(mapped, self.mic_data)
+
+    def test_02_memory_mapped_incomplete_record(self):
+        """
+        Check an incomplete trailing record, as written by a still running
+        simulation, is ignored when reading the file.
+        """
+        with open(self.mic_path, 'ab') as f:
+            f.write(b'\x00' * 8)
+        for memory_map in (True, False):
+            data = MicReader(self.mic_path, memory_map=memory_map).read_tu_data(MIC_RECORD_LENGTH)
+            np.testing.assert_array_equal(data, self.mic_data)
+
+    def test_03_mac_times(self):
+        """
+        Check the times extracted from the memory-mapped .mac file are
+        filtered every n-slices records.
+        """
+        macreader = MacReader(self.mac_path, self.n_slices, memory_map=True)
+        (h, s, ms) = macreader.extract_xtime_hsms(MAC_RECORD_LENGTH)
+        self.assertEqual(list(h), [100, 100, 100, 100, 101])
+        self.assertEqual(list(s), [0, 900, 1800, 2700, 0])
+        np.testing.assert_array_equal(ms, [0.0, 0.5, 1.0, 0.0, 0.5])
+
+    def test_04_mic_times_only_columns(self):
+        """
+        Check the micro-step times are extracted as arrays without reading
+        the whole records.
+        """
+        micreader = MicReader(self.mic_path)
+        micreader.read_tu_data = None
+        (h, s, ms) = micreader.extract_time_hsms(MIC_RECORD_LENGTH)
+        self.assertIsInstance(h, np.ndarray)
+        np.testing.assert_array_equal(h, self.mic_data[:, 0].astype(int))
+        np.testing.assert_array_equal(s, self.mic_data[:, 1].astype(int))
+        np.testing.assert_array_equal(ms, self.mic_data[:, 2])
+
+    def test_05_sta_unique_times(self):
+        """
+        Check the distinct times of the statistical datasets keep their order
+        of appearance, along with the index of their first dataset.
+        """
+        stareader = StaReader(self.sta_path, 4)
+        (h, s, ms) = stareader.extract_time_hsms(
+            STA_RECORD_LENGTH, STA_AXIAL_STEPS, self.sta_data.shape[0] * (STA_AXIAL_STEPS + 1))
+        self.assertEqual(list(h), [10, 20, 30])
+        self.assertEqual(list(s), [0, 5, 0])
+        np.testing.assert_array_equal(ms, [0., 0.5, 0.])
+        self.assertEqual(list(stareader.time_datasets), [0, 2, 4])
+        self.assertEqual(list(stareader.dataset_times), [0, 0, 1, 0, 2, 1])
+
+    def test_06_sta_random_access(self):
+        """
+        Check the .sta data keeps its type on disk and can be read by dataset,
+        or by time instant, and axial section.
+        """
+        n_records = self.sta_data.shape[0] * (STA_AXIAL_STEPS + 1)
+        stareader = StaReader(self.sta_path, 4, memory_map=True)
+        data = stareader.read_tu_data(STA_RECORD_LENGTH, STA_AXIAL_STEPS, n_records)
+        self.assertEqual(data.dtype, np.float32)
+        np.testing.assert_array_equal(data, self.sta_data)
+        np.testing.assert_array_equal(
+            stareader.read_dataset(4, 1, STA_RECORD_LENGTH, STA_AXIAL_STEPS),
+            self.sta_data[4, 1])
+        stareader.extract_time_hsms(STA_RECORD_LENGTH, STA_AXIAL_STEPS, n_records)
+        np.testing.assert_array_equal(
+            stareader.read_time_section(0, 2, STA_RECORD_LENGTH, STA_AXIAL_STEPS),
+            self.sta_data[[0, 1, 3], 2])
+        with self.assertRaises(Exception):
+            stareader.read_dataset(6, 0, STA_RECORD_LENGTH, STA_AXIAL_STEPS)
+
+    def test_07_follow_appended_records(self):
+        """
+        Check only the complete records appended to the files are added to the
+        extracted times, while partially written ones are ignored.
+        """
+        micreader = MicReader(self.mic_path)
+        micreader.extract_time_hsms(MIC_RECORD_LENGTH)
+        macreader = MacReader(self.mac_path, self.n_slices)
+        macreader.extract_xtime_hsms(MAC_RECORD_LENGTH)
+        self.assertEqual(micreader.follow_time_hsms(MIC_RECORD_LENGTH), 0)
+
+        # Append 2 complete records and a partial one to the .mic file
+        new_mic = build_records(43, MIC_RECORD_LENGTH)[40:]
+        with open(self.mic_path, 'ab') as f:
+            f.write(new_mic.tobytes()[:-8])
+        self.assertEqual(micreader.follow_time_hsms(MIC_RECORD_LENGTH), 2)
+        np.testing.assert_array_equal(micreader.time_s, build_records(42, MIC_RECORD_LENGTH)[:, 1])
+        # Complete the partial record
+        with open(self.mic_path, 'ab') as f:
+            f.write(new_mic.tobytes()[-8:])
+        self.assertEqual(micreader.follow_time_hsms(MIC_RECORD_LENGTH), 1)
+        self.assertEqual(micreader.time_h.size, 43)
+
+        # Append the records of one time instant, but the last slice, to the .mac file
+        new_mac = build_records(6 * self.n_slices, MAC_RECORD_LENGTH, self.n_slices)[-3:]
+        with open(self.mac_path, 'ab') as f:
+            f.write(new_mac[:-1].tobytes())
+        self.assertEqual(macreader.follow_time_hsms(MAC_RECORD_LENGTH), 0)
+        with open(self.mac_path, 'ab') as f:
+            f.write(new_mac[-1].tobytes())
+        self.assertEqual(macreader.follow_time_hsms(MAC_RECORD_LENGTH), 1)
+        self.assertEqual(list(macreader.time_s), [0, 900, 1800, 2700, 0, 900])
+
+    def test_08_read_columns(self):
+        """
+        Check the projection of the requested columns, for all times or for a
+        range of them, for both .mic and .mac files.
+        """
+        micreader = MicReader(self.mic_path)
+        columns = micreader.read_columns([5, 3], MIC_RECORD_LENGTH)
+        self.assertEqual(columns.shape, (2, 40))
+        self.assertTrue(columns.flags['C_CONTIGUOUS'])
+        np.testing.assert_array_equal(columns, self.mic_data[:, [5, 3]].T)
+        np.testing.assert_array_equal(
+            micreader.read_columns([4], MIC_RECORD_LENGTH, time_range=(10, 12)),
+            self.mic_data[10:12, [4]].T)
+
+        macreader = MacReader(self.mac_path, self.n_slices)
+        columns = macreader.read_columns([7], MAC_RECORD_LENGTH, time_range=(1, 3))
+        self.assertEqual(columns.shape, (1, 2, self.n_slices))
+        np.testing.assert_array_equal(
+            columns[0], self.mac_data[3:9, 7].reshape(2, self.n_slices))
+
+        # Only the records of the given times are read, in the order given
+        np.testing.assert_array_equal(
+            micreader.read_columns_at([5, 3], MIC_RECORD_LENGTH, [30, 2, 30]),
+            self.mic_data[[30, 2, 30]][:, [5, 3]].T)
+        columns = macreader.read_columns_at([7], MAC_RECORD_LENGTH, [4, 0])
+        np.testing.assert_array_equal(
+            columns[0], self.mac_data[[12, 13, 14, 0, 1, 2], 7].reshape(2, self.n_slices))
+        with self.assertRaises(Exception):
+            micreader.read_columns_at([3], MIC_RECORD_LENGTH, [40])
+
+    def test_09_iter_records(self):
+        """
+        Check the scan of the records by blocks of time instants, with and
+        without filtering on times and columns.
+        """
+        micreader = MicReader(self.mic_path)
+        blocks = list(micreader.iter_records(MIC_RECORD_LENGTH, block_size=16))
+        self.assertEqual([first for (first, _) in blocks], [0, 16, 32])
+        np.testing.assert_array_equal(
+            np.concatenate([block for (_, block) in blocks]), self.mic_data)
+        blocks = list(micreader.iter_records(
+            MIC_RECORD_LENGTH, block_size=4, time_range=(5, 11), columns=[0, 6]))
+        self.assertEqual([first for (first, _) in blocks], [5, 9])
+        np.testing.assert_array_equal(
+            np.concatenate([block for (_, block) in blocks]), self.mic_data[5:11, [0, 6]])
+
+        macreader = MacReader(self.mac_path, self.n_slices)
+        blocks = list(macreader.iter_records(MAC_RECORD_LENGTH, block_size=2))
+        self.assertEqual([block.shape[0] for (_, block) in blocks], [6, 6, 3])
+
+    def test_10_da_cache(self):
+        """
+        Check the cached objects are reused until the file changes, and the
+        least recently used ones are evicted beyond the memory limit.
+        """
+        cache = DaCache(max_bytes=3 * self.mic_data.nbytes)
+        loads = list()
+
+        def load(path):
+            loads.append(path)
+            return MicReader(path).read_tu_data(MIC_RECORD_LENGTH)
+
+        first = cache.get(self.mic_path, lambda: load(self.mic_path), MIC_RECORD_LENGTH)
+        self.assertIs(cache.get(self.mic_path, lambda: load(self.mic_path), MIC_RECORD_LENGTH), first)
+        self.assertEqual(len(loads), 1)
+        # Changing the file invalidates the cached object, which is replaced
+        build_records(41, MIC_RECORD_LENGTH).tofile(self.mic_path)
+        second = cache.get(self.mic_path, lambda: load(self.mic_path), MIC_RECORD_LENGTH)
+        self.assertEqual(second.shape[0], 41)
+        self.assertEqual((len(loads), len(cache)), (2, 1))
+        # Adding other objects evicts the least recently used ones
+        other_path = os.path.join(self.tmpdir.name, "other.mic")
+        self.mic_data.tofile(other_path)
+        cache.get(other_path, lambda: load(other_path), MIC_RECORD_LENGTH)
+        self.assertEqual(len(cache), 2)
+        cache.resize(self.mic_data.nbytes)
+        self.assertEqual(len(cache), 1)
+        self.assertLessEqual(cache.nbytes, self.mic_data.nbytes)
+        # Memory-mapped arrays are not accounted for
+        cache.get(self.mac_path, lambda: MacReader(self.mac_path, self.n_slices, True).read_tu_data(
+            MAC_RECORD_LENGTH), MAC_RECORD_LENGTH)
+        self.assertEqual(len(cache), 2)
+
+    def test_11_columnar_sidecar(self):
+        """
+        Check the columnar sidecar is built on first use, then reused until a
+        source file changes, and that readers attached to it give the same
+        times and columns as the ones reading the files.
+        """
+        plireader = simulation_pli(self.tmpdir.name)
+        self.assertIsNone(ColumnarSidecar.init_ColumnarSidecar(plireader, build=False))
+        sidecar = ColumnarSidecar.init_ColumnarSidecar(plireader)
+        self.assertTrue(os.path.isfile(os.path.join(self.tmpdir.name, "run.tugui", "mic.npy")))
+        self.assertIsNotNone(ColumnarSidecar.init_ColumnarSidecar(plireader, build=False))
+        np.testing.assert_array_equal(sidecar.columns('mic'), self.mic_data.T)
+
+        micreader = sidecar.attach(MicReader(self.mic_path))
+        micreader.extract_time_hsms(MIC_RECORD_LENGTH)
+        np.testing.assert_array_equal(micreader.time_s, self.mic_data[:, 1].astype(int))
+        np.testing.assert_array_equal(
+            micreader.read_columns([4, 7], MIC_RECORD_LENGTH, (2, 5)), self.mic_data[2:5, [4, 7]].T)
+        np.testing.assert_array_equal(
+            micreader.read_columns_at([4, 7], MIC_RECORD_LENGTH, [33, 2]),
+            self.mic_data[[33, 2]][:, [4, 7]].T)
+        macreader = sidecar.attach(MacReader(self.mac_path, self.n_slices))
+        np.testing.assert_array_equal(
+            macreader.read_columns([5], MAC_RECORD_LENGTH),
+            MacReader(self.mac_path, self.n_slices).read_columns([5], MAC_RECORD_LENGTH))
+
+        # Load the readers through the columnar copy, as opted in by the GUI
+        micreader = load_mic_reader(plireader, columnar=True)
+        self.assertIsNotNone(micreader.column_store)
+        np.testing.assert_array_equal(micreader.time_s, self.mic_data[:, 1].astype(int))
+        self.assertIsNone(load_mic_reader(plireader).column_store)
+        macreader = load_mac_reader(plireader, columnar=True)
+        np.testing.assert_array_equal(
+            macreader.read_columns([5], MAC_RECORD_LENGTH), self.mac_data[:, 5].reshape(1, -1, 3))
+
+        # Append a record to the .mic file: the sidecar is stale
+        with open(self.mic_path, 'ab') as f:
+            f.write(build_records(41, MIC_RECORD_LENGTH)[40:].tobytes())
+        self.assertIsNone(ColumnarSidecar.init_ColumnarSidecar(plireader, build=False))
+        self.assertEqual(
+            ColumnarSidecar.init_ColumnarSidecar(plireader).columns('mic').shape,
+            (MIC_RECORD_LENGTH, 41))
+
+        # Keep the .mac file as a block-compressed archive only: the sidecar is built
+        # from the archive content
+        write_da_archive(self.mac_path, block_bytes=100)
+        os.remove(self.mac_path)
+        self.assertIsNone(ColumnarSidecar.init_ColumnarSidecar(plireader, build=False))
+        sidecar = ColumnarSidecar.init_ColumnarSidecar(plireader)
+        np.testing.assert_array_equal(sidecar.columns('mac'), self.mac_data.T)
+        self.assertIsNotNone(ColumnarSidecar.init_ColumnarSidecar(plireader, build=False))
+
+    def test_12_restart_chain(self):
+        """
+        Check the runs of a restart chain are joined into a single time axis,
+        where the time instants of a run overlapping the following one are
+        dropped, and that incompatible runs are rejected.
+        """
+        # Write a second run restarting from the 31st micro-step and 4th macro-step
+        mic_data = build_records(50, MIC_RECORD_LENGTH)[30:] + 0.25
+        mic_data[:, 0:3] = build_records(50, MIC_RECORD_LENGTH)[30:, 0:3]
+        mac_data = build_records(6 * self.n_slices, MAC_RECORD_LENGTH, self.n_slices)[9:]
+        os.makedirs(os.path.join(self.tmpdir.name, "restart"))
+        mic_data.tofile(os.path.join(self.tmpdir.name, "restart", "run.mic"))
+        mac_data.tofile(os.path.join(self.tmpdir.name, "restart", "run.mac"))
+        plireaders = [simulation_pli(folder)
+                      for folder in (self.tmpdir.name, os.path.join(self.tmpdir.name, "restart"))]
+
+        chain = RestartChain(plireaders)
+        self.assertEqual(list(chain.mic.stops), [30, 20])
+        np.testing.assert_array_equal(
+            chain.mic.time_s, build_records(50, MIC_RECORD_LENGTH)[:, 1].astype(int))
+        columns = chain.mic.read_columns([4], MIC_RECORD_LENGTH, (28, 33))
+        np.testing.assert_array_equal(
+            columns[0], np.concatenate((self.mic_data[28:30, 4], mic_data[0:3, 4])))
+        self.assertEqual(chain.mic.locate(31), (1, 1))
+        np.testing.assert_array_equal(
+            chain.mic.read_columns_at([4], MIC_RECORD_LENGTH, [45, 3])[0],
+            [mic_data[15, 4], self.mic_data[3, 4]])
+        self.assertEqual(list(chain.mac.stops), [3, 3])
+        self.assertEqual(chain.mac.read_columns([3, 4], MAC_RECORD_LENGTH).shape,
+                         (2, 6, self.n_slices))
+        self.assertEqual(chain.mac.read_columns([3], MAC_RECORD_LENGTH, (2, 2)).shape,
+                         (1, 0, self.n_slices))
+
+        # Same M3 option but different ISLICE one, i.e. a different number of axial sections
+        plireaders[1].opt_dict['ISLICE'] = '0'
+        plireaders[1].axial_steps = self.n_slices + 1
+        with self.assertRaisesRegex(Exception, "number of axial sections"):
+            RestartChain(plireaders)
+
+        plireaders[1].axial_steps = self.n_slices
+        plireaders[1].opt_dict['M3'] = '5'
+        with self.assertRaises(Exception):
+            RestartChain(plireaders)
+
+    def test_13_compressed_archive(self):
+        """
+        Check the readers fall back to the block-compressed archive of a file
+        when the latter is missing, giving the same content, and that only the
+        archive blocks holding the requested records are decompressed.
+        """
+        for (path, codec) in ((self.mic_path, 'zlib'), (self.mac_path, 'lzma'),
+                              (self.sta_path, 'zlib')):
+            write_da_archive(path, codec=codec, block_bytes=100)
+            os.remove(path)
+        micreader = MicReader(self.mic_path)
+        self.assertIsInstance(micreader.archive, DaArchive)
+        np.testing.assert_array_equal(micreader.read_tu_data(MIC_RECORD_LENGTH), self.mic_data)
+        (h, s, ms) = micreader.extract_time_hsms(MIC_RECORD_LENGTH)
+        np.testing.assert_array_equal(s, self.mic_data[:, 1].astype(int))
+        np.testing.assert_array_equal(
+            micreader.read_columns([3, 8], MIC_RECORD_LENGTH, (5, 9)), self.mic_data[5:9, [3, 8]].T)
+        blocks = list()
+        read_block = micreader.archive._read_block
+        micreader.archive._read_block = lambda i: blocks.append(i) or read_block(i)
+        np.testing.assert_array_equal(
+            micreader._map_records(MIC_RECORD_LENGTH)[20:22, 4], self.mic_data[20:22, 4])
+        self.assertEqual(blocks, [9, 10])
+
+        macreader = MacReader(self.mac_path, self.n_slices)
+        (h, s, ms) = macreader.extract_xtime_hsms(MAC_RECORD_LENGTH)
+        self.assertEqual(list(s), [0, 900, 1800, 2700, 0])
+        blocks = [(first, block) for (first, block) in macreader.iter_records(MAC_RECORD_LENGTH, 2)]
+        np.testing.assert_array_equal(np.concatenate([b for (_, b) in blocks]), self.mac_data)
+
+        stareader = StaReader(self.sta_path, 4)
+        np.testing.assert_array_equal(
+            stareader.read_dataset(4, 1, STA_RECORD_LENGTH, STA_AXIAL_STEPS), self.sta_data[4, 1])
+        (h, s, ms) = stareader.extract_time_hsms(
+            STA_RECORD_LENGTH, STA_AXIAL_STEPS, self.sta_data.shape[0] * (STA_AXIAL_STEPS + 1))
+        self.assertEqual(list(h), [10, 20, 30])
+
+    def test_14_archive_fancy_indexing(self):
+        """
+        Check the archived records are selected by arrays of indices, and that
+        the .mac cube and the .sta datasets built over an archive decompress
+        only the blocks holding the selected records.
+        """
+        for path in (self.mic_path, self.mac_path, self.sta_path):
+            write_da_archive(path, block_bytes=100)
+            os.remove(path)
+        records = MicReader(self.mic_path)._map_records(MIC_RECORD_LENGTH)
+        np.testing.assert_array_equal(records[[7, -1, 7, 2]], self.mic_data[[7, -1, 7, 2]])
+        np.testing.assert_array_equal(records[np.array([[3], [30]]), [4, 5]],
+                                      self.mic_data[np.array([[3], [30]]), [4, 5]])
+        mask = np.zeros(40, dtype=bool)
+        mask[[1, 2, 39]] = True
+        np.testing.assert_array_equal(records[mask, 3], self.mic_data[mask, 3])
+        with self.assertRaises(IndexError):
+            records[[40]]
+
+        macreader = MacReader(self.mac_path, self.n_slices)
+        cube = macreader.cube(MAC_RECORD_LENGTH)
+        mac = self.mac_data.reshape(5, self.n_slices, MAC_RECORD_LENGTH)
+        blocks = list()
+        read_block = macreader.archive._read_block
+        macreader.archive._read_block = lambda i: blocks.append(i) or read_block(i)
+        np.testing.assert_array_equal(cube.select([4], [2, 3], [5, 6]), mac[np.ix_([4], [1, 2], [5, 6])])
+        self.assertEqual(blocks, [10, 11])
+        np.testing.assert_array_equal(cube.history(1, 4, (1, 3)), mac[1:3, 0, 4])
+        np.testing.assert_array_equal(cube.axial_profile(3, [4, 5]), mac[3, :, [4, 5]])
+        np.testing.assert_array_equal(cube[2], mac[2])
+
+        stareader = StaReader(self.sta_path, 4)
+        stareader.extract_time_hsms(
+            STA_RECORD_LENGTH, STA_AXIAL_STEPS, self.sta_data.shape[0] * (STA_AXIAL_STEPS + 1))
+        blocks = list()
+        read_block = stareader.archive._read_block
+        stareader.archive._read_block = lambda i: blocks.append(i) or read_block(i)
+        np.testing.assert_array_equal(
+            stareader.read_section_columns(1, [0, 2], [3, 4], STA_RECORD_LENGTH, STA_AXIAL_STEPS),
+            self.sta_data[np.ix_([2, 5], [0, 2], [3, 4])])
+        self.assertNotIn(0, blocks)
+        np.testing.assert_array_equal(
+            stareader.read_time_section(0, 1, STA_RECORD_LENGTH, STA_AXIAL_STEPS),
+            self.sta_data[[0, 1, 3], 1])
+
+    def test_15_validate_layout(self):
+        """
+        Check the direct-access files are validated against the layout
+        declared in the .pli file, reporting truncated files and wrong record
+        lengths or counts before any read.
+        """
+        plireader = simulation_pli(self.tmpdir.name)
+        plireader.validate_da_files(statistical=True)
+
+        # Wrong .mac record length and IBYTE
+        plireader.mac_recordLength = str(MAC_RECORD_LENGTH + 1)
+        plireader.opt_dict['IBYTE'] = '2'
+        with self.assertRaisesRegex(Exception, "run.mac.*same time values(.|\n)*IBYTE"):
+            plireader.validate_da_files(statistical=True)
+        plireader.mac_recordLength = str(MAC_RECORD_LENGTH)
+        plireader.opt_dict['IBYTE'] = '4'
+
+        # .mic file of a running simulation, whose last record is partially written
+        with open(self.mic_path, 'r+b') as f:
+            f.truncate(39 * MIC_RECORD_LENGTH * 4 + 8)
+        warnings = plireader.validate_da_files(statistical=True)
+        self.assertEqual(len(warnings), 2)
+        self.assertRegex(warnings[0], "run.mic.*incomplete record")
+        self.assertRegex(warnings[1], "39 of the 40 declared records")
+        self.assertEqual(MicReader(self.mic_path).check_layout(MIC_RECORD_LENGTH)[0], [])
+        self.assertEqual(MicReader(self.mic_path).read_tu_data(MIC_RECORD_LENGTH).shape,
+                         (39, MIC_RECORD_LENGTH))
+        with self.assertRaisesRegex(Exception, "time values.*record length"):
+            MicReader(self.mic_path).read_tu_data(MIC_RECORD_LENGTH + 2)
+
+        # Zero-padded records read with a wrong record length, with and without an
+        # incomplete trailing record
+        padded_path = os.path.join(self.tmpdir.name, "padded.mic")
+        padded = np.zeros((40, MIC_RECORD_LENGTH), dtype=np.float32)
+        padded[:, 0:3] = build_records(40, MIC_RECORD_LENGTH)[:, 0:3]
+        padded.tofile(padded_path)
+        self.assertEqual(MicReader(padded_path).check_layout(MIC_RECORD_LENGTH), ([], []))
+        (problems, warnings) = MicReader(padded_path).check_layout(16)
+        self.assertRegex(problems[0], "time values.*record length \\(16\\) is wrong")
+        (problems, warnings) = MicReader(padded_path).check_layout(13, 40)
+        self.assertRegex(problems[1], "not a multiple of the record length")
+        self.assertEqual(warnings, ["the 'padded.mic' file holds 36 of the 40 declared "
+                                    "records: the simulation is still running or the "
+                                    "file is truncated"])
+
+        # .mac file holding more records than the declared ones
+        plireader.sta_macStep = str(4 * self.n_slices)
+        with self.assertRaisesRegex(Exception, "15 records instead of the 12 declared ones"):
+            plireader.validate_da_files()
+
+    def test_16_mac_cube(self):
+        """
+        Check the .mac content is viewed as a (time, slice, column) cube, with
+        profiles and histories selected by time and slice labels.
+        """
+        macreader = MacReader(self.mac_path, self.n_slices, memory_map=True)
+        cube = macreader.cube(MAC_RECORD_LENGTH)
+        self.assertEqual(cube.shape, (5, self.n_slices, MAC_RECORD_LENGTH))
+        self.assertIsInstance(cube.data, np.memmap)
+        expected = self.mac_data.reshape(5, self.n_slices, MAC_RECORD_LENGTH)
+        np.testing.assert_array_equal(cube.radial_profile(3, 2), expected[3, 1])
+        np.testing.assert_array_equal(
+            cube.radial_profile(cube.times[1], 1, [4, 6]), expected[1, 0, [4, 6]])
+        np.testing.assert_array_equal(cube.axial_profile(-1, 5), expected[4, :, 5])
+        np.testing.assert_array_equal(cube.history(3, [3, 7], (1, 4)), expected[1:4, 2, [3, 7]])
+        with self.assertRaises(Exception):
+            cube.radial_profile(0, self.n_slices + 1)
+
+        sidecar_reader = MacReader(self.mac_path, self.n_slices)
+        sidecar_reader.attach_column_store(np.ascontiguousarray(self.mac_data.T))
+        np.testing.assert_array_equal(sidecar_reader.cube(MAC_RECORD_LENGTH).data, expected)
+
+    def test_17_shared_memory(self):
+        """
+        Check the columns published into shared memory are attached, without
+        copies, by the same and by other processes.
+        """
+        micreader = MicReader(self.mic_path, memory_map=True)
+        (descriptor, shm) = micreader.publish_columns([3, 5], MIC_RECORD_LENGTH)
+        try:
+            (array, attached) = descriptor.attach()
+            np.testing.assert_array_equal(array, self.mic_data[:, [3, 5]].T)
+            self.assertFalse(array.flags.writeable)
+            del array
+            attached.close()
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                sums = list(executor.map(sum_shared_array, [descriptor] * 2))
+            self.assertEqual(sums, [float(self.mic_data[:, [3, 5]].astype(np.float64).sum())] * 2)
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+class TestTimeIndex(unittest.TestCase):
+    """
+    Tests of the numeric index of the simulation time instants.
+    """
+
+    def setUp(self):
+        self.times = TimeIndex(
+            [10, 10, 10, 11], [0, 360, 720, 0], np.array([0., 0., 699.951, 0.5], dtype=np.float32))
+
+    def test_01_labels(self):
+        """
+        Check the strings of the time instants are formatted as "h s ms".
+        """
+        self.assertEqual(len(self.times), 4)
+        self.assertEqual(self.times[2], "10 720 699.951")
+        self.assertEqual(list(self.times), ["10 0 0.0", "10 360 0.0", "10 720 699.951", "11 0 0.5"])
+        self.assertEqual(self.times[1:3], ["10 360 0.0", "10 720 699.951"])
+
+    def test_02_lookups(self):
+        """
+        Check the nearest-time, time-range and string lookups.
+        """
+        np.testing.assert_allclose(self.times.seconds, [36000., 36360., 36720.699951, 39600.0005])
+        self.assertEqual(self.times.nearest(0.), 0)
+        self.assertEqual(self.times.nearest(36500.), 1)
+        self.assertEqual(self.times.nearest(36600.), 2)
+        self.assertEqual(self.times.nearest(1e6), 3)
+        self.assertEqual(self.times.range(36360., 36720.), (1, 2))
+        self.assertEqual(self.times.range(36000., 40000.), (0, 4))
+        self.assertEqual(self.times.locate("10 720 699.951"), 2)
+        with self.assertRaises(Exception):
+            self.times.locate("10 720 0.0")
+
+    def test_03_alignment(self):
+        """
+        Check the macro-steps are mapped to the surrounding micro-steps, and
+        vice versa.
+        """
+        micro = TimeIndex([0, 0, 0, 0, 0, 0, 0], [1, 2, 3, 4, 5, 6, 7], np.zeros(7))
+        macro = TimeIndex([0, 0, 0], [2, 5, 6], np.zeros(3))
+        alignment = TimeAlignment(macro, micro)
+        self.assertEqual(list(alignment.mac_to_mic), [1, 4, 5])
+        self.assertEqual(list(alignment.mic_to_mac), [0, 0, 1, 1, 1, 2, 3])
+        self.assertEqual(alignment.micro_range(0), (0, 2))
+        self.assertEqual(alignment.micro_range(1), (2, 5))
+        self.assertEqual(alignment.micro_window(1, 2, 2), (3, 7))
+        self.assertEqual(alignment.macro_of(3), 1)
+        self.assertEqual(alignment.macro_of(6), 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,435 @@
+import csv
+import os
+from dataclasses import dataclass, field
+from typing import List, Sequence, Tuple, Union
+from typing_extensions import Self
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from tu_interface import DEFAULT_BLOCK_SIZE, ColumnarSidecar, MicReader, TimeAlignment, \
+  TimeIndex
+
+
+# Default number of samples of a level of the min/max pyramid merged in a single
+# sample of the following (coarser) level
+DEFAULT_PYRAMID_FACTOR: int = 4
+
+
+class MinMaxPyramid():
+  """
+  Class that stores a min/max decimation pyramid of the values of a quantity along the
+  micro-step times of a TU simulation.
+  The first level holds the original values; each following level splits the samples
+  into buckets of 'factor' samples of the previous level and keeps, for each bucket,
+  the minimum and maximum values together with the index of the time instant where
+  they occur. This way, a series covering any time interval with a given number of
+  points can be extracted by reading a number of samples proportional to that number,
+  instead of all the original values in the interval, while keeping all their peaks.
+  """
+  def __init__(self, seconds: ArrayLike, values: ArrayLike,
+               factor: int = DEFAULT_PYRAMID_FACTOR) -> None:
+    """
+    Build an instance of the 'MinMaxPyramid' class given the times, in seconds and in
+    ascending order, and the values of the quantity at those times. The 'factor' gives
+    the number of samples of a level merged in a single sample of the following level.
+    """
+    # Check the decimation factor is valid
+    if factor < 2:
+      raise Exception("Error: the decimation factor of the pyramid must be at least 2.")
+    # Store the decimation factor and the times of the values
+    self.factor: int = factor
+    self.seconds: NDArray[np.float64] = np.asarray(seconds, dtype=np.float64)
+    # Store the original values
+    values = np.asarray(values)
+    if values.shape != self.seconds.shape:
+      raise Exception("Error: the times and the values of the pyramid must have the same size.")
+    # Declare the lists of the minimum and maximum values, and of the indices of the
+    # time instants where they occur, for each level (the first being the original values)
+    indices = np.arange(values.size, dtype=np.int64)
+    self.min_values: List[NDArray] = [values]
+    self.max_values: List[NDArray] = [values]
+    self.min_indices: List[NDArray[np.int64]] = [indices]
+    self.max_indices: List[NDArray[np.int64]] = [indices]
+    # Build the coarser levels until a level has a single sample
+    while self.min_values[-1].size > 1:
+      self._add_level()
+
+  @staticmethod
+  def init_MinMaxPyramid_from_reader(micreader: MicReader, column: int, record_length: int,
+                                     factor: int = DEFAULT_PYRAMID_FACTOR) -> Self:
+    """
+    Method that builds an instance of the 'MinMaxPyramid' class for the quantity stored
+    in the record column with the given index of the .mic file read by the given reader.
+    The micro-step times are extracted from the file, if not done already.
+    """
+    # Extract the time instants, if needed
+    if micreader.time_h.size == 0:
+      micreader.extract_time_hsms(record_length)
+    seconds = TimeIndex.init_TimeIndex_from_reader(micreader).seconds
+    # Read the values of the requested column only, for the extracted time instants
+    values = micreader.read_columns([column], record_length, (0, seconds.size))[0]
+    # Build the pyramid
+    return MinMaxPyramid(seconds, values, factor)
+
+  @staticmethod
+  def init_MinMaxPyramid_from_sidecar(sidecar: ColumnarSidecar, micreader: MicReader,
+                                      column: int, record_length: int,
+                                      factor: int = DEFAULT_PYRAMID_FACTOR) -> Self:
+    """
+    Method that loads the pyramid of the quantity stored in the record column with the
+    given index of the .mic file from the folder of the given columnar sidecar, if saved
+    there for the same version of the file. If not, the pyramid is built from the given
+    reader and saved into the sidecar folder.
+    """
+    # Build the path to the pyramid file and get the version of the .mic file described
+    # by the sidecar manifest
+    path = os.path.join(sidecar.folder, "pyramid_mic_" + str(column) + "_" + str(factor) + ".npz")
+    entry = sidecar.manifest['files']['mic']
+    source = np.array([entry['size'], entry['mtime_ns']], dtype=np.int64)
+    # Load the pyramid, if saved for the same version of the .mic file
+    if os.path.isfile(path):
+      with np.load(path) as saved:
+        if np.array_equal(saved['source'], source):
+          return MinMaxPyramid._from_saved(saved)
+    # Build the pyramid and save it into the sidecar folder
+    pyramid = MinMaxPyramid.init_MinMaxPyramid_from_reader(micreader, column, record_length, factor)
+    pyramid.save(path, source)
+    # Return the built pyramid
+    return pyramid
+
+  @property
+  def n_levels(self) -> int:
+    """
+    Number of levels of the pyramid, including the one of the original values.
+    """
+    return len(self.min_values)
+
+  def envelope(self, t0: float, t1: float, n_points: int) -> Tuple[NDArray[np.float64], NDArray]:
+    """
+    Method that extracts the series of at most 'n_points' points (and at least two)
+    covering the time interval [t0, t1], in seconds.
+    If the original values in the interval exceed the requested number of points, the
+    series is extracted from the finest pyramid level that fits, giving for each of its
+    samples the minimum and the maximum values in the order they occur, so that the
+    envelope of the original values is preserved.
+    The method returns the arrays of the times and of the values of the series.
+    """
+    # Check the number of points is valid
+    if n_points < 2:
+      raise Exception("Error: at least two points must be requested.")
+    # Get the range of indices of the original values falling in the interval
+    start = int(np.searchsorted(self.seconds, t0, side='left'))
+    stop = int(np.searchsorted(self.seconds, t1, side='right'))
+    # Return the original values if they do not exceed the requested number of points
+    if stop - start <= n_points:
+      return (self.seconds[start:stop], self.min_values[0][start:stop])
+
+    # Get the finest level whose samples fully inside the interval, giving two points
+    # each, plus the two partial samples at the interval edges, do not exceed the
+    # requested number of points
+    for level in range(1, self.n_levels):
+      bucket = self.factor**level
+      (first, last) = (-(-start // bucket), stop // bucket)
+      if 2 * max(last - first, 0) + 4 <= n_points: break
+    else:
+      # No level fits, as less than four points are requested: merge all the values in
+      # the interval into a single sample, giving its minimum and maximum values in the
+      # order they occur
+      indices = np.unique(self._range_extremes(start, stop, self.n_levels))
+      return (self.seconds[indices], self.min_values[0][indices])
+    last = max(first, last)
+    # Get the indices of the minimum and maximum values of the level samples
+    min_idx = [self.min_indices[level][first:last]]
+    max_idx = [self.max_indices[level][first:last]]
+    # Add the indices of the minimum and maximum original values of the partial samples
+    # at the interval edges, if any, by merging the samples of the finer levels
+    edges = ((start, min(first * bucket, stop)), (max(last * bucket, start, first * bucket), stop))
+    for (i, (edge_start, edge_stop)) in enumerate(edges):
+      if edge_start < edge_stop:
+        (edge_min, edge_max) = self._range_extremes(edge_start, edge_stop, level)
+        position = 0 if i == 0 else len(min_idx)
+        min_idx.insert(position, [edge_min])
+        max_idx.insert(position, [edge_max])
+    (min_idx, max_idx) = (np.concatenate(min_idx), np.concatenate(max_idx))
+    # Order the minimum and maximum values of each sample as they occur in time and
+    # drop the repeated indices of the samples whose minimum and maximum coincide
+    indices = np.stack((np.minimum(min_idx, max_idx), np.maximum(min_idx, max_idx)), axis=1).ravel()
+    indices = indices[np.concatenate(([True], indices[1:] != indices[:-1]))]
+    # Return the times and the values at the selected indices
+    return (self.seconds[indices], self.min_values[0][indices])
+
+  def _range_extremes(self, start: int, stop: int, level: int) -> Tuple[int, int]:
+    """
+    Method that returns the indices of the minimum and maximum original values in the
+    range of indices [start, stop), by merging the samples of the levels finer than the
+    given one that fall fully inside the range: at each level, from the coarsest, the
+    samples covering the part of the range not yet covered are taken. For a range with
+    one end on a sample boundary of the given level, at most 'factor' - 1 samples are
+    taken from each level, instead of all the original values in the range.
+    In case of equal values, the index of the first one is returned.
+    """
+    # Declare the lists of the candidate values and indices, and the ranges still to cover
+    (min_values, min_indices, max_values, max_indices) = (list(), list(), list(), list())
+    ranges = [(start, stop)]
+    # Loop over the levels, from the coarsest to the one of the original values
+    for l in range(level - 1, -1, -1):
+      bucket = self.factor**l
+      uncovered = list()
+      for (a, b) in ranges:
+        # Get the samples of the level fully inside the range
+        (first, last) = (-(-a // bucket), b // bucket)
+        if first >= last:
+          uncovered.append((a, b))
+          continue
+        # Add the samples as candidates and keep the range parts they do not cover
+        min_values.append(self.min_values[l][first:last])
+        min_indices.append(self.min_indices[l][first:last])
+        max_values.append(self.max_values[l][first:last])
+        max_indices.append(self.max_indices[l][first:last])
+        uncovered += [(a, first * bucket), (last * bucket, b)]
+      ranges = [(a, b) for (a, b) in uncovered if a < b]
+    # Get the indices of the first minimum and maximum values among the candidates
+    (min_values, min_indices) = (np.concatenate(min_values), np.concatenate(min_indices))
+    (max_values, max_indices) = (np.concatenate(max_values), np.concatenate(max_indices))
+    return (int(min_indices[min_values == min_values.min()].min()),
+            int(max_indices[max_values == max_values.max()].min()))
+
+  def save(self, path: str, source: Union[ArrayLike, None] = None) -> None:
+    """
+    Method that saves the pyramid levels into the .npz file at the given path, along
+    with any array identifying the source of the values (e.g. the size and modification
+    time of the direct-access file).
+    """
+    arrays = {'seconds': self.seconds, 'factor': np.array(self.factor),
+              'source': np.asarray(source if source is not None else [], dtype=np.int64)}
+    # Store the levels following the original values only, as the latter are stored once
+    for level in range(self.n_levels):
+      arrays['min_values_' + str(level)] = self.min_values[level]
+      if level > 0:
+        arrays['max_values_' + str(level)] = self.max_values[level]
+        arrays['min_indices_' + str(level)] = self.min_indices[level]
+        arrays['max_indices_' + str(level)] = self.max_indices[level]
+    # Write the file into a temporary one that then replaces the given path, so that
+    # partially written files are never loaded
+    tmp_path = path + ".tmp.npz"
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+  @staticmethod
+  def load(path: str) -> Self:
+    """
+    Method that loads the pyramid saved into the .npz file at the given path.
+    """
+    with np.load(path) as saved:
+      return MinMaxPyramid._from_saved(saved)
+
+  @staticmethod
+  def _from_saved(saved: np.lib.npyio.NpzFile) -> Self:
+    """
+    Method that builds an instance of the 'MinMaxPyramid' class from the arrays of the
+    given opened .npz file, without computing the levels again.
+    """
+    # Instantiate the class without building the levels
+    pyramid = MinMaxPyramid.__new__(MinMaxPyramid)
+    pyramid.factor = int(saved['factor'])
+    pyramid.seconds = saved['seconds']
+    # Get the number of saved levels
+    n_levels = sum(1 for name in saved.files if name.startswith('min_values_'))
+    # Restore the original values as the first level
+    values = saved['min_values_0']
+    indices = np.arange(values.size, dtype=np.int64)
+    (pyramid.min_values, pyramid.max_values) = ([values], [values])
+    (pyramid.min_indices, pyramid.max_indices) = ([indices], [indices])
+    # Restore the following levels
+    for level in range(1, n_levels):
+      pyramid.min_values.append(saved['min_values_' + str(level)])
+      pyramid.max_values.append(saved['max_values_' + str(level)])
+      pyramid.min_indices.append(saved['min_indices_' + str(level)])
+      pyramid.max_indices.append(saved['max_indices_' + str(level)])
+    # Return the restored pyramid
+    return pyramid
+
+  def _add_level(self) -> None:
+    """
+    Method that builds the level following the last one of the pyramid, by merging
+    every 'factor' samples into one holding their minimum and maximum values, and the
+    indices of the time instants where they occur.
+    """
+    # Get the number of samples of the new level
+    n = -(-self.min_values[-1].size // self.factor)
+    # Pad the last level samples up to a multiple of the factor, so that the
+    # padding values are never selected, and split them into buckets
+    pad = n * self.factor - self.min_values[-1].size
+    mins = np.pad(self.min_values[-1].astype(np.float64), (0, pad),
+                  constant_values=np.inf).reshape(n, self.factor)
+    maxs = np.pad(self.max_values[-1].astype(np.float64), (0, pad),
+                  constant_values=-np.inf).reshape(n, self.factor)
+    # Get the position, within each bucket, of its minimum and maximum values
+    min_pos = np.argmin(mins, axis=1)
+    max_pos = np.argmax(maxs, axis=1)
+    # Get the indices of the samples holding the minimum and maximum values
+    rows = np.arange(n) * self.factor
+    min_samples = np.minimum(rows + min_pos, self.min_values[-1].size - 1)
+    max_samples = np.minimum(rows + max_pos, self.max_values[-1].size - 1)
+    # Add the new level, with the values and the indices of the original time instants
+    self.min_values.append(self.min_values[-1][min_samples])
+    self.max_values.append(self.max_values[-1][max_samples])
+    self.min_indices.append(self.min_indices[-1][min_samples])
+    self.max_indices.append(self.max_indices[-1][max_samples])
+
+
+@dataclass
+class WindowAggregates():
+  """
+  Dataclass providing a record storing the minimum, maximum and mean values of a set of
+  record columns over consecutive time windows, as 2D arrays having a row per column and
+  a column per window, plus the number of time instants falling in each window.
+  Windows without any time instant have a zero count and NaN values.
+  """
+  edges: NDArray[np.float64] = field(default_factory=lambda: np.empty(0))
+  columns: List[int] = field(default_factory=list)
+  count: NDArray[np.int64] = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+  minimum: NDArray[np.float64] = field(default_factory=lambda: np.empty((0, 0)))
+  maximum: NDArray[np.float64] = field(default_factory=lambda: np.empty((0, 0)))
+  mean: NDArray[np.float64] = field(default_factory=lambda: np.empty((0, 0)))
+
+  def save_csv(self, csv_path: str, names: Union[Sequence[str], None] = None) -> None:
+    """
+    Method that saves the aggregated values on a file in CSV format, having a line per
+    window with its start and end times, its count and the minimum, maximum and mean
+    values of each column. The given names (the column indices, by default) are used
+    for building the header.
+    """
+    # Get the names of the aggregated columns
+    names = list(names) if names is not None else [str(c) for c in self.columns]
+    # Build the header
+    header = ['Start (s)', 'End (s)', 'Count']
+    for name in names:
+      header += [name + ' min', name + ' max', name + ' mean']
+    # Open the CSV file for writing the content
+    with open(file=csv_path, mode='w', newline='') as csv_file:
+      writer = csv.writer(csv_file)
+      writer.writerow(header)
+      # Write a line per window, with the values of all the columns
+      values = np.stack((self.minimum, self.maximum, self.mean), axis=1).reshape(-1, self.count.size)
+      for (i, row) in enumerate(values.T.tolist()):
+        writer.writerow([self.edges[i], self.edges[i + 1], int(self.count[i])] + row)
+
+
+def aggregate_windows(micreader: MicReader, columns: Sequence[int], record_length: int,
+                      edges: ArrayLike, block_size: int = DEFAULT_BLOCK_SIZE) -> WindowAggregates:
+  """
+  Function that computes the minimum, maximum and mean values of the given record columns
+  of the .mic file read by the given reader over the time windows delimited by the given
+  edges, in seconds and in ascending order, where the i-th window includes the times after
+  'edges[i]' (excluded) up to 'edges[i + 1]' (included), the first window including
+  'edges[0]' too. This way, the windows delimited by the macro-step times hold the same
+  micro-steps as the ones given by the time alignment. Times outside all the windows are
+  ignored.
+  The file is scanned once, by blocks of at most 'block_size' time instants, and the
+  values of each block are reduced by window at once, so that the memory needed does not
+  depend on the file size. The micro-step times are extracted from the file, if not done
+  already. The function returns the 'WindowAggregates' dataclass storing the results.
+  """
+  # Check the windows edges
+  edges = np.asarray(edges, dtype=np.float64)
+  if edges.ndim != 1 or edges.size < 2 or np.any(np.diff(edges) <= 0):
+    raise Exception("Error: the windows edges must be at least two times in ascending order.")
+  # Extract the time instants, if needed
+  if micreader.time_h.size == 0:
+    micreader.extract_time_hsms(record_length)
+  seconds = TimeIndex.init_TimeIndex_from_reader(micreader).seconds
+  # Get the index of the window of each time instant (-1 or the number of windows, if
+  # outside all of them), the first edge belonging to the first window
+  windows = np.searchsorted(edges, seconds, side='left') - 1
+  windows[seconds == edges[0]] = 0
+  return _aggregate_by_window(micreader, columns, record_length, edges, windows, block_size)
+
+
+def aggregate_macro_steps(micreader: MicReader, alignment: TimeAlignment,
+                          columns: Sequence[int], record_length: int,
+                          block_size: int = DEFAULT_BLOCK_SIZE) -> WindowAggregates:
+  """
+  Function that computes the minimum, maximum and mean values of the given record columns
+  of the .mic file read by the given reader over the macro-steps of the simulation, i.e.
+  over the micro-steps falling in the interval ending at each macro-step, as given by the
+  'micro_range' method of the given time alignment. The micro-steps following the last
+  macro-step, if any, are gathered into an additional trailing window.
+  The windows edges are the macro-step times, preceded by the first time instant and
+  followed, if needed, by the last micro-step one. The micro-step times of the reader are
+  expected to be the ones the alignment is built from.
+  """
+  # Get the window of each micro-step, i.e. the macro-step closing its interval, or the
+  # trailing window for the micro-steps following all of them
+  windows = alignment.mic_to_mac
+  macro_seconds = alignment.macro_time.seconds
+  micro_seconds = alignment.micro_time.seconds
+  if macro_seconds.size == 0 or micro_seconds.size == 0:
+    raise Exception("Error: no macro-step or micro-step time instant is present.")
+  # Build the windows edges
+  edges = [[min(micro_seconds[0], macro_seconds[0])], macro_seconds]
+  if windows[-1] == macro_seconds.size:
+    edges.append([micro_seconds[-1]])
+  return _aggregate_by_window(micreader, columns, record_length,
+                              np.concatenate(edges).astype(np.float64), windows, block_size)
+
+
+def _aggregate_by_window(micreader: MicReader, columns: Sequence[int], record_length: int,
+                         edges: NDArray[np.float64], windows: NDArray[np.int64],
+                         block_size: int) -> WindowAggregates:
+  """
+  Function that computes the minimum, maximum and mean values of the given record columns
+  of the .mic file read by the given reader over the time windows delimited by the given
+  edges, given the index of the window of each time instant, in ascending order (-1 or the
+  number of windows, if outside all of them).
+  """
+  # Get the range of the time instants falling in the windows, being the only ones to scan
+  (start, stop) = (int(np.searchsorted(windows, 0)), int(np.searchsorted(windows, edges.size - 1)))
+
+  # Initialize the accumulators of the count, minimum, maximum and sum of the values of
+  # each window
+  n_windows = edges.size - 1
+  columns = list(columns)
+  count = np.zeros(n_windows, dtype=np.int64)
+  minimum = np.full((len(columns), n_windows), np.inf)
+  maximum = np.full((len(columns), n_windows), -np.inf)
+  total = np.zeros((len(columns), n_windows))
+  # Scan the requested columns of the records of the time instants in the windows
+  for (first, block) in micreader.iter_records(record_length, block_size, (start, stop), columns):
+    # Get the windows of the block time instants and the position where each one starts,
+    # as the times are ordered
+    block_windows = windows[first:first + block.shape[0]]
+    starts = np.flatnonzero(np.concatenate(([True], block_windows[1:] != block_windows[:-1])))
+    ids = block_windows[starts]
+    # Reduce the block values by window and merge them with the accumulated ones
+    values = block.T.astype(np.float64)
+    count[ids] += np.diff(np.append(starts, block.shape[0]))
+    minimum[:, ids] = np.minimum(minimum[:, ids], np.minimum.reduceat(values, starts, axis=1))
+    maximum[:, ids] = np.maximum(maximum[:, ids], np.maximum.reduceat(values, starts, axis=1))
+    total[:, ids] += np.add.reduceat(values, starts, axis=1)
+
+  # Set the values of the empty windows as NaN
+  empty = count == 0
+  (minimum[:, empty], maximum[:, empty]) = (np.nan, np.nan)
+  # Return the aggregated values
+  with np.errstate(invalid='ignore', divide='ignore'):
+    mean = total / count
+  return WindowAggregates(edges=edges, columns=columns, count=count,
+                          minimum=minimum, maximum=maximum, mean=mean)
+
+
+def hourly_edges(seconds: ArrayLike, hours: float) -> NDArray[np.float64]:
+  """
+  Function that builds the edges of consecutive time windows lasting the given number of
+  hours, starting from the first of the given times (in seconds) and covering all of them,
+  each window ending at its last edge (included).
+  """
+  seconds = np.asarray(seconds, dtype=np.float64)
+  if hours <= 0:
+    raise Exception("Error: the windows duration must be positive.")
+  if seconds.size == 0:
+    raise Exception("Error: no time instant is present.")
+  # Get the number of windows needed for including the last time
+  width = hours * 3600.0
+  n_windows = max(int(np.ceil((seconds[-1] - seconds[0]) / width)), 1)
+  return seconds[0] + width * np.arange(n_windows + 1)
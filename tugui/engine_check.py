@@ -0,0 +1,266 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+
+from dataclasses import asdict, dataclass
+from typing import Callable, List, Tuple, Union
+from typing_extensions import Self
+
+from native_engine import NativeEngine
+from plot_builder import PlotManager
+from quantities import QuantityDictionary
+from tu_interface import DatGenerator, InpHandler, PliReader, TuInp, load_mac_reader, \
+  load_mic_reader, load_sta_reader
+
+
+# Default relative and absolute tolerances for the comparison of the curves values
+DEFAULT_RTOL: float = 1e-4
+DEFAULT_ATOL: float = 1e-6
+
+
+@dataclass
+class CheckResult():
+  """
+  Dataclass providing a record storing the outcome of the comparison of the curves of a
+  diagram as produced by the plotting executable and by the native engine, i.e. the
+  diagram description, whether the curves match within the tolerances, the largest
+  absolute and relative differences of their values, the wall-clock time (in seconds)
+  taken by each backend and a message explaining any failure.
+  The native time and the differences are None if the native curves are not available.
+  """
+  diagram: str = ''
+  matched: bool = False
+  max_abs_error: Union[float, None] = None
+  max_rel_error: Union[float, None] = None
+  executable_seconds: Union[float, None] = None
+  native_seconds: Union[float, None] = None
+  message: str = ''
+
+
+class EngineCheck():
+  """
+  Class that cross-checks the native engine against the plotting executables: every given
+  diagram configuration is produced both by running the TuPlot or TuStat executable, with
+  its .dat and .plt output files read back, and by the native engine, and the curves of
+  the two backends are compared within the given tolerances, while the wall-clock time of
+  each backend is recorded.
+  Any executable reading an .inp file and writing the .dat and .plt ones can be used,
+  e.g. a local stand-in script when the TRANSURANUS executables are not available.
+  """
+  def __init__(self, engine: NativeEngine, tuplot_path: str, tustat_path: str,
+               inp_dir: str, output_dir: str, rtol: float = DEFAULT_RTOL,
+               atol: float = DEFAULT_ATOL, repeat: int = 1) -> None:
+    """
+    Build an instance of the 'EngineCheck' class given the native engine, the paths to the
+    TuPlot and TuStat executables (or the commands running them), the folder the .inp files
+    are written into, i.e. the .pli file one, and the folder the output files are moved to.
+    The relative and absolute tolerances of the comparison can be given, as well as the
+    number of times each backend is run, the shortest time being recorded.
+    """
+    # Store the native engine and the paths to the executables
+    self.engine: NativeEngine = engine
+    self.tuplot_path: str = tuplot_path
+    self.tustat_path: str = tustat_path
+    # Store the paths to the input and output folders
+    self.inp_dir: str = inp_dir
+    self.output_dir: str = output_dir
+    # Store the comparison tolerances and the number of timed runs
+    self.rtol: float = rtol
+    self.atol: float = atol
+    self.repeat: int = max(repeat, 1)
+
+  @staticmethod
+  def init_EngineCheck_from_pli(pli_path: str, quantities_path: str, tuplot_path: str,
+                                tustat_path: str, output_dir: str = "",
+                                rtol: float = DEFAULT_RTOL, atol: float = DEFAULT_ATOL,
+                                repeat: int = 1, columnar: bool = False) -> Self:
+    """
+    Method that builds an instance of the 'EngineCheck' class for the simulation of the
+    given .pli file, by reading its direct-access files and the given quantity dictionary,
+    without needing the GUI configuration. The output files are moved to the given folder
+    or, if not given, are kept into the .pli file one.
+    If the 'columnar' flag is set, the .mic and .mac files are read through their columnar
+    copy, stored in the sidecar folder next to the .pli file.
+    """
+    # Interpret the .pli file and check its direct-access files
+    plireader = PliReader.init_PliReader(pli_path)
+    is_statistical = plireader.opt_dict['ISTATI'] == str(1)
+    for warning in plireader.validate_da_files(is_statistical):
+      print("Warning: " + warning)
+    pli_dir = os.path.dirname(os.path.abspath(plireader.pli_path))
+    # Get the readers of the .mic, .mac and, if needed, .sta files, with their time
+    # instants extracted, the same way as the GUI does
+    micreader = load_mic_reader(plireader, columnar)
+    macreader = load_mac_reader(plireader, columnar)
+    stareader = load_sta_reader(plireader) if is_statistical else None
+    # Build the native engine over the files
+    engine = NativeEngine(
+      QuantityDictionary.init_QuantityDictionary_from_pli(quantities_path, plireader),
+      micreader, int(plireader.mic_recordLength),
+      macreader, int(plireader.mac_recordLength),
+      stareader=stareader,
+      sta_record_length=int(plireader.sta_recordLength) if is_statistical else 0,
+      sta_axial_steps=plireader.axial_steps - 1)
+    return EngineCheck(engine, tuplot_path, tustat_path, pli_dir,
+                       output_dir if output_dir else pli_dir, rtol, atol, repeat)
+
+  def run(self, tuinps: List[TuInp]) -> List[CheckResult]:
+    """
+    Method that cross-checks every diagram of the given list of 'TuInp' instances,
+    returning the list of the corresponding results.
+    """
+    return [self.check(tuinp) for tuinp in tuinps]
+
+  def run_inp_file(self, inp_path: str) -> List[CheckResult]:
+    """
+    Method that cross-checks every diagram of the given .inp file, returning the list of
+    the corresponding results.
+    """
+    # Read the diagram configurations of the .inp file
+    inp_handler = InpHandler(inp_path)
+    inp_handler.read_inp_file()
+    return self.run(inp_handler.diagrams_list)
+
+  def check(self, tuinp: TuInp) -> CheckResult:
+    """
+    Method that produces the diagram of the given 'TuInp' instance with both the backends
+    and compares their curves, returning the result of the comparison.
+    The curves are compared in the order they are produced, as the legends given by the
+    executables and by the native engine can differ.
+    """
+    # Build the description of the diagram
+    result = CheckResult(diagram=("TuPlot " if tuinp.is_tuplot else "TuStat ") +
+                         " ".join(tuinp.diagram_config.split('\n')[0].split()[:2]))
+    # Produce the curves by running the executable
+    try:
+      (executable_curves, result.executable_seconds) = self._timed(
+        lambda: self._run_executable(tuinp))
+    except Exception as e:
+      result.message = "Executable failed: " + str(e)
+      return result
+    # Produce the curves by means of the native engine
+    if not self.engine.supports(tuinp):
+      result.message = "Diagram not supported by the native engine"
+      return result
+    try:
+      (native_curves, result.native_seconds) = self._timed(lambda: self._run_native(tuinp))
+    except Exception as e:
+      result.message = "Native engine failed: " + str(e)
+      return result
+
+    # Compare the number and the size of the curves
+    if len(executable_curves) != len(native_curves):
+      result.message = f"Different number of curves: {len(executable_curves)} from the " \
+                       f"executable, {len(native_curves)} from the native engine"
+      return result
+    for (i, (expected, actual)) in enumerate(zip(executable_curves, native_curves)):
+      if expected.shape != actual.shape:
+        result.message = f"Different number of points of the curve {i + 1}: " \
+                         f"{expected.shape[0]} from the executable, {actual.shape[0]} " \
+                         "from the native engine"
+        return result
+    # Compare the values of the curves
+    expected = np.concatenate(executable_curves) if executable_curves else np.empty((0, 2))
+    actual = np.concatenate(native_curves) if native_curves else np.empty((0, 2))
+    difference = np.abs(actual - expected)
+    result.max_abs_error = float(difference.max()) if difference.size else 0.0
+    result.max_rel_error = float((difference / np.maximum(np.abs(expected), np.finfo(float).tiny)).max()) \
+      if difference.size else 0.0
+    result.matched = bool(np.allclose(actual, expected, rtol=self.rtol, atol=self.atol))
+    if not result.matched:
+      result.message = "Curves values differ beyond the tolerances"
+    return result
+
+  def save_report(self, results: List[CheckResult], report_path: str) -> None:
+    """
+    Method that saves the given results of the cross-check into a JSON report, along with
+    the tolerances of the comparison and the total time taken by each backend.
+    """
+    report = {
+      'rtol': self.rtol,
+      'atol': self.atol,
+      'repeat': self.repeat,
+      'checked': len(results),
+      'matched': sum(result.matched for result in results),
+      'executable_seconds': sum(result.executable_seconds or 0.0 for result in results),
+      'native_seconds': sum(result.native_seconds or 0.0 for result in results),
+      'results': [asdict(result) for result in results],
+    }
+    with open(report_path, 'w') as f:
+      json.dump(report, f, indent=2)
+
+  def _run_executable(self, tuinp: TuInp) -> List[np.ndarray]:
+    """
+    Method that writes the .inp file of the given diagram, runs the plotting executable
+    and reads the curves of the output .dat and .plt files, as the GUI does.
+    The working directory, changed while running the executable, is restored afterwards.
+    It returns the X-Y values of the curves, as 2D arrays.
+    """
+    # Get the names of the executable and of the output files
+    (executable_path, output_files_name) = (self.tuplot_path, 'TuPlot') if tuinp.is_tuplot \
+      else (self.tustat_path, 'TuStat')
+    # Write the .inp file of the diagram
+    inp_path = os.path.join(self.inp_dir, output_files_name + '.inp')
+    InpHandler(inp_path).save_inp_file([tuinp])
+    # Run the executable, restoring the working directory afterwards
+    cwd = os.getcwd()
+    try:
+      inp_to_dat = DatGenerator.init_DatGenerator_and_run_exec(
+        plotexec_path=executable_path,
+        inp_path=inp_path,
+        plots_num=1,
+        cwd=self.output_dir,
+        output_files_name=output_files_name)
+    finally:
+      os.chdir(cwd)
+    # Read the curves from the output files
+    plot_manager = PlotManager(inp_to_dat.dat_paths[0], inp_to_dat.plt_paths[0])
+    return [np.asarray(values, dtype=np.float64).reshape(-1, 2)
+            for values in plot_manager.curves2plot.values()]
+
+  def _run_native(self, tuinp: TuInp) -> List[np.ndarray]:
+    """
+    Method that produces the curves of the given diagram by means of the native engine,
+    feeding them to the plot manager as the GUI does.
+    It returns the X-Y values of the curves, as 2D arrays.
+    """
+    plot_manager = PlotManager.init_PlotManager_from_curves(self.engine.produce(tuinp))
+    return [np.asarray(values, dtype=np.float64).reshape(-1, 2)
+            for values in plot_manager.curves2plot.values()]
+
+  def _timed(self, run: Callable[[], List[np.ndarray]]) -> Tuple[List[np.ndarray], float]:
+    """
+    Method that calls the given function as many times as requested, returning the result
+    of the last call and the shortest wall-clock time of the calls, in seconds.
+    """
+    best = float('inf')
+    for _ in range(self.repeat):
+      start = time.perf_counter()
+      result = run()
+      best = min(best, time.perf_counter() - start)
+    return (result, best)
+
+
+if __name__ == "__main__":
+  # Cross-check the diagrams of an .inp file, given as:
+  #   engine_check.py [--columnar] <pli file> <inp file> <report file> <tuplot executable> <tustat executable>
+  # where the '--columnar' option reads the .mic and .mac files through their columnar copy
+  columnar = '--columnar' in sys.argv[1:]
+  args = [arg for arg in sys.argv[1:] if arg != '--columnar']
+  if len(args) != 5:
+    print("Usage: engine_check.py [--columnar] <pli file> <inp file> <report file> "
+          "<tuplot executable> <tustat executable>")
+    sys.exit(2)
+  (pli_path, inp_path, report_path, tuplot_path, tustat_path) = args
+  # Build the cross-check with the quantity dictionary of the configuration folder
+  engine_check = EngineCheck.init_EngineCheck_from_pli(
+    pli_path,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../resources/config/Quantities"),
+    tuplot_path, tustat_path, columnar=columnar)
+  # Run the cross-check and save the report
+  results = engine_check.run_inp_file(inp_path)
+  engine_check.save_report(results, report_path)
+  # Exit with an error if any diagram does not match
+  sys.exit(0 if all(result.matched for result in results) else 1)
@@ -62,6 +62,7 @@ class GuiPlotFieldsConfigurator():
   g2a_path: str = ''
   g3_path: str = ''
   stat_path: str = ''
+  quantities_path: str = ''
   groupVSnumVsKn: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
   groupVStype: Dict[List, List[str]] = field(default_factory=dict)
   iant1: Tuple = tuple()
@@ -70,6 +71,9 @@ class GuiPlotFieldsConfigurator():
   sta_numVSdescription: Dict[int, str] = field(default_factory=dict)
   tuplot_path: str = ''
   tustat_path: str = ''
+  # Flag stating if the .mic and .mac files are read through their columnar copy, stored
+  # in the sidecar folder next to the .pli file
+  columnar_sidecar: bool = False
 
   @staticmethod
   def init_GuiPlotFieldsConfigurator_attrs() -> Self:
@@ -97,6 +101,9 @@ class GuiPlotFieldsConfigurator():
     gui_config.g2a_path = os.path.join(config, "Group2a")
     gui_config.g3_path = os.path.join(config, "Group3")
     gui_config.stat_path = os.path.join(config, "Statdiag")
+    # Build the path to the quantity dictionary, mapping the plot quantities to the records
+    # of the direct-access files (not needed when plotting through the executables)
+    gui_config.quantities_path = os.path.join(config, "Quantities")
 
     # Check the configuration files existence into the application "config" folder
     gui_config.__check_config_file_existence(gui_config.diagr_path, "Diagrams")
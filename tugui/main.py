@@ -2,6 +2,7 @@ import tkinter as tk
 import os
 import re
 
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import PhotoImage, ttk
 from tkinter import filedialog
 from tkinter import messagebox
@@ -9,9 +10,11 @@ from tkinter import messagebox
 from plot_builder import PlotManager, PlotFigure
 from plot_settings import GroupType
 from tab_builder import TuPlotTabContentBuilder, TuStatTabContentBuilder
-from tu_interface import DatGenerator, InpHandler, MicReader, PliReader, StaReader, TuInp, MacReader
+from tu_interface import DatGenerator, InpHandler, PliReader, TimeAlignment, TimeIndex, TuInp, \
+  load_mac_reader, load_mic_reader, load_sta_reader
 from gui_configuration import GuiPlotFieldsConfigurator
 from gui_widgets import CustomNotebook, EntryVariable, StatusBar, provide_label_image
+from native_engine import NativeEngine
 from support import IANT
 from shutil import copyfile
 from typing import Union
@@ -148,6 +151,8 @@ class TuPostProcessingGui(tk.Tk):
     self.bind("<Control-n>", func=self.reset_main_window)
     # Bind Ctrl+O to the request of opening a new .pli input file
     self.bind("<Control-o>", func=self.open_pli_file)
+    # Bind Ctrl+R to the request of reading the times appended to the .mac/.mic files
+    self.bind("<Control-r>", func=self.follow_simulation)
     # Bind Ctrl+W to the request of selecting the output folder
     self.bind("<Control-w>", func=self.select_output_folder)
     # Bind Ctrl+Q to the request of quitting the application
@@ -374,47 +379,45 @@ class TuPostProcessingGui(tk.Tk):
       self.__set_directories_and_status_message(
         self.plireader.pli_path, "Selected .pli file: ")
 
-      # Instantiate the MacReader class
-      self.macreader = MacReader(
-        os.path.dirname(self.plireader.pli_path) + os.sep + self.plireader.mac_path,
-        self.plireader.axial_steps)
-      # Extract the macro step time values
-      (h, s, ms) = self.macreader.extract_xtime_hsms(int(self.plireader.mac_recordLength))
-      # Join the values of the 3 arrays into a list of strings
-      self.macro_time = list()
-      for (i, j, k) in zip(*list((h, s, ms))):
-        self.macro_time.append(str(i) + " " + str(j) + " " + str(k))
-
-      # Instantiate the MicReader class
-      self.micreader = MicReader(os.path.dirname(self.plireader.pli_path) + os.sep + self.plireader.mic_path)
-      # Extract the microstep time values
-      (h, s, ms) = self.micreader.extract_time_hsms(int(self.plireader.mic_recordLength))
-      # Join the values of the 3 arrays into a list of strings
-      self.micro_time = list()
-      for (i, j, k) in zip(*list((h, s, ms))):
-        self.micro_time.append(str(i) + " " + str(j) + " " + str(k))
+      print("ISTATI = ", self.plireader.opt_dict['ISTATI'])
+      # Check if a statistical simulation is present as well, based on the ISTATI value
+      is_statistical = self.plireader.opt_dict['ISTATI'] == str(1)
+      # Check the direct-access files agree with the layout declared in the .pli file,
+      # before reading any of them; the partially written files of a still running
+      # simulation are only reported as warnings
+      for warning in self.plireader.validate_da_files(is_statistical):
+        print("Warning: " + warning)
+
+      # Get the readers of the .mac, .mic and, if needed, .sta files, along with their
+      # time values: as the files are independent, they are read concurrently in a pool
+      # of threads, whose results are joined before activating the tabs
+      with ThreadPoolExecutor(max_workers=3) as executor:
+        mac_future = executor.submit(load_mac_reader, self.plireader, self.guiconfig.columnar_sidecar)
+        mic_future = executor.submit(load_mic_reader, self.plireader, self.guiconfig.columnar_sidecar)
+        if is_statistical:
+          sta_future = executor.submit(load_sta_reader, self.plireader)
+        self.macreader = mac_future.result()
+        self.micreader = mic_future.result()
+        if is_statistical:
+          self.stareader = sta_future.result()
+
+      # Build the numeric indices of the macro and micro step times
+      self.macro_time = TimeIndex.init_TimeIndex_from_reader(self.macreader)
+      self.micro_time = TimeIndex.init_TimeIndex_from_reader(self.micreader)
+      # Align the macro and micro step times with each other
+      self.time_alignment = TimeAlignment(self.macro_time, self.micro_time)
+      # Build the engine producing the diagrams in-process, straight from the direct-access
+      # files, for the ones whose quantities are described by the quantity dictionary
+      self.native_engine = self._build_native_engine(is_statistical)
 
       # Buid a list of slice indexes based on the number of slices read from the .pli file
       self.slice_settings = list()
       for i in range(self.plireader.axial_steps):
         self.slice_settings.append(str(i+1) + " Slice")
 
-      print("ISTATI = ", self.plireader.opt_dict['ISTATI'])
-      # Check if a statistical simulation is present as well, based on the ISTATI value
-      if self.plireader.opt_dict['ISTATI'] == str(1):
-        # Instantiate the StaReader class
-        self.stareader = StaReader(
-          os.path.dirname(self.plireader.pli_path) + os.sep + self.plireader.sta_path,
-          int(self.plireader.opt_dict['IBYTE']))
-        # Extract the time values of the statistical simulation from the .sta file
-        (h, s, ms) = self.stareader.extract_time_hsms(
-          record_length=int(self.plireader.sta_recordLength),
-          axial_steps=self.plireader.axial_steps - 1,
-          sta_dataset_length=int(self.plireader.sta_dataset))
-        # Join the values of the 3 arrays into a list of strings
-        self.sta_times = list()
-        for (i, j, k) in zip(*list((h, s, ms))):
-          self.sta_times.append(str(i) + " " + str(j) + " " + str(k))
+      if is_statistical:
+        # Build the numeric index of the statistical simulation times
+        self.sta_times = TimeIndex.init_TimeIndex_from_reader(self.stareader)
         # Generate the event for activating both TuPlot and TuStat tabs
         print("Generating ActivateAllTabs event...")
         self.event_generate('<<ActivateAllTabs>>')
@@ -428,6 +431,52 @@ class TuPostProcessingGui(tk.Tk):
       # pop-up box is produced showing the error message
       messagebox.showerror("Error", type(e).__name__ + "–" + str(e))
 
+  def _build_native_engine(self, is_statistical: bool) -> Union[NativeEngine, None]:
+    """
+    Method that builds the engine producing the diagrams in-process from the direct-access
+    files of the opened simulation, including the .sta one if the simulation is a
+    statistical one. None is returned if the quantity dictionary is not available or
+    cannot be read, so that all the diagrams are produced by the executables.
+    """
+    try:
+      return NativeEngine.init_NativeEngine(
+        self.guiconfig, self.plireader, self.micreader, self.macreader,
+        self.stareader if is_statistical else None)
+    except Exception as e:
+      # The diagrams can still be produced by the executables: just log the error
+      print("The diagrams are produced by the plotting executables only:", e)
+      return None
+
+  def follow_simulation(self, event: Union[tk.Event, None] = None) -> None:
+    """
+    Method that reads the macro and micro step times appended to the .mac and .mic files
+    since they have been opened, as it happens while the TU simulation is still running.
+    The times shown by the TuPlot tab are updated accordingly, while the already read
+    ones are not read again.
+    """
+    # Do nothing if no simulation has been opened yet
+    if not hasattr(self, 'macreader') or not hasattr(self, 'micreader'): return
+    try:
+      # Extend the macro and micro step times with the ones of the new complete records
+      n_macro = self.macreader.follow_time_hsms(int(self.plireader.mac_recordLength))
+      n_micro = self.micreader.follow_time_hsms(int(self.plireader.mic_recordLength))
+    except Exception as e:
+      # Intercept any exception produced while reading the files and show a pop-up message
+      messagebox.showerror("Error", type(e).__name__ + "–" + str(e))
+      return
+
+    # Re-build the numeric indices of the macro and micro step times
+    self.macro_time = TimeIndex.init_TimeIndex_from_reader(self.macreader)
+    self.micro_time = TimeIndex.init_TimeIndex_from_reader(self.micreader)
+    # Re-build the alignment of the macro and micro step times
+    self.time_alignment = TimeAlignment(self.macro_time, self.micro_time)
+    # Set the updated lists providing the macro and micro time to the TuPlot tab
+    self.tuplot_tab.set_times(macro_time=self.macro_time, micro_time=self.micro_time)
+
+    # Provide a message to the status bar
+    self.status_bar.set_text(
+      f"Read {n_macro} new macro-step and {n_micro} new micro-step times")
+
   def activate_all_tabs(self) -> None:
     """
     Method that activates both the TuPlot and the TuStat tabs by calling the
@@ -662,6 +711,10 @@ class TuPostProcessingGui(tk.Tk):
     # Store the .inp filename
     self.inp_filename = inp_path
 
+    # Produce the curves in-process, if the diagram is supported by the native engine,
+    # falling back on the plotting executable otherwise
+    if self.plot_native_curves(tuinp, output_files_name, active_plotFigure): return
+
     # Run the method that deals with instantiating the dataclass storing the needed
     # information for the plotting executable to be run. The corresponding executable
     # is run afterwards and the paths to the output .dat and .plt files, stored in the
@@ -684,6 +737,48 @@ class TuPostProcessingGui(tk.Tk):
     # onto the currently active tab figure --> only 1 .dat and .plt file is considered
     self.plot_curves(active_plotFigure, self.active_dat_file, self.active_plt_file, inp_to_dat.out_paths[0])
 
+  def plot_native_curves(self, tuinp: TuInp, output_files_name: str,
+                         active_plotFigure: PlotFigure) -> bool:
+    """
+    Method that produces the curves of the diagram described by the given 'TuInp' instance
+    in-process, by means of the native engine, and plots them onto the given 'PlotFigure'
+    instance, without running the plotting executables.
+    The curves are also written into .dat and .plt files with the given name, in the output
+    folder, so that they can be saved as the executables ones. As no .out report is
+    produced, the report area is cleared.
+    It returns False, without plotting anything, if no native engine is available, if the
+    diagram is not supported by it or if producing the curves fails.
+    """
+    # Check the diagram can be produced in-process
+    native_engine = getattr(self, 'native_engine', None)
+    if native_engine is None or not native_engine.supports(tuinp): return False
+    try:
+      # Produce the curves from the direct-access files
+      curves = native_engine.produce(tuinp)
+    except Exception as e:
+      # Log the error, as the executable is run instead
+      print("The diagram is produced by the plotting executable:", e)
+      return False
+
+    # Write the curves into the .dat and .plt output files and store their paths
+    self.active_dat_file = os.path.join(self.output_dir, output_files_name + '.dat')
+    self.active_plt_file = os.path.join(self.output_dir, output_files_name + '.plt')
+    curves.write_output_files(self.active_dat_file, self.active_plt_file)
+
+    # Generate the event for turning off the toolbar buttons, thus resetting their states
+    active_plotFigure.event_generate('<<DeselectButtons>>')
+    # Clear the report of any diagram previously produced by the plotting executables
+    active_plotFigure.clear_report()
+    try:
+      # Plot the curves onto the currently active tab figure
+      PlotManager.init_PlotManager_from_curves(curves).plot(active_plotFigure)
+    except Exception as e:
+      # Intercept any exception raised while preparing the plot figure and
+      # pop-up an error message
+      messagebox.showerror("Error", type(e).__name__ + "–" + str(e))
+      raise Exception(e)
+    return True
+
   def plot_curves(self, plotFigure: PlotFigure, dat_file: str, plt_file: str,
                   out_file: str) -> None:
     """
@@ -964,6 +1059,7 @@ class TuPostProcessingGui(tk.Tk):
     # FIXME "New" command is disabled until a better knowledge on new windows
     filemenu.add_command(label="New", accelerator="Ctrl+N", command=self.reset_main_window)
     filemenu.add_command(label="Open", accelerator="Ctrl+O", command=self.open_pli_file)
+    filemenu.add_command(label="Refresh", accelerator="Ctrl+R", command=self.follow_simulation)
 
     # Append the "Load" submenu to the "File" menu
     filemenu.add_cascade(menu=loadmenu, label="Load")
@@ -972,6 +1068,12 @@ class TuPostProcessingGui(tk.Tk):
     # filemenu.add_cascade(menu=savemenu, label="Save")
 
     filemenu.add_command(label="Set output folder", accelerator="Ctrl+W", command=self.select_output_folder)
+    # Add the option of reading the .mic and .mac files through their columnar copy, applied
+    # when opening a .pli file
+    self.columnar_var = tk.BooleanVar(value=self.guiconfig.columnar_sidecar)
+    filemenu.add_checkbutton(
+      label="Use columnar copy of .mic/.mac files", variable=self.columnar_var,
+      command=lambda: setattr(self.guiconfig, 'columnar_sidecar', self.columnar_var.get()))
     # Add a separator
     filemenu.add_separator()
     filemenu.add_command(label="Quit", accelerator="Ctrl+Q", command=self.quit)
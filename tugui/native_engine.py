@@ -0,0 +1,538 @@
+import os
+import re
+import numpy as np
+
+from dataclasses import dataclass, field
+from numpy.typing import NDArray
+from typing import Callable, Dict, List, Tuple, Union
+from typing_extensions import Self
+
+from gui_configuration import GuiPlotFieldsConfigurator
+from plot_settings import GroupType
+from quantities import QuantityDictionary, QuantityLocation
+from tu_interface import MacReader, MicReader, PliReader, StaReader, TimeAlignment, \
+  TimeIndex, TuInp
+
+
+# Types of the statistical distributions, as the DISTR values of the TuStat diagrams
+DISTRIBUTIONS: Dict[str, str] = {'f': "Fractional frequency", 'd': "Probability density"}
+
+
+@dataclass
+class NativeCurves():
+  """
+  Dataclass providing a record storing the curves of a diagram produced in-process, i.e.
+  the diagram title, the names of the X-Y axes and, for each curve legend, the X-Y values
+  as a 2D array having the X and the Y values as columns, as the ones read from the .dat
+  files produced by the plotting executables.
+  """
+  diagram_name: str = ''
+  x_axis_name: str = ''
+  y_axis_name: str = ''
+  curves: Dict[str, NDArray[np.float64]] = field(default_factory=dict)
+
+  def write_output_files(self, dat_path: str, plt_path: str) -> None:
+    """
+    Method that writes the curves into the given .dat and .plt files, in the same format
+    of the ones produced by the plotting executables for the 'Radius' and 'Axial' groups,
+    i.e. with the X-Y values and the legend of each curve given separately in the .dat
+    file, so that the curves can be saved and loaded back as the executables ones.
+    """
+    # Write the X-Y values of each curve, preceded by its legend and followed by the end
+    # of curve tag
+    with open(dat_path, 'w') as f:
+      f.write("/td\n")
+      for (legend, values) in self.curves.items():
+        f.write('//lt "' + legend + '" ;legend for curve\n')
+        np.savetxt(f, np.asarray(values, dtype=np.float64).reshape(-1, 2), fmt='%.17G')
+        f.write("//nc\n")
+    # Write the axes names, the diagram title (one line each) and the .dat file name
+    with open(plt_path, 'w') as f:
+      f.write('"' + self.x_axis_name + '" x-axis-title\n')
+      f.write('"' + self.y_axis_name + '" y-axis-title\n')
+      for title in self.diagram_name.split('\n'):
+        f.write('"' + title + '" ;graph title\n')
+      f.write('"' + os.path.basename(dat_path) + '" ;data file\n')
+
+
+@dataclass
+class DiagramRequest():
+  """
+  Dataclass providing a record storing the configuration of a TuPlot or TuStat diagram,
+  as written in the .inp file by the 'TuInp' dataclass, with its values interpreted as
+  numbers: the diagram group, number and type (IDGA), the curve numbers (Kn), the slice
+  numbers and the "h s ms" strings of the selected time instants. For the TuStat diagrams,
+  the number of intervals and the type of the statistical distribution are stored too.
+  """
+  group: GroupType = None
+  number: int = 0
+  idga: int = 0
+  kns: List[int] = field(default_factory=list)
+  slices: List[int] = field(default_factory=list)
+  times: List[str] = field(default_factory=list)
+  intervals: int = 0
+  distribution: str = ''
+
+  @staticmethod
+  def init_DiagramRequest(tuinp: TuInp) -> Self:
+    """
+    Method that builds an instance of the 'DiagramRequest' dataclass by interpreting the
+    diagram configuration of the given 'TuInp' instance, made of the lines:
+    . IDNF IDGA NKN
+    . IANT1 IANT2 IANT3
+    . the list of the Kn-s
+    . the list of the slices (NLSUCH)
+    . the time instants, one per line
+    . NMAS
+    For a TuStat diagram, the lines are DIAGNR, NAXIAL, TIME, INTERV and DISTR instead.
+    """
+    # Split the diagram configuration into its lines
+    lines = tuinp.diagram_config.strip('\n').split('\n')
+    # Interpret the configuration of a TuStat diagram, whose quantity is the only one of
+    # its diagram number (Kn = 1)
+    if not tuinp.is_tuplot:
+      if len(lines) != 5:
+        raise Exception("Error: the diagram configuration is not complete.")
+      return DiagramRequest(
+        number=int(lines[0]),
+        kns=[1],
+        slices=[int(lines[1])],
+        times=[lines[2].strip()],
+        intervals=int(lines[3]),
+        distribution=lines[4].strip())
+    if len(lines) < 6:
+      raise Exception("Error: the diagram configuration is not complete.")
+    # Get the diagram number and type from the first line
+    (number, idga) = lines[0].split()[:2]
+    # Build the dataclass instance
+    return DiagramRequest(
+      group=tuinp.diagr_type.group,
+      number=int(number),
+      idga=int(idga),
+      kns=[int(kn) for kn in lines[2].split()],
+      slices=[int(s) for s in lines[3].split()],
+      times=[line.strip() for line in lines[4:-1]])
+
+
+class NativeEngine():
+  """
+  Class that produces the curves of the TuPlot and TuStat diagrams straight from the
+  memory-mapped direct-access files of a TU simulation, in place of running the plotting
+  executables and parsing their output .dat and .plt files.
+  The position of the diagram quantities in the file records is given by the quantity
+  dictionary: the diagrams whose quantities are not present in it are not supported, so
+  that they are still produced by the executables.
+  """
+  # Direct-access files the quantities of each diagram group can be read from
+  GROUP_FILES: Dict[GroupType, Tuple[str, ...]] = {
+    GroupType.group1: ('mac',),
+    GroupType.group2: ('mic',),
+    GroupType.group2A: ('mic',),
+    GroupType.group3: ('mic', 'mac'),
+  }
+
+  def __init__(self, quantities: QuantityDictionary,
+               micreader: MicReader, mic_record_length: int,
+               macreader: MacReader, mac_record_length: int,
+               diagram_names: Union[Dict[int, str], None] = None,
+               kn_names: Union[Dict[Tuple[int, int], str], None] = None,
+               stareader: Union[StaReader, None] = None, sta_record_length: int = 0,
+               sta_axial_steps: int = 0,
+               sta_names: Union[Dict[int, str], None] = None) -> None:
+    """
+    Build an instance of the 'NativeEngine' class given the quantity dictionary, the
+    readers of the .mic and .mac files, with their time instants already extracted, and
+    the length of their records. The descriptions of the diagram numbers and of the curve
+    numbers (Kn) can be given for labelling the diagrams.
+    For a statistical simulation, the reader of the .sta file, with its time instants
+    already extracted, the length of its records, its number of axial steps and the
+    descriptions of the TuStat diagrams can be given too.
+    """
+    # Store the quantity dictionary and the readers of the files
+    self.quantities: QuantityDictionary = quantities
+    self.micreader: MicReader = micreader
+    self.mic_record_length: int = mic_record_length
+    self.macreader: MacReader = macreader
+    self.mac_record_length: int = mac_record_length
+    # Store the descriptions of the diagrams and of the curves
+    self.diagram_names: Dict[int, str] = diagram_names if diagram_names else dict()
+    self.kn_names: Dict[Tuple[int, int], str] = kn_names if kn_names else dict()
+    # Store the reader of the .sta file and the descriptions of the TuStat diagrams
+    self.stareader: Union[StaReader, None] = stareader
+    self.sta_record_length: int = sta_record_length
+    self.sta_axial_steps: int = sta_axial_steps
+    self.sta_names: Dict[int, str] = sta_names if sta_names else dict()
+    # Map each diagram group to the method building its curves
+    self.builders: Dict[GroupType, Callable[[DiagramRequest], NativeCurves]] = {
+      GroupType.group1: self._radial_profiles,
+      GroupType.group2: self._time_history,
+      GroupType.group2A: self._time_history,
+      GroupType.group3: self._axial_profiles,
+    }
+
+  @staticmethod
+  def init_NativeEngine(guiconfig: GuiPlotFieldsConfigurator, plireader: PliReader,
+                        micreader: MicReader, macreader: MacReader,
+                        stareader: Union[StaReader, None] = None) -> Union[Self, None]:
+    """
+    Method that builds an instance of the 'NativeEngine' class for the simulation described
+    by the given 'PliReader' instance, whose .mic, .mac and, if statistical, .sta files are
+    read by the given readers, by reading the quantity dictionary of the GUI configuration.
+    If the dictionary is not present or has no entries, None is returned, as no diagram
+    can be produced in-process.
+    """
+    # Return None if the quantity dictionary is not present
+    if not os.path.isfile(guiconfig.quantities_path): return None
+    # Read the quantity dictionary, returning None if it has no entries
+    quantities = QuantityDictionary.init_QuantityDictionary_from_pli(
+      guiconfig.quantities_path, plireader)
+    if not quantities.entries: return None
+    # Get the descriptions of the diagrams and of the curves from the GUI configuration
+    (diagram_names, kn_names) = diagram_labels(guiconfig)
+    # Build the engine
+    return NativeEngine(
+      quantities,
+      micreader, int(plireader.mic_recordLength),
+      macreader, int(plireader.mac_recordLength),
+      diagram_names, kn_names,
+      stareader, int(plireader.sta_recordLength) if stareader else 0,
+      plireader.axial_steps - 1, guiconfig.sta_numVSdescription)
+
+  def supports(self, tuinp: TuInp) -> bool:
+    """
+    Method that checks if the diagram described by the given 'TuInp' instance can be
+    produced in-process, i.e. if its group is handled and its quantities are present in
+    the quantity dictionary, stored in the files the group is read from.
+    """
+    # Check the quantity of a TuStat diagram can be located
+    if not tuinp.is_tuplot:
+      try:
+        self._sta_location(DiagramRequest.init_DiagramRequest(tuinp))
+      except Exception:
+        return False
+      return True
+    # Check the diagram group is handled
+    if tuinp.diagr_type is None or tuinp.diagr_type.group not in self.builders:
+      return False
+    # Check the quantities of the curves can be located
+    try:
+      self._curve_locations(DiagramRequest.init_DiagramRequest(tuinp))
+    except Exception:
+      return False
+    return True
+
+  def produce(self, tuinp: TuInp) -> NativeCurves:
+    """
+    Method that produces the curves of the diagram described by the given 'TuInp'
+    instance, by reading the values of its quantities from the direct-access files.
+    An exception is raised if the diagram is not supported.
+    """
+    # Interpret the diagram configuration
+    request = DiagramRequest.init_DiagramRequest(tuinp)
+    # Build the histogram of a TuStat diagram
+    if not tuinp.is_tuplot:
+      return self.histograms(
+        request.number, request.slices, request.times, request.intervals, request.distribution)
+    # Check the diagram group is handled
+    if request.group not in self.builders:
+      raise Exception(f"Error: the diagram {request.number} cannot be produced in-process.")
+    # Build the curves by means of the method of the diagram group
+    return self.builders[request.group](request)
+
+  def histograms(self, number: int, slices: List[int], times: List[str],
+                 intervals: int, distribution: str) -> NativeCurves:
+    """
+    Method that builds the statistical distributions of the quantity of the given TuStat
+    diagram number, as histograms with the given number of intervals and type of
+    distribution ('f' for the fractional frequency, 'd' for the probability density).
+    A curve is built for every combination of the given axial sections (as slice numbers,
+    starting from 1) and time instants (as "h s ms" strings), giving the distribution of
+    the values over the datasets of the statistical simulation at that time instant.
+    The values of all the sections of a time instant are gathered at once.
+    """
+    # Get the position of the values of the quantity
+    request = DiagramRequest(number=number, kns=[1], slices=slices, times=times,
+                             intervals=intervals, distribution=distribution)
+    location = self._sta_location(request)
+    if not slices or not times or intervals < 1:
+      raise Exception("Error: no axial section, time instant or interval is selected.")
+    # Get the indices of the time instants of the statistical simulation
+    sta_times = TimeIndex.init_TimeIndex_from_reader(self.stareader)
+    curves = dict()
+    for time in times:
+      # Gather the values of all the datasets of the time instant, for all the sections,
+      # as a (dataset, section) array
+      values = self.stareader.read_section_columns(
+        sta_times.locate(time), [s - 1 for s in slices], location.columns[:1],
+        self.sta_record_length, self.sta_axial_steps)[:, :, 0].astype(np.float64)
+      # Build the distribution of the values of each section
+      for (i, s) in enumerate(slices):
+        legend = ("Time " + time + ", " if len(times) > 1 else "") + "Slice " + str(s)
+        curves[legend] = np.column_stack(histogram(values[:, i], intervals, distribution))
+    # Build the curves of the diagram, labelled by the description of the diagram
+    description = self.sta_names.get(number, str(number))
+    return NativeCurves(
+      diagram_name=description,
+      x_axis_name=re.sub(r"^\d+\s+", "", description),
+      y_axis_name=DISTRIBUTIONS[distribution],
+      curves=curves)
+
+  def _sta_location(self, request: DiagramRequest) -> QuantityLocation:
+    """
+    Method that returns the position of the values of the quantity of the given TuStat
+    diagram in the records of the .sta file.
+    An exception is raised if no .sta file is read, if the quantity is not present in the
+    quantity dictionary, if it is not stored in the .sta file as a single value or if the
+    type of distribution is not valid.
+    """
+    if self.stareader is None:
+      raise Exception("Error: no statistical simulation is present.")
+    if request.distribution not in DISTRIBUTIONS:
+      raise Exception(f"Error: invalid type of distribution '{request.distribution}'.")
+    location = self.quantities.resolve(request.number, 1)
+    if location.file != 'sta' or len(location.columns) != 1:
+      raise Exception(f"Error: the quantity of the diagram {request.number} cannot be read "
+                      "from the .sta file.")
+    return location
+
+  def _time_history(self, request: DiagramRequest) -> NativeCurves:
+    """
+    Method that builds the curves of the diagrams as a function of time (groups 2 and 2A),
+    i.e. the values of the quantities between the start and end times of the request, as
+    read from the columns of the .mic file. The columns of all the curves are read at
+    once, for the micro-steps in the time range only.
+    """
+    # Get the position of the values of the curves
+    curves = self._curve_locations(request)
+    # Get the range of the micro-steps between the start and end times
+    if len(request.times) < 2:
+      raise Exception("Error: the start and end times of the diagram are missing.")
+    micro_time = TimeIndex.init_TimeIndex_from_reader(self.micreader)
+    (start, end) = (micro_time.label_seconds(request.times[0]),
+                    micro_time.label_seconds(request.times[1]))
+    time_range = micro_time.range(min(start, end), max(start, end))
+    # Read the columns of all the curves, as a (curve, micro-step) array
+    values = self.micreader.read_columns(
+      [location.columns[0] for (_, location, _) in curves], self.mic_record_length, time_range)
+    # Get the X values as the time instants in hours
+    hours = micro_time.seconds[time_range[0]:time_range[1]] / 3600.0
+    # Build the X-Y values of each curve
+    return self._build_curves(request, "Time (h)", {
+      legend: np.column_stack((hours, values[i])) for (i, (legend, _, _)) in enumerate(curves)})
+
+  def _radial_profiles(self, request: DiagramRequest) -> NativeCurves:
+    """
+    Method that builds the curves of the diagrams as a function of the radius (group 1),
+    i.e. the radial profiles of the quantities at the selected macro-step times and
+    slices, against the radial coordinates stored in the same .mac records.
+    The radial coordinates and the values of all the curves, for all the requested times
+    and slices, are gathered at once from the (time, slice, column) view of the file.
+    """
+    # Get the position of the values of the curves and of the radial coordinates
+    curves = self._curve_locations(request)
+    radius = self.quantities.coordinate('X1')
+    # Get the time instants (IDGA 2) or the slices (IDGA 3) the curves are given by, the
+    # other diagram types referring to a single time instant and slice
+    times = request.times if request.idga == 2 else request.times[:1]
+    slices = request.slices if request.idga == 3 else request.slices[:1]
+    if not times:
+      raise Exception("Error: no time instant is selected.")
+    # Get the distinct quantities of the curves, as the tuples of their record columns
+    quantities = list(dict.fromkeys(tuple(location.columns) for (_, location, _) in curves))
+    # Gather the radial coordinates, followed by the values of the quantities, for every
+    # combination of the requested times and slices, as a (time, slice, column) array
+    cube = self.macreader.cube(self.mac_record_length)
+    values = cube.select(
+      times, slices, radius.columns + [c for columns in quantities for c in columns]).astype(np.float64)
+    n = len(radius.columns)
+
+    def profile(i: int, j: int, columns: Tuple[int, ...]) -> NDArray[np.float64]:
+      # Get the X-Y values of the quantity with the given columns, for the time and slice
+      # at the given positions of the gathered array
+      start = n * (1 + quantities.index(columns))
+      return np.column_stack((values[i, j, :n], values[i, j, start:start + n]))
+
+    # Build the X-Y values of each curve
+    if request.idga == 2:
+      profiles = {"Time " + time: profile(i, 0, quantities[0]) for (i, time) in enumerate(times)}
+    elif request.idga == 3:
+      profiles = {legend: profile(0, i, tuple(location.columns))
+                  for (i, (legend, location, _)) in enumerate(curves)}
+    else:
+      profiles = {legend: profile(0, 0, tuple(location.columns)) for (legend, location, _) in curves}
+    return self._build_curves(request, "Radius", profiles)
+
+  def _axial_profiles(self, request: DiagramRequest) -> NativeCurves:
+    """
+    Method that builds the curves of the diagrams as a function of the axial coordinate
+    (group 3), i.e. the axial profiles of the quantities at the selected times, against
+    the axial coordinates of the slices.
+    The values of all the slices, for all the requested times, are gathered at once.
+    """
+    # Get the position of the values of the curves and of the axial coordinates
+    curves = self._curve_locations(request)
+    axial = self.quantities.coordinate('X3')
+    # Get the time instants the curves are given by (IDGA 2), the other diagram types
+    # referring to a single time instant
+    times = request.times if request.idga == 2 else request.times[:1]
+    if not times:
+      raise Exception("Error: no time instant is selected.")
+    # Gather the axial coordinates and the values of the curves, as (time, slice) arrays
+    values = self._slice_values([axial] + [location for (_, location, _) in curves], times)
+
+    # Build the X-Y values of each curve
+    if request.idga == 2:
+      profiles = {"Time " + time: np.column_stack((values[0][i], values[1][i]))
+                  for (i, time) in enumerate(times)}
+    else:
+      profiles = {legend: np.column_stack((values[0][0], values[i + 1][0]))
+                  for (i, (legend, _, _)) in enumerate(curves)}
+    return self._build_curves(request, "Axial coordinate", profiles)
+
+  def _slice_values(self, locations: List[QuantityLocation],
+                    times: List[str]) -> List[NDArray[np.float64]]:
+    """
+    Method that returns the values of each slice of the quantities at the given positions,
+    for the given time instants, as (time, slice) arrays. The values are read from:
+    . the .mac records, a record per slice, where each quantity is stored in one column;
+      the values of all the quantities are gathered by a single indexing operation
+    . the .mic records, where each quantity is stored in a column per slice; the columns
+      of all the quantities are read at once, from the records of the given times only
+    The given times are micro-step ones: for the .mac records, each of them is mapped to
+    the macro-step closing the interval it belongs to.
+    """
+    values: List[NDArray[np.float64]] = [None] * len(locations)
+    micro_time = TimeIndex.init_TimeIndex_from_reader(self.micreader)
+    indices = np.array([micro_time.locate(time) for time in times])
+    # Gather the values stored in the .mac file, as a (time, slice, quantity) array
+    mac = [i for (i, location) in enumerate(locations) if location.file == 'mac']
+    if mac:
+      cube = self.macreader.cube(self.mac_record_length)
+      # Map every micro-step to its macro-step
+      alignment = TimeAlignment(cube.times, micro_time)
+      selected = cube.select([alignment.macro_of(i) for i in indices],
+                             range(1, cube.shape[1] + 1),
+                             [locations[i].columns[0] for i in mac]).astype(np.float64)
+      for (k, i) in enumerate(mac):
+        values[i] = selected[:, :, k]
+    # Read the values stored in the .mic file, as a (quantity column, time) array
+    mic = [i for (i, location) in enumerate(locations) if location.file == 'mic']
+    if mic:
+      selected = self.micreader.read_columns_at(
+        [c for i in mic for c in locations[i].columns], self.mic_record_length,
+        indices).astype(np.float64)
+      # Split the columns by quantity, each having a column per slice
+      n = self.macreader.n_slices
+      for (k, i) in enumerate(mic):
+        values[i] = selected[k * n:(k + 1) * n].T
+    return values
+
+  def _curve_locations(self, request: DiagramRequest) -> List[Tuple[str, QuantityLocation, int]]:
+    """
+    Method that returns, for each curve of the given diagram, its legend, the position
+    of its values in the records of the direct-access files and the number of the slice
+    it refers to. The curves are given by the Kn-s (IDGA 1) or by the slices (IDGA 3),
+    while a single curve position is returned for the different times one (IDGA 2).
+    An exception is raised if any quantity is not present in the quantity dictionary or
+    is not stored in the files the diagram group is read from.
+    """
+    # Check the lists of the curves and of the slices are not empty
+    if not request.kns or not request.slices:
+      raise Exception("Error: no curve number or slice is selected.")
+    # The values of the diagrams as a function of time refer to a single slice, i.e. a
+    # single column of the .mic file, except for the integral ones
+    if request.group == GroupType.group2:
+      select = lambda slice_number: slice_number
+    else:
+      select = lambda slice_number: None
+    # Locate the curves given by the slices or by the Kn-s
+    if request.idga == 3:
+      curves = [("Slice " + str(s), self.quantities.resolve(request.number, request.kns[0], select(s)), s)
+                for s in request.slices]
+    else:
+      curves = [(self._kn_legend(request.number, kn),
+                 self.quantities.resolve(request.number, kn, select(request.slices[0])),
+                 request.slices[0]) for kn in request.kns]
+    # Check the quantities are stored in the files the diagram group is read from
+    for (_, location, _) in curves:
+      if location.file not in self.GROUP_FILES.get(request.group, ()):
+        raise Exception(f"Error: the quantities of the diagram {request.number} cannot be read "
+                        f"from the .{location.file} file.")
+      if request.group in (GroupType.group2, GroupType.group2A) and len(location.columns) != 1:
+        raise Exception(f"Error: the quantities of the diagram {request.number} do not refer "
+                        "to a single record column.")
+    # Check the radial profiles have a value for each radial coordinate
+    if request.group == GroupType.group1:
+      radius = self.quantities.coordinate('X1')
+      if radius.file != 'mac' or any(len(location.columns) != len(radius.columns)
+                                     for (_, location, _) in curves):
+        raise Exception(f"Error: the quantities of the diagram {request.number} do not match "
+                        "the radial coordinates.")
+    # Check the axial profiles have a value for each slice, as well as the axial coordinates
+    if request.group == GroupType.group3:
+      for location in [location for (_, location, _) in curves] + [self.quantities.coordinate('X3')]:
+        if location.file not in self.GROUP_FILES[GroupType.group3] or len(location.columns) != \
+           (self.macreader.n_slices if location.file == 'mic' else 1):
+          raise Exception(f"Error: the quantities of the diagram {request.number} do not refer "
+                          "to a value per slice.")
+    return curves
+
+  def _kn_legend(self, number: int, kn: int) -> str:
+    """
+    Method that returns the legend of the curve of the given diagram and curve numbers,
+    i.e. the description of the Kn, if available.
+    """
+    return self.kn_names.get((number, kn), "Kn " + str(kn))
+
+  def _build_curves(self, request: DiagramRequest, x_axis_name: str,
+                    curves: Dict[str, NDArray[np.float64]]) -> NativeCurves:
+    """
+    Method that builds the 'NativeCurves' instance of the given diagram, given the name of
+    its X axis and its curves, by labelling it with the description of the diagram.
+    """
+    description = self.diagram_names.get(request.number, "")
+    return NativeCurves(
+      diagram_name=(str(request.number) + " " + description).strip(),
+      x_axis_name=x_axis_name,
+      y_axis_name=description if description else str(request.number),
+      curves=curves)
+
+
+def histogram(values: NDArray[np.float64], intervals: int,
+              distribution: str) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+  """
+  Function that builds the statistical distribution of the given values, as a histogram
+  with the given number of equal intervals between their minimum and maximum.
+  It returns the centres of the intervals and, for the given type of distribution:
+  . 'f', the fractional frequency, i.e. the fraction of the values in each interval
+  . 'd', the probability density, i.e. the fraction divided by the interval width
+  """
+  # Count the values in each interval
+  (counts, edges) = np.histogram(values, bins=intervals, density=(distribution == 'd'))
+  # Get the fraction of the values in each interval, for the fractional frequency
+  if distribution == 'f':
+    counts = counts / values.size
+  return ((edges[:-1] + edges[1:]) / 2.0, counts.astype(np.float64))
+
+
+def diagram_labels(guiconfig: GuiPlotFieldsConfigurator) -> Tuple[
+  Dict[int, str], Dict[Tuple[int, int], str]]:
+  """
+  Function that extracts from the GUI configuration the descriptions of the diagram
+  numbers and of the curve numbers (Kn) of the TuPlot diagrams, as dictionaries indexed
+  by the diagram number and by the (diagram number, Kn) couple respectively.
+  """
+  # Declare the dictionaries of the descriptions
+  diagram_names = dict()
+  kn_names = dict()
+  # Loop over the diagrams of all the groups, given as "Number Description" VS "Kn" lines
+  for numVsKn in guiconfig.groupVSnumVsKn.values():
+    for (diagram, kns) in numVsKn.items():
+      number = int(diagram.split()[0])
+      diagram_names[number] = diagram[len(diagram.split()[0]):].strip()
+      # Extract the Kn value and description from the "KN= n - description" lines
+      for line in kns:
+        kn = re.search(r"KN=\s*(\d+)\s*-\s*(.*)", line)
+        if kn:
+          kn_names[(number, int(kn.group(1)))] = kn.group(2).strip()
+  return (diagram_names, kn_names)
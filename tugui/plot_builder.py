@@ -17,7 +17,10 @@ from matplotlib.offsetbox import AnnotationBbox, TextArea, VPacker
 from numpy.typing import ArrayLike
 from tkinter import ttk
 from tkinter.filedialog import asksaveasfilename
-from typing import Callable, Dict, List, Union, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Union, Tuple
+
+if TYPE_CHECKING:
+  from native_engine import NativeCurves
 
 
 class PlotFigure(ttk.Frame):
@@ -137,6 +140,16 @@ class PlotFigure(ttk.Frame):
       # Use the pandas clipboard functionality to copy the text to the clipboard
       df.to_clipboard(index=False, header=False)
 
+  def clear_report(self) -> None:
+    """
+    Method that clears the content of the report area, as for the diagrams that are not
+    provided with an .out report file.
+    """
+    # Set the text area as editable, clear its content and disable its editability
+    self.text_widget.configure(state=tk.NORMAL)
+    self.text_widget.delete(1.0, tk.END)
+    self.text_widget.configure(state=tk.DISABLED)
+
 
 class CustomToolbar(NavigationToolbar2Tk):
   """
@@ -930,13 +943,24 @@ class PlotManager():
   Class that handles the plot creation by extracting the data provided by the output files
   produced by the TuPlot and TuStat executables.
   """
-  def __init__(self, dat_file: str, plt_file: str, out_file: str="") -> None:
+  def __init__(self, dat_file: str = "", plt_file: str = "", out_file: str = "",
+               curves: Union['NativeCurves', None] = None) -> None:
+    """
+    Build an instance of the 'PlotManager' class given the paths to the .dat and .plt
+    output files (and to the .out report file, if any) or, in their place, the curves
+    produced in-process, given as a 'NativeCurves' instance. Both ways, the same plot
+    information and curves attributes are set, with the same rendering of the names.
+    """
     # Set the instance attributes
     self.dat_file: str = dat_file
     self.plt_file: str = plt_file
     if out_file != "":
       self.out_file: str = out_file
 
+    # Set the plot information and X-Y data from the curves produced in-process, if given
+    if curves is not None:
+      self._read_curves(curves)
+      return
     # Extract the plot information from the .plt file
     self._read_plt_file()
     # Extract the plot X-Y data from the .dat file
@@ -945,6 +969,15 @@ class PlotManager():
     if hasattr(self, 'out_file'):
       self._read_out_file()
 
+  @staticmethod
+  def init_PlotManager_from_curves(curves: 'NativeCurves') -> 'PlotManager':
+    """
+    Method that builds an instance of the 'PlotManager' class from the curves produced
+    in-process, given as a 'NativeCurves' instance, in place of the output files of the
+    plotting executables, so that the curves are plotted the same way.
+    """
+    return PlotManager(curves=curves)
+
   def plot(self, plotFigure: PlotFigure, plot_index: int = 111) -> None:
     """
     Method that, given the input PlotFigure object, configures the plots and shows
@@ -977,14 +1010,12 @@ class PlotManager():
     # Loop over all the curves stored in the dictionary extracted by reading the .dat file
     # and plot each of them
     for key, value in self.curves2plot.items():
-      # Extract 2 lists, one for the X- and one for the Y-values of the current curve in the loop
-      vals_x = np.array(value).T.tolist()[0]
-      vals_y = np.array(value).T.tolist()[1]
-
-      # print(key, vals_x, vals_y)
+      # Get the X-Y values of the current curve in the loop as a 2D array, whose columns
+      # are passed to matplotlib as they are
+      values = np.asarray(value, dtype=np.float64).reshape(-1, 2)
 
       # Plot the current curve with its label
-      (line, ) = axes.plot(vals_x, vals_y, label = key)
+      (line, ) = axes.plot(values[:, 0], values[:, 1], label = key)
       # Add the Line2D object to the curves list
       lines.append(line)
 
@@ -1096,7 +1127,7 @@ class PlotManager():
       # List containing the X-Y values for every curve
       curve = list()
       # Dictionary containing the curves values with key the legend and value a list of X-Y values
-      self.curves2plot: Dict[Union[List[str], str], List[Tuple[float]]] = dict()
+      self.curves2plot: Dict[Union[List[str], str], Union[List[Tuple[float]], np.ndarray]] = dict()
 
       # Handle the .dat content reading differently on the basis of the first line of the .dat file:
       # . if it starts with '/td', the curves X-Y data are provided separately as in the 'Radius'
@@ -1219,6 +1250,25 @@ class PlotManager():
       # Save all the file content into a string
       self.report = file.read()
 
+  def _read_curves(self, curves: 'NativeCurves') -> None:
+    """
+    Method for setting up the plot display information and X-Y data from the curves
+    produced in-process, as the '_read_plt_file' and '_read_dat_file' methods do from the
+    output files, i.e. with the names rendered as mathtext and with the Y-axis name used
+    for any empty legend.
+    """
+    # Set the axes names and the plot title, a line at a time
+    self.x_axis_name = self._render_mathtext(curves.x_axis_name)
+    self.y_axis_name = self._render_mathtext(curves.y_axis_name)
+    self.diagram_name = "\n".join(
+      self._render_mathtext(line) for line in curves.diagram_name.split("\n"))
+    # Set the legends, replacing the empty ones with the Y-axis name
+    self.legend = [self._render_mathtext(legend) or self.y_axis_name for legend in curves.curves]
+    # Set the X-Y values of each curve, as a 2D array of (X, Y) rows
+    self.curves2plot: Dict[Union[List[str], str], Union[List[Tuple[float]], np.ndarray]] = {
+      legend: np.asarray(values, dtype=np.float64)
+      for (legend, values) in zip(self.legend, curves.curves.values())}
+
   def _read_plt_file(self) -> None:
     """
     Method for extracting the data for setting up the plot display information,
@@ -0,0 +1,182 @@
+import ast
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Union
+from typing_extensions import Self
+
+from tu_interface import PliReader
+
+
+# Names of the coordinate entries of the quantity dictionary
+COORDINATES: Tuple[str, str] = ('X1', 'X3')
+# Extensions of the direct-access files the quantities can be stored in
+DA_FILES: Tuple[str, str, str] = ('mic', 'mac', 'sta')
+
+
+@dataclass
+class QuantityEntry():
+  """
+  Dataclass providing a record storing an entry of the quantity dictionary, i.e. the
+  direct-access file storing the values of a quantity and the expressions giving the
+  record column of its first value, the number of its values and the distance between
+  the columns of consecutive values.
+  """
+  file: str = ''
+  offset: str = ''
+  length: str = ''
+  stride: str = ''
+
+
+@dataclass
+class QuantityLocation():
+  """
+  Dataclass providing a record storing the position of the values of a quantity in the
+  records of a direct-access file, i.e. the file extension and the indices of the record
+  columns storing the values.
+  """
+  file: str = ''
+  columns: List[int] = field(default_factory=list)
+
+
+class QuantityDictionary():
+  """
+  Class that maps the diagram numbers and curve numbers (Kn) to the record columns of the
+  direct-access files storing the corresponding quantities, for the options (e.g. M3) of
+  a TU simulation, as described by the "Quantities" configuration file.
+  This way, the values of the quantities can be read straight from the files.
+  """
+  def __init__(self, entries: Dict[Tuple[int, int], QuantityEntry],
+               coordinates: Dict[str, QuantityEntry], variables: Dict[str, int]) -> None:
+    """
+    Build an instance of the 'QuantityDictionary' class given the entries of the diagram
+    and curve numbers, the ones of the coordinates and the values of the options the
+    entries expressions can use.
+    """
+    self.entries: Dict[Tuple[int, int], QuantityEntry] = entries
+    self.coordinates: Dict[str, QuantityEntry] = coordinates
+    self.variables: Dict[str, int] = variables
+
+  @staticmethod
+  def init_QuantityDictionary(quantities_path: str, variables: Dict[str, int]) -> Self:
+    """
+    Method that builds an instance of the 'QuantityDictionary' class by reading the given
+    configuration file, whose expressions use the given option values.
+    An exception is raised if any line of the file is not valid.
+    """
+    # Check the configuration file existence
+    if not os.path.isfile(quantities_path):
+      raise FileNotFoundError("Error: missing \"Quantities\" configuration file")
+    # Declare the dictionaries of the entries
+    entries = dict()
+    coordinates = dict()
+    # Open the file by specifying the ANSI encoding the configuration files are built with
+    with open(quantities_path, 'r', encoding="cp1252") as f:
+      # Process the file line by line, skipping comments and empty lines
+      for (i, line) in enumerate(f, start=1):
+        if not line.strip() or line.lstrip().startswith('#'): continue
+        # Split the line into its fields
+        fields = line.split()
+        if len(fields) != 6 or fields[2] not in DA_FILES:
+          raise Exception("Error: invalid entry at line " + str(i) + " of the \"Quantities\" file")
+        entry = QuantityEntry(file=fields[2], offset=fields[3], length=fields[4], stride=fields[5])
+        # Store the entry as a coordinate or as a diagram-curve one
+        if fields[0] in COORDINATES:
+          coordinates[fields[0]] = entry
+        elif re.search(r"^\d+$", fields[0]) and re.search(r"^\d+$", fields[1]):
+          entries[(int(fields[0]), int(fields[1]))] = entry
+        else:
+          raise Exception("Error: invalid entry at line " + str(i) + " of the \"Quantities\" file")
+    # Return the built instance
+    return QuantityDictionary(entries, coordinates, variables)
+
+  @staticmethod
+  def init_QuantityDictionary_from_pli(quantities_path: str, plireader: PliReader) -> Self:
+    """
+    Method that builds an instance of the 'QuantityDictionary' class by reading the given
+    configuration file, whose expressions use the integer options of the .pli file
+    interpreted by the given 'PliReader' instance.
+    """
+    variables = {name: int(value) for (name, value) in plireader.opt_dict.items()
+                 if re.search(r"^-?\d+$", value)}
+    return QuantityDictionary.init_QuantityDictionary(quantities_path, variables)
+
+  def __contains__(self, key: Tuple[int, int]) -> bool:
+    return (int(key[0]), int(key[1])) in self.entries
+
+  def kns(self, number: int) -> List[int]:
+    """
+    Method that returns the curve numbers (Kn) available for the given diagram number.
+    """
+    return sorted(kn for (n, kn) in self.entries if n == int(number))
+
+  def resolve(self, number: int, kn: int,
+              slice_number: Union[int, None] = None) -> QuantityLocation:
+    """
+    Method that returns the position of the values of the quantity of the given diagram
+    and curve numbers. For the quantities of the .mic file, whose values refer to the
+    slices, the column of the given slice number (starting from 1) only is returned, if
+    given.
+    An exception is raised if the quantity is not present in the dictionary.
+    """
+    # Get the entry of the quantity
+    if (int(number), int(kn)) not in self.entries:
+      raise Exception(f"Error: no record position is known for the diagram {number}, Kn {kn}.")
+    location = self._locate(self.entries[(int(number), int(kn))])
+    # Select the column of the given slice, if needed
+    if slice_number is not None and location.file == 'mic':
+      if not 1 <= slice_number <= len(location.columns):
+        raise Exception(f"Error: the slice number {slice_number} is out of range.")
+      location.columns = [location.columns[slice_number - 1]]
+    # Return the quantity position
+    return location
+
+  def coordinate(self, name: str) -> QuantityLocation:
+    """
+    Method that returns the position of the values of the given coordinate ('X1' for the
+    radial coordinates, 'X3' for the axial ones).
+    An exception is raised if the coordinate is not present in the dictionary.
+    """
+    if name not in self.coordinates:
+      raise Exception(f"Error: no record position is known for the {name} coordinate.")
+    return self._locate(self.coordinates[name])
+
+  def _locate(self, entry: QuantityEntry) -> QuantityLocation:
+    """
+    Method that evaluates the expressions of the given entry, providing the position of
+    the values it describes.
+    """
+    offset = evaluate_expression(entry.offset, self.variables)
+    length = evaluate_expression(entry.length, self.variables)
+    stride = evaluate_expression(entry.stride, self.variables)
+    return QuantityLocation(file=entry.file, columns=[offset + i * stride for i in range(length)])
+
+
+def evaluate_expression(expression: str, variables: Dict[str, int]) -> int:
+  """
+  Function that evaluates the given integer expression, made of integers, names of the
+  given variables, the +, -, *, // operators and parentheses.
+  An exception is raised if the expression is not valid.
+  """
+  # Define the allowed operators
+  operators = {ast.Add: lambda a, b: a + b, ast.Sub: lambda a, b: a - b,
+               ast.Mult: lambda a, b: a * b, ast.FloorDiv: lambda a, b: a // b}
+
+  def evaluate(node: ast.AST) -> int:
+    # Evaluate the node, allowing the integers, the variables and the operators only
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+      return node.value
+    if isinstance(node, ast.Name) and node.id in variables:
+      return variables[node.id]
+    if isinstance(node, ast.BinOp) and type(node.op) in operators:
+      return operators[type(node.op)](evaluate(node.left), evaluate(node.right))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+      return -evaluate(node.operand)
+    raise Exception(f"Error: invalid expression '{expression}' in the \"Quantities\" file")
+
+  # Parse the expression and evaluate it
+  try:
+    tree = ast.parse(expression, mode='eval')
+  except SyntaxError:
+    raise Exception(f"Error: invalid expression '{expression}' in the \"Quantities\" file")
+  return evaluate(tree.body)
@@ -631,11 +631,12 @@ class TuPlotTabContentBuilder(TabContentBuilder):
     . IDGA 3 (i.e. curves for different slices): comboboxes allow to set the curve Kn and the
       reference time, while the listbox the different slices numbers
     """
-    # Select either the macro o the micro time instant to display
+    # Select either the macro o the micro time instant to display: the strings of the
+    # time instants are built only for the one actually shown
     if (group == GroupType.group1):
-      time_to_show = self.macro_time
+      time_to_show = list(self.macro_time)
     else:
-      time_to_show = self.micro_time
+      time_to_show = list(self.micro_time)
 
     # Handle the different curve types (IDGA value)
     if (self.type_var.get() == IDGA.IDGA_1.description):
@@ -1,11 +1,18 @@
+import json
+import lzma
 import math
 import os
 import platform
 import shutil
-from typing import Dict, List, Tuple
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Sequence, Tuple, Union
 from typing_extensions import Self
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import ArrayLike, NDArray
 import re
 
 from abc import ABC, abstractmethod
@@ -16,6 +23,19 @@ from io import TextIOWrapper
 from support import remove_if_file_exists, _move_file_and_update_path
 
 
+# Default number of time instants read at once when scanning a direct-access file
+DEFAULT_BLOCK_SIZE: int = 4096
+# Default memory limit, in bytes, of the objects kept in the cache of the direct-access files
+DEFAULT_CACHE_BYTES: int = 512 * 1024**2
+# Version of the layout of the columnar sidecar of the direct-access files
+SIDECAR_VERSION: int = 1
+# Extension appended to the name of a direct-access file to get the one of its
+# block-compressed archive
+ARCHIVE_EXTENSION: str = '.tuz'
+# Default size, in bytes, of the uncompressed blocks of the direct-access file archives
+DEFAULT_ARCHIVE_BLOCK_BYTES: int = 1024**2
+
+
 @dataclass
 class TuInp:
   """
@@ -539,6 +559,413 @@ class PliReader():
     # Return the built instance
     return pli_reader
 
+  def validate_da_files(self, statistical: bool = False) -> List[str]:
+    """
+    Method that checks, before reading any of them, that the direct-access files of the
+    simulation agree with the layout declared in the .pli file, i.e. that:
+    . the time values of the .mic and .mac records are read where their record length
+      places them
+    . the .mac file holds a record per axial slice for each time instant
+    . the number of records of the files does not exceed the declared one, if any
+    . if the 'statistical' flag is set, the IBYTE option is valid and the .sta file holds
+      datasets of the declared size
+    Only the size of the files and the time values of their first records are accessed,
+    hence the check takes the same time whatever their size. An exception listing all the
+    problems found is raised, if any.
+    As the files of a still running simulation can end with a partially written record and
+    hold fewer records than the declared ones, these cases are not errors: the method
+    returns the list of the corresponding warnings instead.
+    """
+    # Declare the lists of the problems and of the warnings found
+    (problems, warnings) = (list(), list())
+    # Build the path to the files relative to the .pli file folder
+    folder = os.path.dirname(self.pli_path)
+    # Check the .mic file against its record length and declared number of records
+    micreader = MicReader(os.path.join(folder, self.mic_path), memory_map=True)
+    layout = micreader.check_layout(int(self.mic_recordLength), declared_int(self.sta_micStep))
+    problems += layout[0]
+    warnings += layout[1]
+    # Check the .mac file against its record length, number of slices and declared number
+    # of records
+    macreader = MacReader(os.path.join(folder, self.mac_path), self.axial_steps, memory_map=True)
+    layout = macreader.check_layout(int(self.mac_recordLength), declared_int(self.sta_macStep))
+    problems += layout[0]
+    warnings += layout[1]
+    # Check the .sta file, if needed
+    if statistical:
+      # Check the IBYTE option, giving the size of the .sta file values
+      if self.opt_dict.get('IBYTE') not in ('4', '8'):
+        problems.append("the IBYTE option must be either 4 or 8 (" + str(self.opt_dict.get('IBYTE')) + ")")
+      else:
+        # Check the .sta file against its record length and declared number of records,
+        # where each dataset is made of a record per axial section
+        stareader = StaReader(os.path.join(folder, self.sta_path), int(self.opt_dict['IBYTE']),
+                              memory_map=True)
+        layout = stareader.check_layout(
+          int(self.sta_recordLength), declared_int(self.sta_dataset), self.axial_steps)
+        problems += layout[0]
+        warnings += layout[1]
+
+    # Raise an exception listing all the problems found, if any
+    if problems:
+      raise Exception("Error: the direct-access files do not match the '"
+                      + os.path.basename(self.pli_path) + "' file:\n. " + "\n. ".join(problems))
+    # Return the warnings found
+    return warnings
+
+
+def declared_int(value: str) -> int:
+  """
+  Function that converts to an integer a value declared in the .pli file, giving 0 if
+  the value is not present.
+  """
+  return int(value) if value.strip() else 0
+
+
+class DaArchive():
+  """
+  Class that provides random access to the content of a direct-access file stored as a
+  block-compressed archive, without decompressing it as a whole.
+  The archive is made of:
+  . a header with the compression method, the size of the uncompressed blocks, the size
+    of the original file, the number of blocks and the position of the blocks index
+  . the blocks of the original file, each compressed on its own with zlib or lzma
+  . the index of the blocks, i.e. the position of each of them in the archive (plus the
+    one of the index itself)
+  Any range of bytes of the original file can be obtained by decompressing only the
+  blocks it overlaps.
+  """
+  # Identifier of the archive format, written at the beginning of the file
+  MAGIC: bytes = b'TUDAARC1'
+  # Layout of the header: identifier, compression method, uncompressed block size,
+  # original file size, number of blocks, position of the blocks index
+  HEADER: struct.Struct = struct.Struct('<8sIIQQQ')
+  # Available compression methods, with their compression and decompression functions
+  CODECS: Dict[str, Tuple[int, Callable, Callable]] = {
+    'zlib': (0, zlib.compress, zlib.decompress),
+    'lzma': (1, lzma.compress, lzma.decompress),
+  }
+
+  def __init__(self, archive_path: str) -> None:
+    """
+    Build an instance of the 'DaArchive' class given the path to the archive file, whose
+    header and blocks index are read.
+    """
+    # Store the archive file path
+    self.archive_path: str = archive_path
+    with open(archive_path, 'rb') as f:
+      # Read and check the header
+      header = f.read(self.HEADER.size)
+      if len(header) != self.HEADER.size or header[:len(self.MAGIC)] != self.MAGIC:
+        raise Exception("Error: the '" + archive_path + "' file is not a direct-access file archive.")
+      (_, codec_id, self.block_bytes, self.data_nbytes, n_blocks, index_offset) = \
+        self.HEADER.unpack(header)
+      # Read the positions of the blocks in the archive
+      f.seek(index_offset)
+      self.block_offsets: NDArray[np.int64] = np.fromfile(f, dtype='<u8', count=n_blocks + 1)
+    # Check the index is complete
+    if self.block_offsets.size != n_blocks + 1:
+      raise Exception("Error: the index of the '" + archive_path + "' archive is truncated.")
+    # Get the decompression function of the archive compression method
+    codecs = {c[0]: c[2] for c in self.CODECS.values()}
+    if codec_id not in codecs:
+      raise Exception("Error: unknown compression method of the '" + archive_path + "' archive.")
+    self._decompress: Callable[[bytes], bytes] = codecs[codec_id]
+    # Initialize the last decompressed block, kept as consecutive reads often share it
+    self._last_block: Tuple[int, bytes] = (-1, b'')
+    # Declare a lock as the archive can be accessed from different threads
+    self._lock = threading.Lock()
+
+  def read(self, offset: int, nbytes: int) -> bytearray:
+    """
+    Method that returns the range of bytes of the original file starting at the given
+    position and having the given size (or less, if the range exceeds the file end).
+    Only the blocks overlapping the range are read and decompressed, and the overlapping
+    part of each of them is copied straight into the returned buffer.
+    """
+    data = bytearray()
+    for part in self.iter_range(offset, nbytes):
+      data += part
+    return data
+
+  def iter_range(self, offset: int, nbytes: int) -> Iterator[memoryview]:
+    """
+    Generator that yields, in order, the parts of the decompressed blocks overlapping the
+    range of bytes of the original file starting at the given position and having the
+    given size (or less, if the range exceeds the file end), so that the range can be
+    processed one block at a time. Each block is read and decompressed once.
+    """
+    # Limit the range to the original file size
+    stop = min(offset + nbytes, self.data_nbytes)
+    if offset >= stop: return
+    # Loop over the blocks overlapping the range
+    for i in range(offset // self.block_bytes, (stop - 1) // self.block_bytes + 1):
+      # Yield the part of the decompressed block falling in the range
+      block_start = i * self.block_bytes
+      (a, b) = (max(offset, block_start), min(stop, block_start + self.block_bytes))
+      yield memoryview(self._read_block(i))[a - block_start:b - block_start]
+
+  def _read_block(self, i: int) -> bytes:
+    """
+    Method that reads the block of the archive with the given index and returns its
+    decompressed content.
+    """
+    with self._lock:
+      # Return the last decompressed block, if the requested one
+      if self._last_block[0] == i:
+        return self._last_block[1]
+    # Read the compressed block from the archive
+    with open(self.archive_path, 'rb') as f:
+      f.seek(int(self.block_offsets[i]))
+      compressed = f.read(int(self.block_offsets[i + 1] - self.block_offsets[i]))
+    # Decompress the block and keep it as the last one
+    block = self._decompress(compressed)
+    with self._lock:
+      self._last_block = (i, block)
+    # Return the decompressed block
+    return block
+
+
+class ArchivedRecords():
+  """
+  Class that presents the content of a direct-access file stored in a block-compressed
+  archive as a read-only 2D array of records, supporting the same indexing by rows and
+  columns as the memory-mapped view of the file. Only the blocks holding the selected
+  records are decompressed.
+  """
+  def __init__(self, archive: DaArchive, record_length: int, dtype: type) -> None:
+    """
+    Build an instance of the 'ArchivedRecords' class given the archive, the record length
+    and the type of the values. Any trailing incomplete record is not included.
+    """
+    self.archive: DaArchive = archive
+    self.dtype: np.dtype = np.dtype(dtype)
+    # Store the size, in bytes, of a record and the shape of the array of records
+    self.record_bytes: int = record_length * self.dtype.itemsize
+    self.shape: Tuple[int, int] = (archive.data_nbytes // self.record_bytes, record_length)
+    self.ndim: int = 2
+
+  def __len__(self) -> int:
+    return self.shape[0]
+
+  def __getitem__(self, key: Any) -> NDArray:
+    """
+    Method that returns a copy of the selected records (and columns, if the key is a
+    tuple) as an array, by decompressing only the archive blocks holding them.
+    The records can be selected by index, by slice or by an array of indices (or of
+    booleans), following the NumPy indexing rules.
+    """
+    # Separate the rows selection from the columns one
+    (rows, columns) = (key[0], key[1:]) if isinstance(key, tuple) else (key, ())
+    # Read the records selected by an array of indices
+    if not isinstance(rows, (slice, int, np.integer)):
+      return self._take(rows, columns)
+    # Get the range of rows to read
+    if isinstance(rows, slice):
+      (start, stop, step) = rows.indices(self.shape[0])
+    else:
+      rows = int(rows) + (self.shape[0] if int(rows) < 0 else 0)
+      if not 0 <= rows < self.shape[0]:
+        raise IndexError("Error: the record index is out of range.")
+      (start, stop, step) = (rows, rows + 1, 1)
+    if step < 0:
+      raise IndexError("Error: negative steps are not supported by the archived records.")
+    stop = max(start, stop)
+    # Read the records in the range, applying the rows step and the columns selection
+    records = self._read_range(start, stop, step, columns)
+    return records if isinstance(rows, slice) else records[0]
+
+  def __array__(self, dtype: Union[type, None] = None, copy: Union[bool, None] = None) -> NDArray:
+    return self[:] if dtype is None else self[:].astype(dtype)
+
+  def grouped(self, records_per_group: int, n_groups: Union[int, None] = None) -> 'ArchivedGroups':
+    """
+    Method that presents the records as a 3D array having, as dimensions, the groups of
+    the given number of consecutive records (e.g. the slices of a time instant or the
+    axial sections of a dataset), the records of each group and the record values.
+    Only the given number of groups (all the complete ones, by default) is included.
+    """
+    return ArchivedGroups(self, records_per_group, n_groups)
+
+  def _read_range(self, start: int, stop: int, step: int, columns: Tuple) -> NDArray:
+    """
+    Method that returns a copy of the records in the given range, with the given rows step
+    and columns selection applied. The archive blocks holding the records are decompressed
+    one at a time and only the selected rows and columns of the records of each block are
+    kept, so that no copy of the whole range of records is ever held in memory. The part of
+    a record crossing the end of a block is joined with the rest of it, from the next one.
+    """
+    parts = list()
+    # Initialize the bytes of the record crossing the end of the previous block and the
+    # index of the first record of the current block
+    (leftover, row) = (b'', start)
+    for part in self.archive.iter_range(start * self.record_bytes,
+                                        (stop - start) * self.record_bytes):
+      # Get the complete records of the block, including the one started in the previous one
+      data = b''.join((leftover, part)) if leftover else part
+      n = len(data) // self.record_bytes
+      records = np.frombuffer(data, dtype=self.dtype, count=n * self.shape[1]).reshape(
+        n, self.shape[1])
+      # Keep a copy of the selected rows and columns only
+      parts.append(np.array(records[(slice((start - row) % step, None, step),) + columns]))
+      (leftover, row) = (bytes(data[n * self.record_bytes:]), row + n)
+    # Build the empty selection, if no record is in the range, so that the shape is right
+    if not parts:
+      parts.append(np.empty((0, self.shape[1]), dtype=self.dtype)[(slice(None),) + columns])
+    # Join the selected values of the blocks
+    return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+  def _take(self, rows: Any, columns: Tuple) -> NDArray:
+    """
+    Method that returns a copy of the records selected by the given array of indices (or of
+    booleans), with the given columns selection applied. The distinct records are read
+    by runs of consecutive indices, so that only the archive blocks holding them are
+    decompressed. Unless the columns are selected by arrays, which combine with the rows
+    ones, only the selected columns of every run are kept.
+    """
+    # Get the indices of the records, as a non-negative integer array
+    rows = np.asarray(rows)
+    rows = np.flatnonzero(rows) if rows.dtype == bool else rows.astype(np.int64)
+    rows = np.where(rows < 0, rows + self.shape[0], rows)
+    if np.any((rows < 0) | (rows >= self.shape[0])):
+      raise IndexError("Error: the record index is out of range.")
+    # Get the distinct indices, sorted, and the position of each index among them
+    (distinct, inverse) = np.unique(rows, return_inverse=True)
+    # Split the distinct indices into runs of consecutive ones and read each run
+    runs = np.split(distinct, np.flatnonzero(np.diff(distinct) != 1) + 1)
+    basic = all(isinstance(c, (slice, int, np.integer)) for c in columns)
+    (kept, columns) = (columns, ()) if basic else ((), columns)
+    records = np.concatenate([self._read_range(int(run[0]), int(run[-1]) + 1, 1, kept)
+                              for run in runs]) if distinct.size \
+      else np.empty((0, self.shape[1]), dtype=self.dtype)[(slice(None),) + kept]
+    # Arrange the read records as the given indices and apply the remaining columns selection
+    return records[(inverse.reshape(rows.shape),) + columns]
+
+
+class ArchivedGroups():
+  """
+  Class that presents the records of a direct-access file stored in a block-compressed
+  archive as a read-only 3D array having, as dimensions, the groups of consecutive records
+  (e.g. the slices of a time instant or the axial sections of a dataset), the records of
+  each group and the record values. It supports the same indexing of the memory-mapped
+  view of the file reshaped the same way, where the records selected by the first two
+  indices are read from the archive, so that only the blocks holding them are decompressed.
+  """
+  def __init__(self, records: ArchivedRecords, records_per_group: int,
+               n_groups: Union[int, None] = None) -> None:
+    """
+    Build an instance of the 'ArchivedGroups' class given the archived records, the number
+    of records of each group and the number of groups (all the complete ones, if not given).
+    """
+    self.records: ArchivedRecords = records
+    self.dtype: np.dtype = records.dtype
+    # Get the number of complete groups, limited to the given one
+    n_complete = records.shape[0] // records_per_group
+    n_groups = n_complete if n_groups is None else min(n_groups, n_complete)
+    # Store the shape of the 3D array
+    self.shape: Tuple[int, int, int] = (n_groups, records_per_group, records.shape[1])
+    self.ndim: int = 3
+
+  def __len__(self) -> int:
+    return self.shape[0]
+
+  def __getitem__(self, key: Any) -> NDArray:
+    """
+    Method that returns a copy of the selected values as an array. The records of every
+    combination of the selected groups and records of each group are read from the archive
+    into a 3D array, that the selection is then applied to, with the groups and records
+    indices converted into positions within it, so that the NumPy indexing rules hold.
+    """
+    # Separate the groups, the records and the columns selections
+    key = key if isinstance(key, tuple) else (key,)
+    (groups, members) = (key + (slice(None), slice(None)))[:2]
+    # Get the selected groups and records of each group, and their positions among them
+    (g, groups) = self._selection(groups, self.shape[0])
+    (m, members) = self._selection(members, self.shape[1])
+    # Read the records of every combination of the selected groups and records
+    records = self.records[np.add.outer(g * self.shape[1], m).ravel()].reshape(
+      g.size, m.size, self.shape[2])
+    # Apply the selection to the read records
+    return records[(groups, members) + key[2:]]
+
+  @staticmethod
+  def _selection(key: Any, size: int) -> Tuple[NDArray[np.int64], Any]:
+    """
+    Method that converts the given selection (index, slice or array of indices or booleans)
+    along a dimension of the given size into the array of the distinct selected indices and
+    the equivalent selection of the positions within this array.
+    """
+    # Get the selected indices, checking they are in the valid range
+    indices = np.arange(size)[key]
+    # A slice selects all the indices, in the order given
+    if isinstance(key, slice):
+      return (indices, slice(None))
+    # An index selects the only one given
+    if np.ndim(indices) == 0:
+      return (np.array([indices]), 0)
+    # An array selects the distinct indices, through the position of each index
+    (distinct, inverse) = np.unique(indices, return_inverse=True)
+    return (distinct, inverse.reshape(indices.shape))
+
+  def __array__(self, dtype: Union[type, None] = None, copy: Union[bool, None] = None) -> NDArray:
+    return self[:] if dtype is None else self[:].astype(dtype)
+
+
+def write_da_archive(da_path: str, archive_path: Union[str, None] = None, codec: str = 'zlib',
+                     block_bytes: int = DEFAULT_ARCHIVE_BLOCK_BYTES) -> str:
+  """
+  Function that writes the block-compressed archive of the given direct-access file, by
+  compressing it block by block with the given method ('zlib' or 'lzma'). By default, the
+  archive is written next to the file, with the '.tuz' extension appended to its name.
+  The archive is first written to a temporary file, so that partially written archives
+  are never found. The function returns the path to the archive.
+  """
+  # Check the compression method and the block size
+  if codec not in DaArchive.CODECS:
+    raise Exception("Error: unknown compression method '" + codec + "'.")
+  if block_bytes < 1:
+    raise Exception("Error: the size of the archive blocks must be positive.")
+  (codec_id, compress, _) = DaArchive.CODECS[codec]
+  # Build the path to the archive, if not given
+  archive_path = archive_path or da_path + ARCHIVE_EXTENSION
+  tmp_path = archive_path + '.tmp'
+
+  # Get the direct-access file size
+  data_nbytes = os.path.getsize(da_path)
+  with open(da_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+    # Leave room for the header, written once the blocks index is known
+    dst.write(b'\x00' * DaArchive.HEADER.size)
+    # Compress the file block by block, storing the position of each block
+    offsets = list()
+    while True:
+      block = src.read(block_bytes)
+      if not block: break
+      offsets.append(dst.tell())
+      dst.write(compress(block))
+    # Write the blocks index, including the position of the index itself
+    index_offset = dst.tell()
+    offsets.append(index_offset)
+    dst.write(np.array(offsets, dtype='<u8').tobytes())
+    # Write the header
+    dst.seek(0)
+    dst.write(DaArchive.HEADER.pack(DaArchive.MAGIC, codec_id, block_bytes, data_nbytes,
+                                    len(offsets) - 1, index_offset))
+  # Move the archive to its final path
+  os.replace(tmp_path, archive_path)
+  # Return the archive path
+  return archive_path
+
+
+def resolve_da_path(da_path: str) -> str:
+  """
+  Function that returns the path to the given direct-access file, if present, otherwise
+  the one to its block-compressed archive, if present. If none is present, the given path
+  is returned unchanged.
+  """
+  if not os.path.isfile(da_path) and os.path.isfile(da_path + ARCHIVE_EXTENSION):
+    return da_path + ARCHIVE_EXTENSION
+  return da_path
+
 
 class DaReader(ABC):
   """
@@ -546,24 +973,37 @@ class DaReader(ABC):
   by the TU simulation.
   It provides methods to be overridden by its subclasses.
   """
-  def __init__(self, da_path: str, extension: str) -> None:
+  def __init__(self, da_path: str, extension: str, memory_map: bool = False) -> None:
     """
     Build an instance of the 'DaReader' class. It receives as parameter the path to the
     direct-access file to read and checks its actual existence.
+    If the 'memory_map' flag is set, the file content is memory-mapped instead of being
+    read into RAM, so that only the pages actually accessed are loaded from disk.
     """
+    # Get the path to the block-compressed archive of the file, if the latter is missing
+    da_path = resolve_da_path(da_path)
     # Check the direct-access file existence
     check_file_existence(da_path, extension)
     # Store the direct-access file path
     self.da_path: str = da_path
+    # Open the archive, if the file is stored as a block-compressed archive
+    self.archive: Union[DaArchive, None] = \
+      DaArchive(da_path) if da_path.endswith(ARCHIVE_EXTENSION) else None
+    # Store the flag stating if the file content is memory-mapped instead of read
+    self.memory_map: bool = memory_map
+    # Initialize the columnar copy of the file content, as (column, record) array
+    self.column_store: Union[NDArray, None] = None
     # Initialize the time values read from the direct-access file
-    self.time_h: List[int] = list()
-    self.time_s: List[int] = list()
-    self.time_ms : List[int] = list()
+    self.time_h: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+    self.time_s: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+    self.time_ms: NDArray[np.float32] = np.empty(0, dtype=np.float32)
     # Call the ABC constructor
     super().__init__()
 
   @abstractmethod
-  def extract_time_hsms(self, record_length: int) -> Tuple[List[int], List[int], List[int]]:
+  def extract_time_hsms(self, record_length: int) -> Tuple[NDArray[np.int64],
+                                                         NDArray[np.int64],
+                                                         NDArray]:
     """
     Method that extracts from the direct-access file the simulation time instants
     as arrays for hours, seconds and milliseconds respectively. These arrays are
@@ -581,6 +1021,215 @@ class DaReader(ABC):
     proposed is not valid (case of a .sta file).
     """
 
+  @property
+  def dtype(self) -> type:
+    """
+    Type of the values stored in the direct-access file.
+    """
+    return np.float32
+
+  @property
+  def records_per_time(self) -> int:
+    """
+    Number of records written in the file for each time instant.
+    """
+    return 1
+
+  def attach_column_store(self, column_store: NDArray) -> None:
+    """
+    Method that attaches to this reader a columnar copy of the file content, given as a
+    (column, record) array (usually memory-mapped from a sidecar file). From then on, the
+    time values and the record columns are read from this copy, where the values of each
+    column are contiguous.
+    """
+    self.column_store = column_store
+
+  def check_layout(self, record_length: int, declared_records: int = 0,
+                   records_per_time: Union[int, None] = None) -> Tuple[List[str], List[str]]:
+    """
+    Method that checks the direct-access file agrees with the given record length, with
+    the number of records written for each time instant (the reader one, if not given)
+    and, if not 0, with the declared number of records.
+    Only the complete time instants are validated: a partially written trailing record or
+    time instant, as well as fewer records than the declared ones, are expected while the
+    TU simulation is still running, hence they are reported as warnings only. However, a
+    file size that is not a multiple of the record length is reported as a problem when
+    the time values or the number of records do not agree with the record length either.
+    Besides the file size, only the time values of the first two and of the last time
+    instants are read, hence the check is a heuristic: a wrong record length giving valid
+    and ordered time values at these positions, e.g. with zero-padded records, can only be
+    detected by the file size, as a warning if fewer records than the declared ones result.
+    The method returns a tuple made of the list of the problems found and of the list of
+    the warnings, both described as strings, the former being empty if the layout is valid.
+    """
+    # Get the file name, the size of a record and the number of records per time instant
+    name = os.path.basename(self.da_path)
+    if record_length <= 0:
+      return ([f"the record length of the '{name}' file must be positive ({record_length})"], [])
+    record_bytes = record_length * np.dtype(self.dtype).itemsize
+    records_per_time = records_per_time or self.records_per_time
+    # Get the number of complete records and the size of any trailing incomplete one
+    (n_records, trailing) = divmod(self._data_nbytes(), record_bytes)
+
+    (problems, warnings) = (list(), list())
+    # Check the time values of the first and last complete time instants, that are not
+    # valid if the record length or the number of records per time instant is wrong
+    problems += self._check_time_records(record_length, records_per_time)
+    # Report any partially written trailing record, as a problem if the time values or the
+    # number of records do not agree with the record length either
+    too_many = bool(declared_records) and n_records > declared_records
+    if trailing and (problems or too_many):
+      problems.append(f"the size of the '{name}' file is not a multiple of the record length "
+                      f"({record_bytes} bytes): the record length is wrong")
+    elif trailing:
+      warnings.append(f"the '{name}' file ends with an incomplete record ({trailing} of "
+                      f"{record_bytes} bytes), that is ignored")
+    # Report any partially written trailing time instant
+    if n_records % records_per_time:
+      warnings.append(f"the last time instant of the '{name}' file holds "
+                      f"{n_records % records_per_time} of the {records_per_time} records "
+                      "written for each time instant, hence it is ignored")
+    # Check the number of records is the declared one, if any
+    if too_many:
+      problems.append(f"the '{name}' file holds {n_records} records instead of the "
+                      f"{declared_records} declared ones")
+    elif declared_records and n_records < declared_records:
+      warnings.append(f"the '{name}' file holds {n_records} of the {declared_records} "
+                      "declared records: the simulation is still running or the file is "
+                      "truncated")
+    # Return the problems and the warnings found
+    return (problems, warnings)
+
+  def _check_time_records(self, record_length: int, records_per_time: int) -> List[str]:
+    """
+    Method that checks the time values (hours, seconds, milliseconds) of the first record
+    of the first two and of the last complete time instants of the direct-access file are
+    valid, i.e. they are finite and not negative, with integer hours and seconds, and that
+    they are in ascending order (except for the .sta file). As the time values are read at the wrong position
+    whenever the record length is wrong, this check detects most of the wrong record
+    lengths without relying on the file size.
+    The method returns the list of the problems found, described as strings.
+    """
+    # Read the time values of the first record of the first two and of the last complete
+    # time instants
+    n_times = self._complete_records(record_length, records_per_time) // records_per_time
+    rows = sorted({i * records_per_time for i in (0, 1, n_times - 1) if 0 <= i < n_times})
+    times = np.array(self._map_records(record_length)[rows, 0:3], dtype=np.float64) \
+      if rows else np.empty((0, 3))
+    # Check the time values are valid and, apart from the .sta file datasets, whose times
+    # are chosen by users, ordered
+    seconds = times[:, 0] * 3600 + times[:, 1] + times[:, 2] / 1000
+    unordered = not isinstance(self, StaReader) and np.any(np.diff(seconds) < 0)
+    if not np.all(np.isfinite(times)) or np.any(times < 0) or \
+       np.any(times[:, 0:2] != np.floor(times[:, 0:2])) or unordered:
+      return [f"the time values of the '{os.path.basename(self.da_path)}' file records are "
+              f"not valid: the record length ({record_length}) is wrong"]
+    return []
+
+  def _complete_records(self, record_length: int, records_per_time: Union[int, None] = None) -> int:
+    """
+    Method that returns the number of records of the complete time instants stored in the
+    direct-access file, given the record length and the number of records written for each
+    time instant (the reader one, if not given). Any partially written trailing record or
+    time instant is ignored.
+    """
+    records_per_time = records_per_time or self.records_per_time
+    time_bytes = record_length * np.dtype(self.dtype).itemsize * records_per_time
+    return self._data_nbytes() // time_bytes * records_per_time
+
+  def iter_records(self, record_length: int, block_size: int = DEFAULT_BLOCK_SIZE,
+                   time_range: Union[Tuple[int, int], None] = None,
+                   columns: Union[Sequence[int], None] = None) -> Iterator[Tuple[int, NDArray]]:
+    """
+    Generator that scans the records of the direct-access file by blocks of at most
+    'block_size' time instants, so that the whole file can be processed with a bounded
+    amount of memory. The scan can be limited to the range of time indices given by
+    'time_range' as (start, stop), with 'stop' excluded, and to the record columns
+    whose indices are given by 'columns'.
+    For each block, it yields a tuple made of the index of the first time instant of
+    the block and of the 2D array of its records (all the records of each time instant
+    are included).
+    """
+    # Check the block size is valid
+    if block_size < 1:
+      raise Exception("Error: the block size must be a positive number of time instants.")
+    # Get the view of the file records and the number of records per time instant
+    records = self._map_records(record_length)
+    n_rec = self.records_per_time
+    # Get the range of the time indices to scan, by default all the complete time instants
+    n_times = records.shape[0] // n_rec
+    (start, stop, _) = slice(*time_range).indices(n_times) if time_range else (0, n_times, 1)
+    # Loop over the blocks of time instants
+    for first in range(start, stop, block_size):
+      # Get the view of the records of the current block
+      block = records[first * n_rec:min(first + block_size, stop) * n_rec]
+      # Yield the block records, copied out of the file view
+      yield (first, np.array(block if columns is None else block[:, columns]))
+
+  def _map_records(self, record_length: int, dtype: Union[type, None] = None) -> NDArray:
+    """
+    Method that maps the content of the direct-access file into memory without reading it.
+    Given the record length, a read-only 2D view of the file is built having the records
+    as rows and the values of each record as columns. Only the pages actually accessed
+    through the returned view are read from disk.
+    If not given, the type of the values is the one of the file.
+    Any trailing incomplete record is not included in the view.
+    """
+    # Use the type of the file values, if not specified
+    dtype = dtype or self.dtype
+    # Read the records from the archive, if the file is stored as such
+    if self.archive is not None:
+      return ArchivedRecords(self.archive, record_length, dtype)
+    # Get the number of complete records stored in the file
+    n_records = self._data_nbytes() // (record_length * np.dtype(dtype).itemsize)
+    # An empty file cannot be mapped: return an empty 2D array instead
+    if n_records == 0:
+      return np.empty((0, record_length), dtype=dtype)
+    # Map the file content as a 2D array of records
+    return np.memmap(self.da_path, dtype=dtype, mode='r', shape=(n_records, record_length))
+
+  def _data_nbytes(self) -> int:
+    """
+    Method that returns the size, in bytes, of the direct-access file content (the one of
+    the original file, if stored as an archive).
+    """
+    return self.archive.data_nbytes if self.archive is not None else os.path.getsize(self.da_path)
+
+  def _read_bytes(self, offset: int, nbytes: int) -> bytes:
+    """
+    Method that reads the given range of bytes of the direct-access file content, without
+    accessing any other part of the file (or decompressing any other archive block).
+    """
+    if self.archive is not None:
+      return self.archive.read(offset, nbytes)
+    # Open the file, move to the given position and read the requested bytes only
+    with open(self.da_path, 'rb') as f:
+      f.seek(offset)
+      return f.read(nbytes)
+
+  def _read_time_columns(self, record_length: int, step: int = 1,
+                         dtype: Union[type, None] = None, start: int = 0,
+                         stop: Union[int, None] = None) -> Tuple[NDArray[np.int64],
+                                                                 NDArray[np.int64],
+                                                                 NDArray]:
+    """
+    Method that extracts the time instants from the direct-access file by reading the
+    first three values (hours, seconds, milliseconds) of every 'step'-th record only,
+    in the range of records given by 'start' and 'stop'.
+    The file is accessed through a memory-mapped view, hence the remaining values of
+    each record are never read into memory.
+    The hours and seconds are returned as integer arrays, the milliseconds as an array
+    with the same type of the file values, if no other type is given.
+    """
+    # Copy the first three columns of the selected records out of the columnar copy of
+    # the file content, if attached, or out of the file view
+    if self.column_store is not None:
+      times = np.array(self.column_store[0:3, start:stop:step].T, dtype=dtype or self.dtype)
+    else:
+      times = np.array(self._map_records(record_length, dtype)[start:stop:step, 0:3])
+    # Return the arrays of hours, seconds (both as integers) and milliseconds
+    return (times[:, 0].astype(np.int64), times[:, 1].astype(np.int64), times[:, 2])
+
 
 class MicReader(DaReader):
   """
@@ -588,30 +1237,140 @@ class MicReader(DaReader):
   For every micro-step (TU internal step) several quantities are stored, that are
   section/slice dependent variables and special quantities.
   """
-  def __init__(self, mic_path: str) -> None:
+  def __init__(self, mic_path: str, memory_map: bool = False) -> None:
     """
     Build an instance of the 'MicReader' class that interprets the content of the .mic
     file produced by the TU simulation.
     It receives as parameter the path to the .mic file to read and checks the actual
-    existence of the file.
+    existence of the file. The 'memory_map' flag states if the file content is
+    memory-mapped instead of being read into RAM.
     """
-    # Store the file extension
-    self.extension = 'mic'
+    # Store the file extension, if not already set by a subclass
+    if not hasattr(self, 'extension'):
+      self.extension = 'mic'
     # Call the superclass constructor
-    super().__init__(mic_path, self.extension)
+    super().__init__(mic_path, self.extension, memory_map)
+
+  def follow_time_hsms(self, record_length: int) -> int:
+    """
+    Method that extends the extracted time instants with the ones of the complete records
+    appended to the direct-access file since the last extraction, as it happens while the
+    TU simulation is still running. Any partially written trailing record (or set of
+    records, if more than one is written per time instant) is ignored until complete.
+    Only the time values of the new records are read from the file, while the already
+    extracted ones are kept.
+    The method returns the number of new time instants.
+    """
+    # Get the number of time instants fully written in the file
+    time_bytes = record_length * np.dtype(self.dtype).itemsize * self.records_per_time
+    n_times = self._data_nbytes() // time_bytes
+    # Get the number of the already extracted time instants
+    n_read = self.time_h.size
+    # Return immediately if no new complete time instant has been written
+    if n_times <= n_read: return 0
+    # Detach the columnar copy of the file content, if any, as it does not include the
+    # new records
+    self.column_store = None
+
+    # Extract the time values of the first record of each new time instant
+    (h, s, ms) = self._read_time_columns(
+      record_length, step=self.records_per_time, start=n_read * self.records_per_time,
+      stop=n_times * self.records_per_time)
+    # Append the new time values to the already extracted ones
+    self.time_h = np.concatenate((self.time_h, h))
+    self.time_s = np.concatenate((self.time_s, s))
+    self.time_ms = np.concatenate((self.time_ms, ms))
+    # Return the number of new time instants
+    return n_times - n_read
+
+  def read_columns(self, indices: Sequence[int], record_length: int,
+                   time_range: Union[Tuple[int, int], None] = None) -> NDArray[np.float32]:
+    """
+    Method that extracts from the direct-access file the values of the record columns
+    whose indices are given, for all the time instants or for the ones in the range of
+    time indices given by 'time_range' as (start, stop), with 'stop' excluded.
+    It returns a 2D array with a row for each requested column, where the values of each
+    column for the selected times are contiguous in memory.
+    Only the requested columns are copied out of the memory-mapped view of the file.
+    """
+    # Extract the requested columns as a contiguous (column, record) array
+    return self._read_column_rows(indices, record_length, time_range)
 
-  def extract_time_hsms(self, record_length: int) -> Tuple[List[int], List[int], List[int]]:
+  def read_columns_at(self, indices: Sequence[int], record_length: int,
+                      time_indices: Sequence[int]) -> NDArray[np.float32]:
+    """
+    Method that extracts from the direct-access file the values of the record columns
+    whose indices are given, for the time instants whose indices are given, in the order
+    given. It returns a 2D array shaped as the one of the 'read_columns' method.
+    Only the records of the given time instants are read, so that widely spaced times do
+    not need reading all the records in between.
+    """
+    return self._read_column_rows(indices, record_length, time_indices=time_indices)
+
+  def publish_columns(self, indices: Sequence[int], record_length: int,
+                      time_range: Union[Tuple[int, int], None] = None) -> Tuple[
+                        'SharedArrayDescriptor', shared_memory.SharedMemory]:
+    """
+    Method that extracts the values of the given record columns, as the 'read_columns'
+    method does, and publishes them into a shared memory block, so that other processes
+    can access them without reading the file again or copying them.
+    It returns the descriptor of the published array, to be passed to the other processes,
+    and the shared memory block, to be closed and unlinked once no more needed.
+    """
+    return publish_array(self.read_columns(indices, record_length, time_range))
+
+  def _read_column_rows(self, indices: Sequence[int], record_length: int,
+                        time_range: Union[Tuple[int, int], None] = None,
+                        time_indices: Union[Sequence[int], None] = None) -> NDArray[np.float32]:
+    """
+    Method that copies the requested columns of the records of the time instants in the
+    given range, or of the ones whose indices are given, out of the memory-mapped view of
+    the direct-access file or, if attached, of the columnar copy of its content.
+    It returns a contiguous 2D array having, as rows, the requested columns and, as
+    columns, the selected records. Any trailing incomplete time instant is not considered.
+    """
+    # Get the column indices as an array
+    indices = np.asarray(indices, dtype=np.int64)
+    # Get the number of records, either from the columnar copy or from the file view
+    if self.column_store is not None:
+      n_records = self.column_store.shape[1]
+    else:
+      records = self._map_records(record_length)
+      n_records = records.shape[0]
+    # Get the range of the time indices to read, by default all the complete time instants
+    n_times = n_records // self.records_per_time
+    # Copy the requested columns of the records of the given time instants only, if any
+    if time_indices is not None:
+      time_indices = np.asarray(time_indices, dtype=np.int64)
+      if np.any((time_indices < 0) | (time_indices >= n_times)):
+        raise Exception("Error: a time index is out of range.")
+      rows = (time_indices[:, None] * self.records_per_time +
+              np.arange(self.records_per_time)).ravel()
+      if self.column_store is not None:
+        return np.ascontiguousarray(self.column_store[np.ix_(indices, rows)])
+      return np.ascontiguousarray(records[np.ix_(rows, indices)].T)
+    (start, stop, _) = slice(*time_range).indices(n_times) if time_range else (0, n_times, 1)
+    (first, last) = (start * self.records_per_time, stop * self.records_per_time)
+
+    # Copy the requested columns directly from the columnar copy, if attached
+    if self.column_store is not None:
+      return np.ascontiguousarray(self.column_store[indices, first:last])
+    # Copy the requested columns of the records of the selected time instants, and
+    # transpose them
+    return np.ascontiguousarray(records[first:last, indices].T)
+
+  def extract_time_hsms(self, record_length: int) -> Tuple[NDArray[np.int64],
+                                                         NDArray[np.int64],
+                                                         NDArray[np.float32]]:
     """
     Method that extracts from the direct-access file the simulation time instants
     as arrays for hours, seconds and milliseconds respectively. These arrays are
     saved as instance attributes and returned as a tuple.
+    Only the time values of each record are read from the file.
     """
-    da_data = self.read_tu_data(record_length)
     # Build the time arrays by extracting the values for hours, seconds (both as integers)
     # and milliseconds
-    self.time_h = [int(h) for h in da_data[::, 0]]
-    self.time_s = [int(s) for s in da_data[::, 1]]
-    self.time_ms = da_data[::, 2]
+    (self.time_h, self.time_s, self.time_ms) = self._read_time_columns(record_length)
     # Return the tuple of times
     return (self.time_h, self.time_s, self.time_ms)
 
@@ -624,12 +1383,23 @@ class MicReader(DaReader):
     Subclasses can override this method providing their own implementation in case the one
     proposed is not valid (case of a .sta file).
     """
+    # Check the file layout agrees with the record length, before reading it
+    (problems, _) = self.check_layout(record_length)
+    if problems:
+      raise Exception("Error: " + problems[0] + ".")
+    # Get the number of records of the complete time instants only, as any partially
+    # written trailing record is ignored until complete
+    n_records = self._complete_records(record_length)
     try:
+      # Memory-map the file content, if requested, instead of reading it
+      if self.memory_map or self.archive is not None:
+        # Return the 2D view of the file records, or the records decompressed from the archive
+        return self._map_records(record_length)[:n_records]
       with open(self.da_path, 'rb') as f:
-        # Read all the data as a 1D array of floating point values
-        data = np.fromfile(f, dtype='float32', count=-1)
+        # Read the data of the complete records as a 1D array of floating point values
+        data = np.fromfile(f, dtype='float32', count=n_records * record_length)
         # Reshape the data as a 2D array
-        data = data.reshape(int(data.size / record_length), record_length)
+        data = data.reshape(n_records, record_length)
         # Return the array
         return data
     except:
@@ -643,115 +1413,1213 @@ class MacReader(MicReader):
   the radially dependent quantities at every simulation time for every (i, j)-th element of the
   domain.
   """
-  def __init__(self, mac_path: str, n_slices: int) -> None:
+  def __init__(self, mac_path: str, n_slices: int, memory_map: bool = False) -> None:
     """
     Build an instance of the 'MacReader' class that interprets the content of the .mac
     file produced by the TU simulation.
     It receives as parameter the path to the .mac file to read and checks the actual
-    existence of the file.
+    existence of the file. The 'memory_map' flag states if the file content is
+    memory-mapped instead of being read into RAM.
     """
     # Store the file extension
     self.extension: str = 'mac'
     # Call the superclass constructor
-    super().__init__(mac_path)
+    super().__init__(mac_path, memory_map)
 
     # Store the number of slices
     self.n_slices: int = n_slices
 
-  def extract_xtime_hsms(self, record_length: int) -> Tuple[List[int], List[int], List[int]]:
+  @property
+  def records_per_time(self) -> int:
+    """
+    Number of records written in the file for each time instant, i.e. one per slice.
+    """
+    return self.n_slices
+
+  def _check_time_records(self, record_length: int, records_per_time: int) -> List[str]:
+    """
+    Method that overrides the superclass method for checking the time values of the first
+    complete time instants of the .mac file. Besides being valid, the time values of all
+    the slice records of the first time instant must be the same, which does not hold if
+    the number of slices is wrong.
+    """
+    # Check the time values of the first record of the time instants
+    problems = super()._check_time_records(record_length, records_per_time)
+    if problems or self._complete_records(record_length, records_per_time) == 0:
+      return problems
+    # Check the slice records of the first time instant share the same time values
+    times = np.array(self._map_records(record_length)[0:records_per_time, 0:3])
+    if np.any(times != times[0]):
+      return [f"the slice records of the first time instant of the "
+              f"'{os.path.basename(self.da_path)}' file do not share the same time values: "
+              f"the record length ({record_length}) or the number of slices "
+              f"({records_per_time}) is wrong"]
+    return []
+
+  def read_columns(self, indices: Sequence[int], record_length: int,
+                   time_range: Union[Tuple[int, int], None] = None) -> NDArray[np.float32]:
+    """
+    Method that overrides the superclass method for extracting the values of the given
+    record columns, for all the time instants or for the ones in the range of time
+    indices given by 'time_range' as (start, stop), with 'stop' excluded.
+    As the .mac file provides a record per slice for each time instant, it returns a 3D
+    array having as dimensions the requested columns, the times and the slices, where the
+    values of each column are contiguous in memory.
+    """
+    # Extract the requested columns as a contiguous (column, record) array
+    columns = self._read_column_rows(indices, record_length, time_range)
+    # Reshape the records by time instant and slice
+    return columns.reshape(columns.shape[0], -1, self.n_slices)
+
+  def read_columns_at(self, indices: Sequence[int], record_length: int,
+                      time_indices: Sequence[int]) -> NDArray[np.float32]:
+    """
+    Method that overrides the superclass method for extracting the values of the given
+    record columns for the given time indices only, giving a 3D array shaped as the one
+    of the 'read_columns' method.
+    """
+    # Extract the requested columns as a contiguous (column, record) array
+    columns = self._read_column_rows(indices, record_length, time_indices=time_indices)
+    # Reshape the records by time instant and slice
+    return columns.reshape(columns.shape[0], -1, self.n_slices)
+
+  def cube(self, record_length: int) -> 'MacCube':
+    """
+    Method that provides the content of the .mac file as a labelled 3D view having, as
+    dimensions, the time instants, the slices and the record columns, without copying it
+    (if the file is stored as an archive, only the selected records are decompressed).
+    The macro step times are extracted from the file, if not done already.
+    """
+    # Extract the time instants, if needed
+    if self.time_h.size == 0:
+      self.extract_xtime_hsms(record_length)
+    # Reshape the columnar copy of the file content, if attached, or the file view
+    if self.column_store is not None:
+      n_times = self.column_store.shape[1] // self.n_slices
+      data = self.column_store[:, :n_times * self.n_slices].reshape(
+        record_length, n_times, self.n_slices).transpose(1, 2, 0)
+    elif self.archive is not None:
+      # Group the archived records by time instant, limited to the extracted time instants,
+      # so that only the selected records are decompressed
+      data = self._map_records(record_length).grouped(self.n_slices, self.time_h.size)
+      n_times = data.shape[0]
+    else:
+      # Get the view of the file records
+      records = self._map_records(record_length)
+      n_times = records.shape[0] // self.n_slices
+      data = records[:n_times * self.n_slices].reshape(n_times, self.n_slices, record_length)
+    # Build the labelled view over the time instants present in both the data and the times
+    n_times = min(n_times, self.time_h.size)
+    return MacCube(data if n_times == data.shape[0] else data[:n_times], TimeIndex(
+      self.time_h[:n_times], self.time_s[:n_times], self.time_ms[:n_times]))
+
+  def extract_xtime_hsms(self, record_length: int) -> Tuple[NDArray[np.int64],
+                                                          NDArray[np.int64],
+                                                          NDArray[np.float32]]:
     """
     Method that extracts from the .mac file the simulation time instants as arrays
     for hours, seconds and milliseconds respectively. These values are provided
-    for each slice, hence the extracted arrays are filtered every n-slices values,
-    saved as instance attributes and returned as a tuple.
+    for each slice, hence only the time values of every n-slices record are read.
+    The extracted arrays are saved as instance attributes and returned as a tuple.
     """
-    # Extract all the occurrences of the times
-    (h, s, ms) = self.extract_time_hsms(record_length)
-    # Filter the time values every n-slices and store their values
-    self.time_h = h[::self.n_slices]
-    self.time_s = s[::self.n_slices]
-    self.time_ms = ms[::self.n_slices]
+    # Extract the time values of the first slice record of every time instant
+    (self.time_h, self.time_s, self.time_ms) = self._read_time_columns(
+      record_length, step=self.n_slices)
 
     # Return the tuple of times
     return (self.time_h, self.time_s, self.time_ms)
 
 
+class MacCube():
+  """
+  Class that presents the content of a .mac file as a 3D array having, as dimensions, the
+  time instants, the slices and the record columns, with lookups of the time instants by
+  index or "h s ms" string and of the slices by number (starting from 1).
+  The array is a view of the file content, hence selecting a radial profile (all the
+  columns of a time and slice), an axial profile (a column over all the slices at a time)
+  or a time history (a column of a slice over all the times) is a single indexing
+  operation that reads the selected values only.
+  """
+  def __init__(self, data: NDArray, times: 'TimeIndex') -> None:
+    """
+    Build an instance of the 'MacCube' class given the 3D array of the values and the
+    index of its time instants.
+    """
+    # Check the array and the times agree
+    if data.ndim != 3 or data.shape[0] != len(times):
+      raise Exception("Error: the .mac data must be a 3D array with an entry per time instant.")
+    # Store the array of the values and the index of its time instants
+    self.data: NDArray = data
+    self.times: 'TimeIndex' = times
+
+  @property
+  def shape(self) -> Tuple[int, int, int]:
+    """
+    Number of time instants, slices and record columns.
+    """
+    return self.data.shape
+
+  def __getitem__(self, key: Any) -> NDArray:
+    return self.data[key]
+
+  def time_index(self, time: Union[int, str]) -> int:
+    """
+    Method that returns the index of the given time instant, given either as an index or
+    as a "h s ms" string.
+    """
+    if isinstance(time, str):
+      return self.times.locate(time)
+    # Check the index is in the valid range
+    if not -len(self.times) <= time < len(self.times):
+      raise Exception(f"Error: the time index {time} is out of range.")
+    return int(time)
+
+  def slice_index(self, slice_number: int) -> int:
+    """
+    Method that returns the index along the slices dimension of the given slice number,
+    starting from 1.
+    """
+    if not 1 <= slice_number <= self.data.shape[1]:
+      raise Exception(f"Error: the slice number {slice_number} is out of range.")
+    return slice_number - 1
+
+  def radial_profile(self, time: Union[int, str], slice_number: int,
+                     columns: Union[Sequence[int], slice] = slice(None)) -> NDArray:
+    """
+    Method that returns the values of the given record columns (all, by default) for the
+    given time instant and slice number.
+    """
+    return self.data[self.time_index(time), self.slice_index(slice_number), columns]
+
+  def axial_profile(self, time: Union[int, str],
+                    columns: Union[int, Sequence[int], slice]) -> NDArray:
+    """
+    Method that returns the values of the given record columns at the given time instant
+    for all the slices, as an array having the slices as first dimension.
+    """
+    return self.data[self.time_index(time), :, columns]
+
+  def history(self, slice_number: int, columns: Union[int, Sequence[int], slice],
+              time_range: Union[Tuple[int, int], None] = None) -> NDArray:
+    """
+    Method that returns the values of the given record columns of the given slice number
+    for all the time instants or for the ones in the range of time indices given by
+    'time_range' as (start, stop), with 'stop' excluded, as an array having the time
+    instants as first dimension.
+    """
+    times = slice(*time_range) if time_range else slice(None)
+    return self.data[times, self.slice_index(slice_number), columns]
+
+  def select(self, times: Sequence[Union[int, str]], slice_numbers: Sequence[int],
+             columns: Sequence[int]) -> NDArray:
+    """
+    Method that returns the values of the given record columns for every combination of
+    the given time instants (as indices or "h s ms" strings) and slice numbers, gathered
+    by a single indexing operation into a (time, slice, column) array.
+    """
+    return self.data[np.ix_([self.time_index(t) for t in times],
+                            [self.slice_index(s) for s in slice_numbers],
+                            np.asarray(columns, dtype=np.int64))]
+
+
 class StaReader(DaReader):
   """
   Class that interprets the content of the .sta file produced by the TU simulation.
   For every time step (choosen by users) several quantities are stored.
+  The data is kept with the same type it has on disk (4 or 8 byte values) and can be
+  accessed randomly by dataset, or by time instant, and axial section.
   """
-  def __init__(self, sta_path: str, ibyte: int) -> None:
+  def __init__(self, sta_path: str, ibyte: int, memory_map: bool = False) -> None:
     """
-    Build an instance of the 'MicReader' class that interprets the content of the .mic
+    Build an instance of the 'StaReader' class that interprets the content of the .sta
     file produced by the TU simulation.
-    It receives as parameter the path to the .mic file to read and checks the actual
-    existence of the file.
+    It receives as parameter the path to the .sta file to read and checks the actual
+    existence of the file. The 'memory_map' flag states if the file content is
+    memory-mapped instead of being read into RAM.
     """
     # Call the superclass constructor
-    super().__init__(sta_path, 'sta')
+    super().__init__(sta_path, 'sta', memory_map)
 
     # Store the ibyte value
     self.ibyte: int = ibyte
+    # Initialize the indices of the first dataset of each distinct time instant
+    self.time_datasets: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+    # Initialize the index of the distinct time instant of each dataset
+    self.dataset_times: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+
+  @property
+  def dtype(self) -> type:
+    """
+    Type of the values stored in the .sta file, given the ibyte value.
+    """
+    # Handle the case the data is stored as 4 or 8 byte values
+    if self.ibyte == 4:
+      return np.float32
+    elif self.ibyte == 8:
+      return np.float64
+    raise Exception("The byte length of data in the '.sta' and '.sti' binary files "
+                    "needs to be 4 or 8.")
 
   def extract_time_hsms(self, record_length: int, axial_steps: int,
-                        sta_dataset_length: int) -> Tuple[List[int], List[int], List[int]]:
+                        sta_dataset_length: int) -> Tuple[NDArray[np.int64],
+                                                          NDArray[np.int64],
+                                                          NDArray]:
     """
     Method that overrides the superclass method for extracting the time steps from a generic
     direct-access file.
     This provides an implementation specific to the case of a .sta file for getting the time
     steps as arrays for hours, seconds and milliseconds respectively.
     These arrays are saved as instance attributes and returned as a tuple.
+    Only the time values of the first record of each dataset are read from the file.
     """
-    # Extract an array of all the data stored in the .sta file
-    sta_data = self.read_tu_data(record_length, axial_steps, sta_dataset_length)
-    # Get all the values of the time
-    all_times = np.array(sta_data[:, 0, 0:3]).tolist()
-    # Filter out any time duplicate
-    list_of_times = list()
-    for t in all_times:
-      if t not in list_of_times:
-        list_of_times.append(t)
+    # Get the time values of the first record of the datasets stored in the .sta file,
+    # limited to the declared ones
+    x_dim = int(sta_dataset_length / (axial_steps + 1))
+    sta_times = np.array(self._map_datasets(record_length, axial_steps)[:x_dim, 0, 0:3])
+    # Filter out any time duplicate, while keeping the index of the first dataset where
+    # each time instant appears and the index of the time instant of each dataset
+    (times, self.time_datasets, self.dataset_times) = unique_time_instants(sta_times)
 
     # Build the time arrays by extracting the values for hours, seconds (both as integers)
     # and milliseconds
-    self.time_h = [int(h[0]) for h in list_of_times]
-    self.time_s = [int(s[1]) for s in list_of_times]
-    self.time_ms = [ms[2] for ms in list_of_times]
+    self.time_h = times[:, 0].astype(np.int64)
+    self.time_s = times[:, 1].astype(np.int64)
+    self.time_ms = times[:, 2]
     # Return the tuple of times
     return (self.time_h, self.time_s, self.time_ms)
 
   def read_tu_data(self, record_length: int, axial_steps: int,
-                   sta_dataset_length: int) -> NDArray[np.float32]:
+                   sta_dataset_length: int) -> NDArray:
     """
     Method that overrides the superclass method for extracting the content of a generic
     direct-access file.
     This provides an implementation specific to the case of a .sta file for re-elaborating
     its content, originally stored as a one-line array. Given the dimensions provided as
-    input, the array is re-shaped as a 3D one.
+    input, the array is re-shaped as a 3D one, keeping the type of the values on disk.
+    If the memory-mapped mode is active, the returned array is a view of the file.
     """
+    # Check the file layout agrees with the datasets size, before reading it
+    (problems, _) = self.check_layout(record_length, sta_dataset_length, axial_steps + 1)
+    if problems:
+      raise Exception("Error: " + problems[0] + ".")
+    # Determine the length of the X dimension of the reshaped array, i.e. the number of the
+    # declared datasets that are complete, as any partially written trailing one is ignored
+    x_dim = min(int(sta_dataset_length / (axial_steps + 1)),
+                self._complete_records(record_length, axial_steps + 1) // (axial_steps + 1))
     try:
-      # Open the file for reading
-      with open(self.da_path, 'rb') as f:
-        # Handle the case the data is stored as 4 or 8 byte values
-        if self.ibyte == 4:
-          sta_data1 = np.fromfile(f, dtype=np.float32, count=-1)
-          sta_data = np.array(sta_data1, dtype=np.float64)
-        elif self.ibyte == 8:
-          sta_data = np.fromfile(f, dtype=np.float64, count=-1)
-        else:
-          error_msg = "The byte lenght of data in the '.sta' and '.sti' binary files \
-                      needs to be 4 or 8."
-          raise Exception(error_msg)
+      # Get the type of the values stored in the file
+      dtype = self.dtype
+      # Memory-map the file content, if requested, instead of reading it
+      if self.memory_map or self.archive is not None:
+        sta_data = self._map_records(record_length, dtype)[:x_dim * (axial_steps + 1)]
+      else:
+        # Open the file for reading
+        with open(self.da_path, 'rb') as f:
+          sta_data = np.fromfile(f, dtype=dtype, count=x_dim * (axial_steps + 1) * record_length)
 
-      # Determine the length of the X dimension of the reshaped array
-      x_dim = int(sta_dataset_length / (axial_steps + 1))
       # Reshape the data in the .sta file as a 3D array and return it
       return np.reshape(sta_data, (x_dim, axial_steps+1, record_length))
     except:
       error_msg = "Error while extracting the data from the '.sta' file."
       raise Exception(error_msg)
 
+  def read_dataset(self, dataset: int, axial_section: int, record_length: int,
+                   axial_steps: int) -> NDArray:
+    """
+    Method that reads from the .sta file the record of the given dataset for the given
+    axial section (index starting from 0), without accessing any other part of the file.
+    The position of the record is computed from the record length and the number of
+    axial steps.
+    """
+    # Check the requested indices are in the valid range
+    if not 0 <= axial_section <= axial_steps:
+      raise Exception(f"Error: the axial section index {axial_section} is out of range.")
+    # Get the type of the values stored in the file and their size in bytes
+    dtype = np.dtype(self.dtype)
+    # Compute the position in the file of the requested record
+    offset = (dataset * (axial_steps + 1) + axial_section) * record_length * dtype.itemsize
+    # Read the values of the record only
+    record = np.frombuffer(
+      bytearray(self._read_bytes(offset, record_length * dtype.itemsize)), dtype=dtype)
+    # Raise an exception if the record is not fully present in the file
+    if dataset < 0 or record.size != record_length:
+      raise Exception(f"Error: the dataset {dataset} is not present in the '.sta' file.")
+    # Return the read record
+    return record
+
+  def read_time_section(self, time_index: int, axial_section: int, record_length: int,
+                        axial_steps: int) -> NDArray:
+    """
+    Method that reads from the .sta file the records of all the datasets of the given
+    distinct time instant (as indexed by the extracted time arrays) for the given axial
+    section (index starting from 0).
+    It returns a 2D array with a row per dataset, where only the requested records are
+    read from the file.
+    N.B. The time instants must have been extracted beforehand.
+    """
+    # Get the indices of the datasets corresponding to the given time instant
+    datasets = np.flatnonzero(self.dataset_times == time_index)
+    # Raise an exception if no dataset is found for the requested time
+    if datasets.size == 0:
+      raise Exception(f"Error: no dataset is present for the time index {time_index}.")
+    # Check the requested axial section is in the valid range
+    if not 0 <= axial_section <= axial_steps:
+      raise Exception(f"Error: the axial section index {axial_section} is out of range.")
+    # Copy the requested records out of the file view
+    return np.array(self._map_datasets(record_length, axial_steps)[datasets, axial_section])
+
+  def read_section_columns(self, time_index: int, axial_sections: Sequence[int],
+                           columns: Sequence[int], record_length: int,
+                           axial_steps: int) -> NDArray:
+    """
+    Method that reads from the .sta file the values of the given record columns of all the
+    datasets of the given distinct time instant (as indexed by the extracted time arrays)
+    for the given axial sections (indices starting from 0).
+    It returns a 3D array having as dimensions the datasets, the axial sections and the
+    columns, gathered out of the file view by a single indexing operation.
+    N.B. The time instants must have been extracted beforehand.
+    """
+    # Get the indices of the datasets corresponding to the given time instant
+    datasets = np.flatnonzero(self.dataset_times == time_index)
+    # Raise an exception if no dataset is found for the requested time
+    if datasets.size == 0:
+      raise Exception(f"Error: no dataset is present for the time index {time_index}.")
+    # Check the requested axial sections are in the valid range
+    for axial_section in axial_sections:
+      if not 0 <= axial_section <= axial_steps:
+        raise Exception(f"Error: the axial section index {axial_section} is out of range.")
+    # Copy the requested values out of the file view
+    return self._map_datasets(record_length, axial_steps)[np.ix_(
+      datasets, np.asarray(axial_sections, dtype=np.int64), np.asarray(columns, dtype=np.int64))]
+
+  def _map_datasets(self, record_length: int, axial_steps: int) -> NDArray:
+    """
+    Method that maps the content of the .sta file into memory as a read-only 3D view
+    having, as dimensions, the datasets, the axial sections and the record values.
+    If the file is stored as an archive, only the selected records are decompressed.
+    Any trailing incomplete dataset is not included in the view.
+    """
+    # Get the view of the complete records stored in the file
+    records = self._map_records(record_length, self.dtype)
+    # Group the archived records by dataset
+    if self.archive is not None:
+      return records.grouped(axial_steps + 1)
+    # Evaluate the number of complete datasets
+    n_datasets = records.shape[0] // (axial_steps + 1)
+    # Reshape the records as a 3D view
+    return records[:n_datasets * (axial_steps + 1)].reshape(
+      (n_datasets, axial_steps + 1, record_length))
+
+
+class ChainedReader():
+  """
+  Class that presents the direct-access files of the same kind (.mic or .mac) produced by
+  a chain of restarted TU simulations as a single file, with a continuous time axis.
+  Whenever a run restarts from a time instant preceding the last one of the previous runs,
+  the overlapping time instants of the previous runs are ignored, so that the latest
+  results are always kept. No data is copied: the requested values are read from the
+  files of the runs they belong to.
+  """
+  def __init__(self, readers: Sequence[MicReader]) -> None:
+    """
+    Build an instance of the 'ChainedReader' class given the readers of the files of the
+    runs, ordered as they have been run.
+    """
+    # Check at least a reader is given
+    if not readers:
+      raise Exception("Error: no direct-access file to chain has been given.")
+    # Store the readers of the runs
+    self.readers: List[MicReader] = list(readers)
+    # Store the file extension
+    self.extension: str = self.readers[0].extension
+    # Initialize the number of time instants kept for each run and the global index of
+    # the first of them
+    self.stops: NDArray[np.int64] = np.zeros(len(self.readers), dtype=np.int64)
+    self.offsets: NDArray[np.int64] = np.zeros(len(self.readers) + 1, dtype=np.int64)
+    # Initialize the time values of the chain
+    self.time_h: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+    self.time_s: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+    self.time_ms: NDArray[np.float32] = np.empty(0, dtype=np.float32)
+
+  @property
+  def records_per_time(self) -> int:
+    """
+    Number of records written in the files for each time instant.
+    """
+    return self.readers[0].records_per_time
+
+  def extract_time_hsms(self, record_length: int) -> Tuple[NDArray[np.int64],
+                                                         NDArray[np.int64],
+                                                         NDArray]:
+    """
+    Method that extracts the time instants of the files of all the runs and joins them
+    into a single time axis, after dropping, for every run, the time instants that are
+    not earlier than the first one of any following run.
+    The joined arrays of hours, seconds and milliseconds are saved as instance attributes
+    and returned as a tuple.
+    """
+    # Extract the time instants of every run
+    for reader in self.readers:
+      if isinstance(reader, MacReader):
+        reader.extract_xtime_hsms(record_length)
+      else:
+        reader.extract_time_hsms(record_length)
+    # Loop backwards over the runs to find the time instants each one keeps, i.e. the
+    # ones preceding the first time instant of all the following runs
+    restart = np.inf
+    for (i, reader) in reversed(list(enumerate(self.readers))):
+      seconds = TimeIndex.init_TimeIndex_from_reader(reader).seconds
+      # Find by binary search the first time instant overlapping the following runs
+      self.stops[i] = np.searchsorted(seconds, restart, side='left')
+      if seconds.size:
+        restart = min(restart, seconds[0])
+    # Get the global index of the first time instant of every run
+    self.offsets[1:] = np.cumsum(self.stops)
+
+    # Join the kept time instants of all the runs
+    self.time_h = np.concatenate([r.time_h[:n] for (r, n) in zip(self.readers, self.stops)])
+    self.time_s = np.concatenate([r.time_s[:n] for (r, n) in zip(self.readers, self.stops)])
+    self.time_ms = np.concatenate([r.time_ms[:n] for (r, n) in zip(self.readers, self.stops)])
+    # Return the tuple of times
+    return (self.time_h, self.time_s, self.time_ms)
+
+  def read_columns(self, indices: Sequence[int], record_length: int,
+                   time_range: Union[Tuple[int, int], None] = None) -> NDArray[np.float32]:
+    """
+    Method that extracts the values of the record columns whose indices are given, for
+    all the time instants of the chain or for the ones in the range of global time
+    indices given by 'time_range' as (start, stop), with 'stop' excluded.
+    The values are read from the files of the runs the selected time instants belong to
+    and joined along the time dimension, giving an array shaped as the one provided by
+    the 'read_columns' method of the chained readers.
+    """
+    # Get the global range of the time indices to read
+    (start, stop, _) = slice(*time_range).indices(int(self.offsets[-1])) if time_range \
+      else (0, int(self.offsets[-1]), 1)
+    # Read the values of the runs overlapping the range
+    parts = list()
+    for (i, reader) in enumerate(self.readers):
+      (first, last) = (max(start, self.offsets[i]), min(stop, self.offsets[i + 1]))
+      if first < last:
+        parts.append(reader.read_columns(
+          indices, record_length, (int(first - self.offsets[i]), int(last - self.offsets[i]))))
+    # Read an empty selection from the first run if the range is empty, so that the array
+    # has the right shape anyway
+    if not parts:
+      parts.append(self.readers[0].read_columns(indices, record_length, (0, 0)))
+    # Join the values along the time dimension
+    return np.concatenate(parts, axis=1)
+
+  def read_columns_at(self, indices: Sequence[int], record_length: int,
+                      time_indices: Sequence[int]) -> NDArray[np.float32]:
+    """
+    Method that extracts the values of the record columns whose indices are given, for
+    the time instants whose global indices are given, in the order given. The values of
+    each run are read from its file for the time instants belonging to it only, giving an
+    array shaped as the one provided by the 'read_columns' method.
+    """
+    # Get the run of every time instant
+    time_indices = np.asarray(time_indices, dtype=np.int64)
+    if np.any((time_indices < 0) | (time_indices >= self.offsets[-1])):
+      raise Exception("Error: a time index is out of range.")
+    runs = np.searchsorted(self.offsets, time_indices, side='right') - 1
+    # Read an empty selection from the first run, so that the array has the right shape
+    empty = self.readers[0].read_columns(indices, record_length, (0, 0))
+    values = np.empty(empty.shape[:1] + time_indices.shape + empty.shape[2:], dtype=empty.dtype)
+    # Read the values of the time instants of every run
+    for i in np.unique(runs):
+      selected = runs == i
+      values[:, selected] = self.readers[i].read_columns_at(
+        indices, record_length, time_indices[selected] - self.offsets[i])
+    return values
+
+  def locate(self, time_index: int) -> Tuple[int, int]:
+    """
+    Method that returns the index of the run the time instant with the given global index
+    belongs to, and the index of the time instant within the file of that run.
+    """
+    # Check the time index is valid
+    if not 0 <= time_index < self.offsets[-1]:
+      raise Exception("Error: the time index " + str(time_index) + " is out of range.")
+    # Find the run by binary search over the global index of the first time instants
+    run = int(np.searchsorted(self.offsets, time_index, side='right')) - 1
+    # Return the run index and the local time index
+    return (run, int(time_index - self.offsets[run]))
+
+
+class RestartChain():
+  """
+  Class that presents the results of a chain of restarted TU simulations, each described
+  by its own .pli file and producing its own .mic and .mac files, as a single simulation
+  with a continuous time axis.
+  The runs must be compatible, i.e. have the same record lengths and number of axial
+  slices (M3 option).
+  """
+  def __init__(self, plireaders: Sequence[PliReader], memory_map: bool = True) -> None:
+    """
+    Build an instance of the 'RestartChain' class given the 'PliReader' instances of the
+    runs, ordered as they have been run. After checking the runs are compatible, the
+    readers of their .mic and .mac files are chained. The 'memory_map' flag states if the
+    files content is memory-mapped instead of being read into RAM.
+    """
+    # Check the runs are compatible
+    check_restart_compatibility(plireaders)
+    # Store the 'PliReader' instances of the runs
+    self.plireaders: List[PliReader] = list(plireaders)
+    first = self.plireaders[0]
+    # Store the record lengths of the .mic and .mac files and the number of slices
+    self.mic_recordLength: int = int(first.mic_recordLength)
+    self.mac_recordLength: int = int(first.mac_recordLength)
+    self.n_slices: int = int(first.axial_steps)
+    # Chain the readers of the .mic and .mac files of the runs
+    self.mic: ChainedReader = ChainedReader([
+      MicReader(os.path.join(p.pli_folder, p.mic_path), memory_map) for p in self.plireaders])
+    self.mac: ChainedReader = ChainedReader([
+      MacReader(os.path.join(p.pli_folder, p.mac_path), self.n_slices, memory_map)
+      for p in self.plireaders])
+    # Extract the joined time instants of the .mic and .mac files
+    self.mic.extract_time_hsms(self.mic_recordLength)
+    self.mac.extract_time_hsms(self.mac_recordLength)
+
+  @staticmethod
+  def init_RestartChain(pli_paths: Sequence[str], memory_map: bool = True) -> Self:
+    """
+    Method that builds an instance of the 'RestartChain' class given the paths to the
+    .pli files of the runs, ordered as they have been run.
+    """
+    return RestartChain([PliReader.init_PliReader(path) for path in pli_paths], memory_map)
+
+
+def check_restart_compatibility(plireaders: Sequence[PliReader]) -> None:
+  """
+  Function that checks the runs described by the given 'PliReader' instances can be
+  chained as restarts of the same simulation, i.e. that they have the same record lengths
+  of the .mic and .mac files, the same number of axial slices (M3 option) and the same
+  number of axial sections, depending on the ISLICE option too, so that the records of the
+  .mac files share the same slices layout.
+  An exception is raised if not.
+  """
+  # Check at least a run is given
+  if not plireaders:
+    raise Exception("Error: no simulation to chain has been given.")
+  # Compare every run with the first one
+  first = plireaders[0]
+  for plireader in plireaders[1:]:
+    for (name, value, reference) in (
+        ("M3", plireader.opt_dict.get('M3'), first.opt_dict.get('M3')),
+        ("number of axial sections", plireader.axial_steps, first.axial_steps),
+        (".mic record length", int(plireader.mic_recordLength), int(first.mic_recordLength)),
+        (".mac record length", int(plireader.mac_recordLength), int(first.mac_recordLength))):
+      if value != reference:
+        raise Exception("Error: the " + name + " of the \"" + plireader.pli_path + "\" run ("
+                        + str(value) + ") differs from the one of the \"" + first.pli_path
+                        + "\" run (" + str(reference) + ").")
+
+
+def unique_time_instants(times: NDArray) -> Tuple[NDArray, NDArray[np.int64],
+                                                   NDArray[np.int64]]:
+  """
+  Function that, given a 2D array whose rows are time instants expressed as (hours,
+  seconds, milliseconds), filters out any duplicate while keeping the order the time
+  instants first appear in.
+  It returns a tuple made of the 2D array of the distinct time instants, of the array
+  of indices of the rows where each of them first appears and of the array giving, for
+  each row, the index of its time instant among the distinct ones.
+  """
+  # Make sure to work on an in-memory copy of the time values
+  times = np.array(times)
+  # Get the distinct rows, along with the index of their first occurrence and the
+  # index of the distinct row each row corresponds to
+  (_, first_indices, inverse) = np.unique(
+    times, axis=0, return_index=True, return_inverse=True)
+  # Sort the distinct rows by their first occurrence so to restore the original order
+  order = np.argsort(first_indices)
+  # Build the map from the sorted position of the distinct rows to their original order
+  rank = np.empty_like(order)
+  rank[order] = np.arange(order.size)
+  # Return the distinct time instants, the indices of their first occurrence and the
+  # time instant index of each row
+  return (times[first_indices[order]], first_indices[order], rank[inverse.ravel()])
+
+
+class TimeIndex(Sequence):
+  """
+  Class providing a numeric index of the time instants of a TU simulation. Each time
+  instant is stored both as the (hours, seconds, milliseconds) triple read from the
+  direct-access files and as the corresponding total number of seconds.
+  As the time instants are sorted in increasing order, nearest-time and time-range
+  lookups are performed by binary search.
+  The class behaves as a sequence of the "h s ms" strings shown by the GUI widgets,
+  which are built only when accessed.
+  """
+  def __init__(self, h: ArrayLike, s: ArrayLike, ms: ArrayLike) -> None:
+    """
+    Build an instance of the 'TimeIndex' class given the arrays of the hours, seconds
+    and milliseconds of the time instants.
+    """
+    # Store the arrays of hours, seconds (both as integers) and milliseconds
+    self.h: NDArray[np.int64] = np.asarray(h, dtype=np.int64)
+    self.s: NDArray[np.int64] = np.asarray(s, dtype=np.int64)
+    self.ms: NDArray = np.asarray(ms)
+    # Build the array of the time instants in seconds
+    self.seconds: NDArray[np.float64] = self.h * 3600.0 + self.s + self.ms / 1000.0
+    # Initialize the list of the "h s ms" strings, built only when all are needed
+    self._labels: Union[List[str], None] = None
+
+  @staticmethod
+  def init_TimeIndex_from_reader(reader: DaReader) -> Self:
+    """
+    Method that builds an instance of the 'TimeIndex' class from the time values
+    already extracted by the given direct-access file reader.
+    """
+    return TimeIndex(reader.time_h, reader.time_s, reader.time_ms)
+
+  def __len__(self) -> int:
+    return self.seconds.size
+
+  def __getitem__(self, i: Union[int, slice]) -> Union[str, List[str]]:
+    """
+    Method that returns the "h s ms" string of the time instant at the given index or,
+    if a slice is given, the list of the strings of the selected time instants.
+    """
+    if isinstance(i, slice):
+      return self.labels(i)
+    # Build the string of the requested time instant only
+    return str(self.h[i]) + " " + str(self.s[i]) + " " + str(self.ms[i])
+
+  def __iter__(self) -> Iterator[str]:
+    return iter(self.labels())
+
+  def labels(self, selection: slice = slice(None)) -> List[str]:
+    """
+    Method that builds the list of "h s ms" strings of the time instants selected by
+    the given slice (all, by default). The list of all the strings is built only once.
+    """
+    # Return the stored list, or its selected part, if all the strings have been built
+    if self._labels is not None:
+      return self._labels[selection]
+    # Build the strings of the selected time instants
+    labels = [str(h) + " " + str(s) + " " + str(ms) for (h, s, ms) in zip(
+      self.h[selection].tolist(), self.s[selection].tolist(), self.ms[selection])]
+    # Store the list if all the time instants have been selected
+    if selection == slice(None):
+      self._labels = labels
+    return labels
+
+  def nearest(self, seconds: float) -> int:
+    """
+    Method that returns the index of the time instant closest to the given time,
+    expressed in seconds.
+    """
+    # Check the index is not empty
+    if not len(self):
+      raise Exception("Error: no time instant is present.")
+    # Find the position where the given time would be inserted
+    i = int(np.searchsorted(self.seconds, seconds))
+    # Choose the closest between the time instants around that position
+    if i == len(self):
+      return i - 1
+    if i > 0 and seconds - self.seconds[i - 1] <= self.seconds[i] - seconds:
+      return i - 1
+    return i
+
+  def range(self, start: float, end: float) -> Tuple[int, int]:
+    """
+    Method that returns the range of indices, as (start, stop) with 'stop' excluded, of
+    the time instants that are within the given start and end times (both included),
+    expressed in seconds. The range can be directly used for reading data from the
+    direct-access files.
+    """
+    return (int(np.searchsorted(self.seconds, start, side='left')),
+            int(np.searchsorted(self.seconds, end, side='right')))
+
+  def label_seconds(self, label: str) -> float:
+    """
+    Method that converts a time instant given as a "h s ms" string into the time in
+    seconds, the same way as the indexed ones, so that the two can be compared exactly.
+    """
+    (h, s, ms) = label.split()
+    return TimeIndex([int(h)], [int(s)], np.array([ms], dtype=self.ms.dtype)).seconds[0]
+
+  def locate(self, label: str) -> int:
+    """
+    Method that returns the index of the time instant given as a "h s ms" string.
+    An exception is raised if no such time instant is present.
+    """
+    # Convert the string values into the time in seconds
+    seconds = self.label_seconds(label)
+    # Find the first time instant matching the given one
+    i = int(np.searchsorted(self.seconds, seconds))
+    if i == len(self) or self.seconds[i] != seconds:
+      raise Exception(f"Error: the '{label}' time instant is not present.")
+    return i
+
+
+class TimeAlignment():
+  """
+  Class providing the alignment between the macro-step and the micro-step times of a TU
+  simulation, as index arrays computed once by binary search, so that any macro-step can
+  be mapped to the surrounding micro-steps, and vice versa, in constant time.
+  Both the time bases are expected in ascending order.
+  """
+  def __init__(self, macro_time: TimeIndex, micro_time: TimeIndex) -> None:
+    """
+    Build an instance of the 'TimeAlignment' class given the indices of the macro-step and
+    of the micro-step times. The following index arrays are built:
+    . 'mac_to_mic', giving for each macro-step the index of the last micro-step not later
+      than it (-1 if none)
+    . 'mic_to_mac', giving for each micro-step the index of the first macro-step not
+      earlier than it, i.e. the one closing the macro-step interval the micro-step belongs
+      to (the number of macro-steps if none)
+    """
+    # Store the indices of the two time bases
+    self.macro_time: TimeIndex = macro_time
+    self.micro_time: TimeIndex = micro_time
+    # Map every macro-step to the last micro-step not later than it
+    self.mac_to_mic: NDArray[np.int64] = np.searchsorted(
+      micro_time.seconds, macro_time.seconds, side='right').astype(np.int64) - 1
+    # Map every micro-step to the first macro-step not earlier than it
+    self.mic_to_mac: NDArray[np.int64] = np.searchsorted(
+      macro_time.seconds, micro_time.seconds, side='left').astype(np.int64)
+
+  def micro_range(self, macro_index: int) -> Tuple[int, int]:
+    """
+    Method that returns the range of indices, as (start, stop) with 'stop' excluded, of the
+    micro-steps falling in the interval ending at the given macro-step, i.e. after the
+    previous macro-step (excluded) and up to the given one (included).
+    """
+    start = int(self.mac_to_mic[macro_index - 1]) + 1 if macro_index > 0 else 0
+    return (start, int(self.mac_to_mic[macro_index]) + 1)
+
+  def micro_window(self, macro_index: int, before: int, after: int) -> Tuple[int, int]:
+    """
+    Method that returns the range of indices, as (start, stop) with 'stop' excluded, of the
+    micro-steps around the given macro-step, made of the given number of micro-steps
+    before it (the one aligned with it included) and after it, within the available ones.
+    """
+    i = int(self.mac_to_mic[macro_index]) + 1
+    return (max(i - before, 0), min(i + after, len(self.micro_time)))
+
+  def macro_of(self, micro_index: int) -> int:
+    """
+    Method that returns the index of the macro-step closing the interval the given
+    micro-step belongs to, or the last macro-step if the micro-step follows all of them.
+    """
+    return int(min(self.mic_to_mac[micro_index], len(self.macro_time) - 1))
+
+
+@dataclass
+class SharedArrayDescriptor():
+  """
+  Dataclass providing a record storing the information needed for accessing an array
+  published into a shared memory block, i.e. the block name, the array shape and the type
+  of its values. Being small, it can be passed to the worker processes in place of the
+  array itself.
+  """
+  name: str = ''
+  shape: Tuple[int, ...] = ()
+  dtype: str = ''
+
+  def attach(self) -> Tuple[NDArray, shared_memory.SharedMemory]:
+    """
+    Method that attaches to the shared memory block described by this descriptor and
+    returns a read-only array viewing its content, without copying it, along with the
+    shared memory block, to be closed once the array is no more needed.
+    """
+    # Attach to the existing shared memory block
+    shm = shared_memory.SharedMemory(name=self.name)
+    # Build the read-only array over the block content
+    array = np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=shm.buf)
+    array.flags.writeable = False
+    # Return the array and the block
+    return (array, shm)
+
+
+def publish_array(array: ArrayLike) -> Tuple[SharedArrayDescriptor, shared_memory.SharedMemory]:
+  """
+  Function that copies the given array into a new shared memory block, so that it can be
+  accessed by other processes without any further copy.
+  It returns the descriptor of the published array, to be passed to the other processes,
+  and the shared memory block, that the publishing process must close and unlink once no
+  more needed by any process.
+  """
+  array = np.asarray(array)
+  # Create a shared memory block large enough for the array (at least a byte)
+  shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+  # Copy the array into the block
+  shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+  shared[...] = array
+  # Return the descriptor and the block
+  return (SharedArrayDescriptor(name=shm.name, shape=tuple(array.shape), dtype=array.dtype.str), shm)
+
+
+class DaCache():
+  """
+  Class providing a cache of the objects (readers or arrays) built from the content of
+  direct-access files, shared by the whole process.
+  Each object is stored with a key made of the file path, size and modification time,
+  plus any additional parameter the object depends on, so that it is rebuilt as soon as
+  the file changes. The least recently used objects are evicted whenever the memory they
+  occupy exceeds the configured limit (memory-mapped arrays are not accounted for, as
+  they do not occupy memory until accessed).
+  """
+  def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+    """
+    Build an instance of the 'DaCache' class given the maximum memory, in bytes, the
+    cached objects can occupy.
+    """
+    # Store the memory limit of the cached objects
+    self.max_bytes: int = max_bytes
+    # Declare the dictionary of the cached objects, with their size, ordered from the
+    # least to the most recently used
+    self._entries: OrderedDict[Tuple, Tuple[Any, int]] = OrderedDict()
+    # Initialize the memory occupied by the cached objects
+    self.nbytes: int = 0
+    # Declare a lock as the cache can be accessed from different threads
+    self._lock = threading.RLock()
+
+  def get(self, da_path: str, loader: Callable[[], Any], *params: Hashable) -> Any:
+    """
+    Method that returns the object built from the given direct-access file and with
+    the given additional parameters, if present in the cache and the file has not
+    changed since it was built. If not, the object is built by calling the given
+    function and stored in the cache, while replacing any object built from a previous
+    version of the same file.
+    """
+    # Build the key identifying the object from the file path, size and modification time
+    da_path = os.path.abspath(da_path)
+    stat = os.stat(da_path)
+    key = (da_path, stat.st_size, stat.st_mtime_ns) + params
+    # Return the cached object, if present, after marking it as the most recently used
+    with self._lock:
+      if key in self._entries:
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+
+    # Build the object, outside the lock so that different files can be read concurrently
+    obj = loader()
+    with self._lock:
+      # Remove any object built from a previous version of the same file
+      for old_key in [k for k in self._entries if k[0] == da_path and k[1:3] != key[1:3]]:
+        self._remove(old_key)
+      # Store the object, replacing the one possibly built meanwhile by another thread
+      if key in self._entries:
+        self._remove(key)
+      nbytes = resident_nbytes(obj)
+      self._entries[key] = (obj, nbytes)
+      self.nbytes += nbytes
+      # Evict the least recently used objects, if needed
+      self._evict()
+    # Return the built object
+    return obj
+
+  def resize(self, max_bytes: int) -> None:
+    """
+    Method that changes the memory limit of the cached objects, evicting the least
+    recently used ones, if needed.
+    """
+    with self._lock:
+      self.max_bytes = max_bytes
+      self._evict()
+
+  def clear(self) -> None:
+    """
+    Method that removes all the cached objects.
+    """
+    with self._lock:
+      self._entries.clear()
+      self.nbytes = 0
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def _evict(self) -> None:
+    """
+    Method that removes the least recently used objects until the memory occupied by
+    the cached ones is within the limit. The most recently used object is always kept.
+    """
+    while self.nbytes > self.max_bytes and len(self._entries) > 1:
+      self._remove(next(iter(self._entries)))
+
+  def _remove(self, key: Tuple) -> None:
+    """
+    Method that removes the object with the given key from the cache.
+    """
+    (_, nbytes) = self._entries.pop(key)
+    self.nbytes -= nbytes
+
+
+def resident_nbytes(obj: Any) -> int:
+  """
+  Function that estimates the memory occupied by the given object, being either an
+  array or an object whose attributes are arrays. Memory-mapped arrays are not
+  accounted for, as their content is read from disk only when accessed.
+  """
+  # Get the arrays to account for
+  arrays = [obj] if isinstance(obj, np.ndarray) else list(getattr(obj, '__dict__', {}).values())
+  # Sum the size of the arrays that are not views of a memory-mapped file
+  return sum(a.nbytes for a in arrays
+             if isinstance(a, np.ndarray) and not isinstance(a, np.memmap)
+             and not isinstance(a.base, np.memmap))
+
+
+# Cache of the objects built from the direct-access files, shared by the whole process
+DA_CACHE: DaCache = DaCache()
+
+
+class ColumnarSidecar():
+  """
+  Class that handles the columnar copy of the direct-access files of a TU simulation,
+  stored in a sidecar folder next to the .pli file (the '.tugui' folder having the same
+  name of the .pli file).
+  For each of the .mic and .mac files, the folder holds a .npy file storing the records
+  transposed as a (column, record) array, so that the values of each quantity are
+  contiguous on disk, plus a JSON manifest describing the record lengths, the number of
+  slices and the size and modification time of the source files. Whenever any source
+  file changes, the sidecar is considered stale and must be rebuilt.
+  """
+  def __init__(self, folder: str) -> None:
+    """
+    Build an instance of the 'ColumnarSidecar' class given the path to the sidecar folder.
+    """
+    # Store the path to the sidecar folder and to its manifest file
+    self.folder: str = folder
+    self.manifest_path: str = os.path.join(folder, 'manifest.json')
+    # Initialize the manifest content
+    self.manifest: Dict[str, Any] = dict()
+
+  @staticmethod
+  def init_ColumnarSidecar(plireader: PliReader, build: bool = True) -> Union[Self, None]:
+    """
+    Method that builds an instance of the 'ColumnarSidecar' class for the simulation
+    described by the given 'PliReader' instance, reading the manifest of the sidecar
+    folder next to the .pli file, if any.
+    If the sidecar is missing or stale, its content is written anew if the 'build' flag
+    is set, otherwise None is returned.
+    """
+    # Instantiate the class for the sidecar folder of the .pli file
+    sidecar = ColumnarSidecar(os.path.splitext(plireader.pli_path)[0] + '.tugui')
+    # Read the manifest, if present
+    if os.path.isfile(sidecar.manifest_path):
+      with open(sidecar.manifest_path, 'r') as f:
+        sidecar.manifest = json.load(f)
+    # Return the sidecar, if up-to-date
+    if sidecar.is_valid(plireader):
+      return sidecar
+    # Build the sidecar content, if requested
+    if not build:
+      return None
+    sidecar.build(plireader)
+    # Return the built sidecar
+    return sidecar
+
+  def is_valid(self, plireader: PliReader) -> bool:
+    """
+    Method that checks if the sidecar content is up-to-date with respect to the
+    direct-access files of the simulation described by the given 'PliReader' instance,
+    i.e. if the manifest has the current layout version and, for each file, the same
+    size, modification time and record length, and if the columnar files are present.
+    """
+    # Check the manifest layout version
+    if self.manifest.get('version') != SIDECAR_VERSION:
+      return False
+    # Loop over the direct-access files of the simulation
+    for (ext, (da_path, record_length, _)) in self._sources(plireader).items():
+      entry = self.manifest.get('files', {}).get(ext)
+      stat = os.stat(da_path)
+      # Check the file is described by the manifest exactly as it is on disk
+      if (entry is None or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns
+          or entry['record_length'] != record_length
+          or not os.path.isfile(os.path.join(self.folder, entry['columns']))):
+        return False
+    # The sidecar is up-to-date
+    return True
+
+  def build(self, plireader: PliReader, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+    """
+    Method that writes the sidecar content for the direct-access files of the simulation
+    described by the given 'PliReader' instance.
+    Each file is read by blocks of at most 'block_size' time instants, that are transposed
+    into a memory-mapped .npy file, so that the conversion needs a bounded amount of memory.
+    Only the complete time instants are converted. The manifest is written last and
+    atomically, so that an interrupted conversion is never taken as valid.
+    """
+    # Create the sidecar folder, if needed
+    os.makedirs(self.folder, exist_ok=True)
+    # Initialize the manifest content
+    manifest = {'version': SIDECAR_VERSION, 'M3': plireader.opt_dict.get('M3'), 'files': {}}
+    # Loop over the direct-access files of the simulation
+    for (ext, (da_path, record_length, n_slices)) in self._sources(plireader).items():
+      # Get the file size and modification time before reading it
+      stat = os.stat(da_path)
+      # Instantiate the reader of the file, with its content memory-mapped
+      reader = MicReader(da_path, True) if ext == 'mic' else MacReader(da_path, n_slices, True)
+      # Get the number of records of the complete time instants
+      n_records = (reader._map_records(record_length).shape[0] // n_slices) * n_slices
+      # Write the records, transposed by blocks, into a temporary .npy file
+      npy_name = ext + '.npy'
+      tmp_path = os.path.join(self.folder, npy_name + '.tmp')
+      columns = np.lib.format.open_memmap(
+        tmp_path, mode='w+', dtype=reader.dtype, shape=(record_length, n_records))
+      for (first, block) in reader.iter_records(record_length, block_size):
+        columns[:, first * n_slices:first * n_slices + block.shape[0]] = block.T
+      columns.flush()
+      del columns
+      # Replace any previous columnar file
+      os.replace(tmp_path, os.path.join(self.folder, npy_name))
+      # Describe the file in the manifest
+      manifest['files'][ext] = {
+        'source': os.path.basename(da_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+        'record_length': record_length, 'n_records': n_records, 'n_slices': n_slices,
+        'dtype': np.dtype(reader.dtype).str, 'columns': npy_name}
+
+    # Write the manifest atomically
+    tmp_path = self.manifest_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+      json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, self.manifest_path)
+    self.manifest = manifest
+
+  def columns(self, extension: str) -> NDArray:
+    """
+    Method that memory-maps the columnar copy of the direct-access file with the given
+    extension, returning a read-only (column, record) array.
+    """
+    # Check the file is present in the sidecar
+    if extension not in self.manifest.get('files', {}):
+      raise Exception("Error: no columnar copy of the ." + extension + " file is available.")
+    # Map the columnar file
+    return np.load(os.path.join(self.folder, self.manifest['files'][extension]['columns']),
+                   mmap_mode='r')
+
+  def attach(self, reader: MicReader) -> MicReader:
+    """
+    Method that attaches the columnar copy of the file read by the given reader to it,
+    so that its time values and record columns are read from the sidecar.
+    The given reader is returned.
+    """
+    reader.attach_column_store(self.columns(reader.extension))
+    return reader
+
+  def _sources(self, plireader: PliReader) -> Dict[str, Tuple[str, int, int]]:
+    """
+    Method that returns a dictionary of the extension of the .mic and .mac files of the
+    simulation described by the given 'PliReader' instance VS their path, record length
+    and number of records per time instant. The path is the one of the block-compressed
+    archive of the file, if the latter is missing.
+    """
+    sources = dict()
+    # Add the .mic file, having a record per time instant
+    if plireader.mic_path:
+      sources['mic'] = (resolve_da_path(os.path.join(plireader.pli_folder, plireader.mic_path)),
+                        int(plireader.mic_recordLength), 1)
+    # Add the .mac file, having a record per axial slice and time instant
+    if plireader.mac_path:
+      sources['mac'] = (resolve_da_path(os.path.join(plireader.pli_folder, plireader.mac_path)),
+                        int(plireader.mac_recordLength), int(plireader.axial_steps))
+    return sources
+
+
+# Lock serializing the checks and the builds of the columnar sidecars, as the readers of
+# the .mic and .mac files, sharing the same sidecar, can be loaded concurrently
+SIDECAR_LOCK: threading.Lock = threading.Lock()
+
+
+def attach_columnar_sidecar(plireader: PliReader, reader: MicReader) -> MicReader:
+  """
+  Function that attaches to the given reader of the .mic or .mac file of the simulation
+  described by the given 'PliReader' instance the columnar copy of the file, stored in the
+  sidecar folder next to the .pli file. The sidecar is built first, if missing or stale.
+  The given reader is returned.
+  """
+  with SIDECAR_LOCK:
+    sidecar = ColumnarSidecar.init_ColumnarSidecar(plireader)
+  return sidecar.attach(reader)
+
+
+def load_mac_reader(plireader: PliReader, columnar: bool = False) -> MacReader:
+  """
+  Function that provides the reader of the .mac file of the simulation described by the
+  given 'PliReader' instance, with the macro step times already extracted. The reader is
+  taken from the cache of the direct-access files, unless the file has changed since it
+  was last read.
+  If the 'columnar' flag is set, the reader gets the values from the columnar copy of the
+  file, stored in the sidecar folder next to the .pli file, that is built if needed.
+  """
+  # Build the path to the .mac file (or to its archive, if only the latter is present)
+  # and get its record length
+  mac_path = resolve_da_path(os.path.join(os.path.dirname(plireader.pli_path), plireader.mac_path))
+  record_length = int(plireader.mac_recordLength)
+
+  def load() -> MacReader:
+    # Instantiate the MacReader class by memory-mapping the .mac file content
+    macreader = MacReader(mac_path, plireader.axial_steps, memory_map=True)
+    # Attach the columnar copy of the file, if requested
+    if columnar:
+      attach_columnar_sidecar(plireader, macreader)
+    # Extract the macro step time values
+    macreader.extract_xtime_hsms(record_length)
+    return macreader
+
+  # Get the reader from the cache, building it if needed
+  return DA_CACHE.get(mac_path, load, 'mac', plireader.axial_steps, record_length, columnar)
+
+
+def load_mic_reader(plireader: PliReader, columnar: bool = False) -> MicReader:
+  """
+  Function that provides the reader of the .mic file of the simulation described by the
+  given 'PliReader' instance, with the micro step times already extracted. The reader is
+  taken from the cache of the direct-access files, unless the file has changed since it
+  was last read.
+  If the 'columnar' flag is set, the reader gets the values from the columnar copy of the
+  file, stored in the sidecar folder next to the .pli file, that is built if needed.
+  """
+  # Build the path to the .mic file (or to its archive, if only the latter is present)
+  # and get its record length
+  mic_path = resolve_da_path(os.path.join(os.path.dirname(plireader.pli_path), plireader.mic_path))
+  record_length = int(plireader.mic_recordLength)
+
+  def load() -> MicReader:
+    # Instantiate the MicReader class by memory-mapping the .mic file content
+    micreader = MicReader(mic_path, memory_map=True)
+    # Attach the columnar copy of the file, if requested
+    if columnar:
+      attach_columnar_sidecar(plireader, micreader)
+    # Extract the micro step time values
+    micreader.extract_time_hsms(record_length)
+    return micreader
+
+  # Get the reader from the cache, building it if needed
+  return DA_CACHE.get(mic_path, load, 'mic', record_length, columnar)
+
+
+def load_sta_reader(plireader: PliReader) -> StaReader:
+  """
+  Function that provides the reader of the .sta file of the simulation described by the
+  given 'PliReader' instance, with the times of the statistical simulation already
+  extracted. The reader is taken from the cache of the direct-access files, unless the
+  file has changed since it was last read.
+  """
+  # Build the path to the .sta file (or to its archive, if only the latter is present)
+  # and get the dimensions of its content
+  sta_path = resolve_da_path(os.path.join(os.path.dirname(plireader.pli_path), plireader.sta_path))
+  ibyte = int(plireader.opt_dict['IBYTE'])
+  record_length = int(plireader.sta_recordLength)
+  axial_steps = plireader.axial_steps - 1
+  sta_dataset_length = int(plireader.sta_dataset)
+
+  def load() -> StaReader:
+    # Instantiate the StaReader class by memory-mapping the .sta file content
+    stareader = StaReader(sta_path, ibyte, memory_map=True)
+    # Extract the time values of the statistical simulation from the .sta file
+    stareader.extract_time_hsms(
+      record_length=record_length,
+      axial_steps=axial_steps,
+      sta_dataset_length=sta_dataset_length)
+    return stareader
+
+  # Get the reader from the cache, building it if needed
+  return DA_CACHE.get(sta_path, load, 'sta', ibyte, record_length, axial_steps, sta_dataset_length)
 
 if __name__ == "__main__":
   # Flag stating which class is being tested: